@@ -5,9 +5,18 @@ import os
 import json
 import uuid
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from core.storage import Storage
-from core.data_loader import DataLoader
-from core.graph_generator import GraphGenerator
+from core.data_loader import DataLoader, PREVIEW_ROWS, SUPPORTED_EXTENSIONS
+from core.ingest_worker import IngestWorker
+from core.parallel_loader import ParallelLoader
+from core.graph_generator import GraphGenerator, RENDER_WORKERS
+from core.daily_aggregates import DailyAggregator
+from core.time_index import TimeRangeIndex
+from core.sensor_series import SensorSeries
+from core.resampler import GridResampler
+from core.render_cache import RenderCache
+from core.condensation import DEFAULT_THRESHOLD
 from core.utils import add_history_entry
 import webview
 from print_color.print_color import print
@@ -34,7 +43,7 @@ class API:
     Expose les méthodes accessibles depuis l'interface web
     """
 
-    def __init__(self, base_dir, data_dir, output_dir, image_outputdir):
+    def __init__(self, base_dir, data_dir, output_dir, image_outputdir, load_workers=None):
         """
         Initialise l'API avec les chemins de base et charge les données
 
@@ -42,6 +51,7 @@ class API:
             base_dir (str): Chemin de base de l'application
             data_dir (str): Chemin du répertoire de données
             output_dir (str): Chemin du répertoire d'exports
+            load_workers (int, optional): Nombre de processus pour charger les fichiers
         """
 
         self.base_dir = base_dir
@@ -57,8 +67,12 @@ class API:
         self.history = self.storage.load_history()
 
         # Initialiser les autres composants
-        self.data_loader = DataLoader()
+        self.data_loader = DataLoader(os.path.join(data_dir, "cache"), os.path.join(data_dir, "series"))
+        self.parallel_loader = ParallelLoader(self.data_loader, load_workers)
+        self.ingest_worker = IngestWorker(self.data_loader)
         self.graph_generator = GraphGenerator(output_dir)
+        self.resampler = GridResampler()
+        self.render_cache = RenderCache(os.path.join(output_dir, "render_cache"))
 
     # Méthodes d'API exposées à JavaScript
     def get_app_info(self):
@@ -81,6 +95,8 @@ class API:
                     "nom": capteur_data["nom"],
                     "file_path": capteur_data["details"].get("file_path"),
                     "columns": capteur_data.get("columns"),
+                    "position": capteur_data.get("position"),
+                    "ingest": self.ingest_worker.get_status(capteur_id),
                 }
             else:
                 capteur = {
@@ -88,6 +104,8 @@ class API:
                     "nom": capteur_data["nom"],
                     "file_path": capteur_data.get("file_path"),
                     "columns": capteur_data.get("columns"),
+                    "position": capteur_data.get("position"),
+                    "ingest": self.ingest_worker.get_status(capteur_id),
                 }
             capteurs.append(capteur)
         return {"success": True, "capteurs": capteurs}
@@ -187,6 +205,52 @@ class API:
                 "message": f"Erreur lors de la mise à jour du capteur: {e}",
             }
 
+    def set_capteur_position(self, capteur_id, x=None, y=None):
+        """
+        Définir la position d'un capteur pour la cartographie hygrométrique
+
+        Args:
+            capteur_id (str): ID du capteur
+            x (float, optional): Abscisse (m) sur le plan du mur ou de la pièce
+            y (float, optional): Ordonnée (m). Sans coordonnées, la position est effacée
+
+        Returns:
+            dict: Résultat de l'opération
+        """
+        try:
+            if capteur_id not in self.capteurs:
+                return {"success": False, "message": "Capteur non trouvé"}
+
+            if x is None or y is None:
+                position = None
+                self.capteurs[capteur_id].pop("position", None)
+            else:
+                position = {"x": float(x), "y": float(y)}
+                self.capteurs[capteur_id]["position"] = position
+            self.capteurs[capteur_id][
+                "updated_at"
+            ] = datetime.datetime.now().isoformat()
+
+            # Sauvegarder les modifications
+            self.storage.save_capteurs(self.capteurs)
+
+            # Ajouter à l'historique
+            add_history_entry(
+                self.history,
+                "Position de capteur",
+                capteur_id,
+                {"position": position},
+                self.capteurs,
+            )
+            self.storage.save_history(self.history)
+
+            return {"success": True, "position": position}
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Erreur lors de la mise à jour de la position du capteur: {e}",
+            }
+
     def delete_capteur(self, capteur_id):
         """
         Supprimer un capteur
@@ -207,6 +271,8 @@ class API:
 
             # Supprimer le capteur
             del self.capteurs[capteur_id]
+            self.ingest_worker.forget(capteur_id)
+            self.render_cache.invalidate(capteur_id)
 
             # Sauvegarder les modifications
             self.storage.save_capteurs(self.capteurs)
@@ -253,19 +319,30 @@ class API:
 
             file_path = file_path[0]  # create_file_dialog retourne une liste
 
-            # Charger le fichier pour vérifier qu'il est valide
-            df = self.data_loader.load_file(file_path)
+            # Détecter la structure du fichier, puis n'en lire que le début : l'analyse
+            # complète se fait en arrière-plan
+            sniff = self.data_loader.sniff_file(file_path)
+            df = self.data_loader.load_file(file_path, sniff, nrows=PREVIEW_ROWS)
+
+            # Garder les colonnes et l'aperçu pour l'écran de mappage
+            self.data_loader.get_file_summary(file_path, df=df, sniff=sniff)
 
             # Détecter automatiquement les colonnes
             columns = self.data_loader.detect_columns(df)
             needs_mapping = not (columns.get("date") and columns.get("temperature") )
 
+            # Numéro de série : permet de compléter la série conservée de l'enregistreur
+            serial, _ = self.data_loader.read_logger_identity(file_path, sniff, df)
+
             # Mettre à jour le capteur
+            self.capteurs[capteur_id]["serial"] = serial
             self.capteurs[capteur_id]["file_path"] = file_path
             self.capteurs[capteur_id]["columns"] = columns
+            self.capteurs[capteur_id]["sniff"] = sniff
             self.capteurs[capteur_id][
                 "file_updated_at"
             ] = datetime.datetime.now().isoformat()
+            self.render_cache.invalidate(capteur_id)
 
             # Sauvegarder les modifications
             self.storage.save_capteurs(self.capteurs)
@@ -280,6 +357,9 @@ class API:
             )
             self.storage.save_history(self.history)
 
+            if not needs_mapping:
+                self.ingest_worker.submit(capteur_id, self.capteurs[capteur_id])
+
             return {"success": True, "needs_mapping": needs_mapping}
         except Exception as e:
             return {
@@ -287,6 +367,135 @@ class API:
                 "message": f"Erreur lors de la sélection du fichier: {e}",
             }
 
+    def import_files(self, paths=None):
+        """
+        Importer en une fois les exports de plusieurs enregistreurs
+
+        Un capteur est créé (ou mis à jour) par enregistreur, identifié par le numéro
+        de série lu dans le fichier. Les fichiers sont examinés en parallèle, puis
+        analysés et mis en cache dans le pool de processus de chargement.
+
+        Args:
+            paths (str|list, optional): Dossier ou liste de fichiers. Par défaut, un
+                dossier est demandé à l'utilisateur.
+
+        Returns:
+            dict: Résultat de l'opération avec les capteurs importés et les erreurs
+        """
+        try:
+            if not paths:
+                folder = webview.windows[0].create_file_dialog(webview.FOLDER_DIALOG)
+                if not folder:
+                    return {"success": False, "message": "Aucun dossier sélectionné"}
+                paths = folder[0]
+
+            # Lister les fichiers de données
+            if isinstance(paths, str) and os.path.isdir(paths):
+                files = [
+                    os.path.join(root, name)
+                    for root, _, names in os.walk(paths)
+                    for name in sorted(names)
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS) and not name.startswith("~$")
+                ]
+            else:
+                files = [paths] if isinstance(paths, str) else list(paths)
+            files = [os.path.abspath(f) for f in files]
+            if not files:
+                return {"success": False, "message": "Aucun fichier de données trouvé"}
+
+            # Examiner les fichiers en parallèle (en-tête, colonnes, numéro de série)
+            errors = []
+            inspected = []
+            with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+                futures = {executor.submit(self.data_loader.inspect_file, f): f for f in files}
+                for future, file_path in futures.items():
+                    try:
+                        inspected.append(future.result())
+                    except Exception as e:
+                        errors.append({"file_path": file_path, "message": str(e)})
+
+            # Un capteur par enregistreur : garder l'export le plus récent (à date de
+            # modification égale, le nom horodaté le plus récent)
+            by_logger = {}
+            def recency(info):
+                return info["mtime_ns"], os.path.basename(info["file_path"])
+
+            for info in inspected:
+                key = info["serial"] or info["name"]
+                if key not in by_logger or recency(info) > recency(by_logger[key]):
+                    by_logger[key] = info
+            skipped = [info["file_path"] for info in inspected if by_logger.get(info["serial"] or info["name"]) is not info]
+
+            now = datetime.datetime.now().isoformat()
+            imported = []
+            for key, info in by_logger.items():
+                capteur_id = next(
+                    (cid for cid, c in self.capteurs.items() if info["serial"] and c.get("serial") == info["serial"]),
+                    None,
+                )
+                created = capteur_id is None
+                if created:
+                    capteur_id = str(uuid.uuid4())
+                    existing_names = {c["nom"] for c in self.capteurs.values()}
+                    nom = info["name"]
+                    if nom in existing_names and info["serial"]:
+                        nom = f"{nom} ({info['serial']})"
+                    suffix = 2
+                    base_nom = nom
+                    while nom in existing_names:
+                        nom = f"{base_nom} {suffix}"
+                        suffix += 1
+                    self.capteurs[capteur_id] = {"nom": nom, "created_at": now}
+
+                capteur = self.capteurs[capteur_id]
+                capteur["serial"] = info["serial"]
+                capteur["file_path"] = info["file_path"]
+                capteur["columns"] = info["columns"]
+                capteur["sniff"] = info["sniff"]
+                capteur["file_updated_at"] = now
+                self.render_cache.invalidate(capteur_id)
+
+                columns = info["columns"]
+                imported.append({
+                    "id": capteur_id,
+                    "nom": capteur["nom"],
+                    "serial": info["serial"],
+                    "file_path": info["file_path"],
+                    "created": created,
+                    "needs_mapping": not (columns.get("date") and columns.get("temperature")),
+                })
+
+            # Analyser et mettre en cache les capteurs complets dans le pool de processus
+            ready = {item["id"]: self.capteurs[item["id"]] for item in imported if not item["needs_mapping"]}
+            for capteur_id, result in self.parallel_loader.load_many(ready).items():
+                if isinstance(result, Exception):
+                    errors.append({"file_path": self.capteurs[capteur_id]["file_path"], "message": str(result)})
+
+            self.storage.save_capteurs(self.capteurs)
+
+            add_history_entry(
+                self.history,
+                "Import groupé",
+                None,
+                {"files": [item["file_path"] for item in imported], "errors": len(errors)},
+                self.capteurs,
+            )
+            self.storage.save_history(self.history)
+
+            return {
+                "success": True,
+                "imported": imported,
+                "created": sum(1 for item in imported if item["created"]),
+                "updated": sum(1 for item in imported if not item["created"]),
+                "skipped": skipped,
+                "errors": errors,
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Erreur lors de l'import des fichiers: {e}",
+            }
+
     # Autres méthodes d'API...
     # Note: Les autres méthodes seraient implémentées de manière similaire,
     # en utilisant les classes utilitaires pour la logique métier.
@@ -334,12 +543,11 @@ class API:
                     "message": "Aucun fichier associé à ce capteur",
                 }
 
-            # Charger le fichier
+            # Récupérer les noms des colonnes (depuis le cache si le fichier n'a pas changé)
             file_path = self.capteurs[capteur_id]["file_path"]
-            df = self.data_loader.load_file(file_path)
-
-            # Récupérer les noms des colonnes
-            columns = df.columns.tolist()
+            columns = self.data_loader.get_file_summary(
+                file_path, sniff=self.capteurs[capteur_id].get("sniff")
+            )["columns"]
 
             return {"success": True, "columns": columns}
         except Exception as e:
@@ -384,7 +592,9 @@ class API:
             normalized_path = os.path.normpath(file_path)
 
             try:
-                df = self.data_loader.load_file(normalized_path)
+                preview = self.data_loader.get_file_summary(
+                    normalized_path, sniff=self.capteurs[capteur_id].get("sniff")
+                )
             except Exception as e:
                 logger.error(f"Erreur lors du chargement avec data_loader: {e}")
 
@@ -422,38 +632,10 @@ class API:
                         f"Format de fichier non pris en charge: {normalized_path}"
                     )
 
-            # Limiter à 10 lignes pour l'aperçu
-            preview_df = df.head(6)
-
-            # Convertir toutes les données en types sérialisables JSON
-            def convert_to_serializable(val):
-                if isinstance(val, (pd.Timestamp, np.datetime64)):
-                    return val.isoformat() if hasattr(val, "isoformat") else str(val)
-                elif isinstance(val, (np.integer, np.int64)):
-                    return int(val)
-                elif isinstance(val, (np.floating, float)):
-                    return float(val)
-                elif isinstance(val, np.ndarray):
-                    return val.tolist()
-                elif pd.isna(val):
-                    return None
-                else:
-                    return str(val)
-
-            # Convertir les colonnes et les données en format sérialisable
-            columns = preview_df.columns.tolist()
-
-            # Convertir chaque valeur dans les données
-            data = []
-            for _, row in preview_df.iterrows():
-                serialized_row = [convert_to_serializable(val) for val in row]
-                data.append(serialized_row)
+                preview = self.data_loader.build_summary(df)
 
             logger.info("Aperçu généré avec succès")
 
-            # Convertir en format JSON-compatible
-            preview = {"columns": columns, "data": data}
-
             return {"success": True, "preview": preview}
         except Exception as e:
             import traceback
@@ -493,6 +675,7 @@ class API:
             self.capteurs[capteur_id][
                 "mapping_updated_at"
             ] = datetime.datetime.now().isoformat()
+            self.render_cache.invalidate(capteur_id)
 
             # Sauvegarder les modifications
             self.storage.save_capteurs(self.capteurs)
@@ -507,6 +690,9 @@ class API:
             )
             self.storage.save_history(self.history)
 
+            if mapping.get("date") and mapping.get("temperature"):
+                self.ingest_worker.submit(capteur_id, self.capteurs[capteur_id])
+
             return {"success": True}
         except Exception as e:
             return {
@@ -598,6 +784,11 @@ class API:
             #     "name": "Distribution des amplitudes hydriques (capteur C6)",
             #     "description": "Histogramme représentant la fréquence des amplitudes hydriques mesurées par le capteur C6.",
             # },
+            {
+                "id": "humidity_map",
+                "name": "Cartographie hygrométrique",
+                "description": "Cartes de l'humidité relative moyenne interpolée entre les positions des capteurs (IDW ou krigeage), sur la période puis pour chaque mois.",
+            },
             {
                 "id": "dew_point_risk",
                 "name": "Écart au point de rosée (risque de condensation)",
@@ -628,6 +819,17 @@ class API:
             
             # Initialiser options avec un dictionnaire vide par défaut
             options = options or {}
+
+            # Graphique déjà généré pour les mêmes fichiers, mappages et options
+            cache_key = None
+            if capteur_ids and all(capteur_id in self.capteurs for capteur_id in capteur_ids):
+                cache_key = self.render_cache.make_key(
+                    graph_type, {capteur_id: self.capteurs[capteur_id] for capteur_id in capteur_ids}, options
+                )
+                cached = self.render_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Graphique {graph_type} servi depuis le cache")
+                    return cached
             
             start_date = options.get('start_date')
             end_date = options.get('end_date')
@@ -647,9 +849,14 @@ class API:
             humidity_graphs = {
                 "humidity_time", "temperature_humidity", "humidity_monthly", 
                 "humidity_daily", "humidity_distribution", "humidity_amplitude", 
-                "humidity_profile_per_sensor"
+                "humidity_profile_per_sensor", "humidity_map"
             }
             dew_point_graphs = {"dew_point_risk"}
+            # Graphiques interpolant entre les positions des capteurs
+            spatial_graphs = {"humidity_map"}
+            # Graphiques comptant les mesures : alignement sur une grille commune si les
+            # capteurs n'ont pas le même intervalle (chaque point représente la même durée)
+            aligned_graphs = {"humidity_profile_per_sensor"}
             
             # Vérifier que les capteurs existent et préparer les données
             capteurs_data = {}
@@ -675,42 +882,58 @@ class API:
                 if graph_type in humidity_graphs and not columns.get("humidity"):
                     return {"success": False, "message": f"Le capteur {capteur_nom} n'a pas de données d'humidité nécessaires pour ce graphique"}
                     
-                if graph_type in dew_point_graphs and not columns.get("dew_point"):
-                    return {"success": False, "message": f"Le capteur {capteur_nom} n'a pas de données de point de rosée nécessaires pour ce graphique"}
+                # Point de rosée mesuré, ou calculé à l'analyse à partir de l'humidité
+                if graph_type in dew_point_graphs and not (columns.get("dew_point") or columns.get("humidity")):
+                    return {"success": False, "message": f"Le capteur {capteur_nom} n'a ni point de rosée ni humidité nécessaires pour ce graphique"}
+
+                if graph_type in spatial_graphs and not capteur_data.get("position"):
+                    return {"success": False, "message": f"Le capteur {capteur_nom} n'a pas de position pour la cartographie"}
                 
-                # Charger et traiter les données
+            # Attendre les analyses en arrière-plan en cours, puis charger les
+            # fichiers de tous les capteurs en parallèle
+            self.ingest_worker.wait(capteur_ids)
+            loaded = self.parallel_loader.load_many(
+                {capteur_id: self.capteurs[capteur_id] for capteur_id in capteur_ids}
+            )
+
+            for capteur_id in capteur_ids:
+                capteur_nom = self.capteurs[capteur_id]['nom']
+
+                # Traiter les données
                 try:
-                    df = self.data_loader.load_capteur_data(capteur_data)
+                    df = loaded[capteur_id]
+                    if isinstance(df, Exception):
+                        raise df
                     
-                    # Convertir la colonne de date en datetime si nécessaire
-                    if not pd.api.types.is_datetime64_any_dtype(df['date']):
-                        df['date'] = pd.to_datetime(df['date'])
+                    # Série compacte partagée jusqu'aux graphiques (vues des colonnes chargées)
+                    series = SensorSeries.from_frame(
+                        capteur_id, capteur_nom, df, self.capteurs[capteur_id].get("position")
+                    )
+
+                    # Séries préparées triées par date : bornes par recherche dichotomique
+                    time_index = TimeRangeIndex(series.date)
                     
                     # Filtrer par date si spécifié
                     if start_date_obj or end_date_obj:
                         # Vérifier que les dates sont dans la plage des données
-                        if start_date_obj and start_date_obj > df['date'].max():
+                        if start_date_obj and time_index.last is not None and start_date_obj > time_index.last:
                             return {"success": False, "message": f"La date de début est postérieure à toutes les données pour le capteur {capteur_nom}"}
                         
-                        if end_date_obj and end_date_obj < df['date'].min():
+                        if end_date_obj and time_index.first is not None and end_date_obj < time_index.first:
                             return {"success": False, "message": f"La date de fin est antérieure à toutes les données pour le capteur {capteur_nom}"}
                         
-                        # Appliquer les filtres de date
-                        if start_date_obj:
-                            df = df[df['date'] >= start_date_obj]
-                        if end_date_obj:
-                            df = df[df['date'] <= end_date_obj]
+                    # Appliquer les filtres de date (vue sans copie)
+                    lo, hi = time_index.bounds(start_date_obj, end_date_obj)
+                    series = series.slice(lo, hi)
                     
-                    # Vérifier si le dataframe est vide après filtrage
-                    if df.empty:
+                    # Vérifier si la série est vide après filtrage
+                    if len(series) == 0:
                         return {"success": False, "message": f"Aucune donnée disponible pour le capteur {capteur_nom} dans la plage de dates spécifiée"}
                     
                     # Calculer l'amplitude de temps
-                    df = df.sort_values('date')
-                    time_diffs = df['date'].diff().dropna()
+                    median_time_delta = time_index.median_step(lo, hi)
                     
-                    if not time_diffs.empty:
-                        median_time_delta = time_diffs.median()
+                    if median_time_delta is not None:
                         time_deltas[capteur_id] = median_time_delta
                         
                         # Mettre à jour la plus grande amplitude
@@ -718,7 +941,7 @@ class API:
                             largest_time_delta = median_time_delta
                     
                     # Stocker les données
-                    capteurs_data[capteur_id] = {"nom": capteur_nom, "data": df}
+                    capteurs_data[capteur_id] = series
                     
                 except Exception as e:
                     logger.error(f"Erreur lors du chargement des données: {e}")
@@ -733,28 +956,26 @@ class API:
                         need_normalization = True
                         break
             
-            # Normaliser les données seulement si nécessaire
-            if need_normalization and largest_time_delta is not None:
+            # Agrégats journaliers conservés à l'analyse : pas de nouveau calcul sur les mesures
+            for capteur_id, capteur in capteurs_data.items():
+                try:
+                    rollup = self.data_loader.load_rollup(self.capteurs[capteur_id], "day", start_date_obj, end_date_obj)
+                except Exception as e:
+                    logger.warning(f"Agrégats conservés indisponibles pour {capteur.nom}: {e}")
+                    rollup = None
+                if rollup is not None:
+                    capteur.daily = DailyAggregator.from_rollup(rollup)
+
+            # Normaliser les données seulement si nécessaire (graphiques travaillant sur les
+            # mesures elles-mêmes ; les graphiques journaliers utilisent les agrégats)
+            if need_normalization and largest_time_delta is not None and graph_type in aligned_graphs:
                 logger.info("Normalisation des données avec différents intervalles de temps")
                 for capteur_id, capteur in capteurs_data.items():
-                    df = capteur["data"]
-                    
-                    # Supprimer les doublons de date
-                    if df['date'].duplicated().any():
-                        df = df.drop_duplicates(subset=['date'], keep='first')
-                    
-                    # Créer un nouvel index de temps
-                    min_date, max_date = df['date'].min(), df['date'].max()
-                    new_index = pd.date_range(start=min_date, end=max_date, freq=largest_time_delta)
-                    
-                    # Réindexer avec interpolation
-                    df_reindexed = df.set_index('date').reindex(new_index).interpolate(method='time')
-                    df_reindexed.reset_index(inplace=True)
-                    df_reindexed.rename(columns={'index': 'date'}, inplace=True)
-                    
-                    capteurs_data[capteur_id]["data"] = df_reindexed
+                    # Agrégats journaliers calculés sur les mesures d'origine
+                    capteur.daily = self.graph_generator.daily(capteur_id, capteur)
+                    capteurs_data[capteur_id] = self.resampler.align(capteur_id, capteur, largest_time_delta)
             else:
-                logger.info("Normalisation ignorée - tous les capteurs ont le même intervalle de temps ou un seul capteur sélectionné")
+                logger.info("Normalisation ignorée - intervalles identiques, capteur unique ou graphique journalier")
             
             # Utiliser un dictionnaire pour mapper les types de graphiques aux méthodes
             graph_generators = {
@@ -763,12 +984,31 @@ class API:
                 "temperature_amplitude": self.graph_generator.generate_temperature_amplitude_graph,
                 "humidity_amplitude": self.graph_generator.generate_humidity_amplitude_graph,
                 "humidity_profile_per_sensor": self.graph_generator.generate_all_humidity_distribution_pair_graphs,
-                "dew_point_risk": self.graph_generator.generate_dew_point_risk_graph_
+                "dew_point_risk": self.graph_generator.generate_dew_point_risk_graph_,
+                "humidity_map": self.graph_generator.generate_humidity_map_graph
             }
             
+            # Options propres au graphique : classes de la répartition d'humidité de la
+            # campagne, paramètres de la cartographie
+            graph_options = {}
+            if graph_type == "humidity_profile_per_sensor":
+                graph_options = {
+                    "humidity_bins": options.get("humidity_bins"),
+                    "amplitude_bins": options.get("amplitude_bins"),
+                }
+            elif graph_type in spatial_graphs:
+                graph_options = {
+                    key: options[key]
+                    for key in ("method", "extent", "resolution", "model", "variogram_range")
+                    if options.get(key) is not None
+                }
+
             # Générer le graphique
             if graph_type in graph_generators:
-                return graph_generators[graph_type](capteurs_data)
+                result = graph_generators[graph_type](capteurs_data, **graph_options)
+                if cache_key and result.get("success"):
+                    self.render_cache.put(cache_key, capteur_ids, result)
+                return result
             else:
                 return {"success": False, "message": f"Type de graphique non pris en charge: {graph_type}"}
                 
@@ -790,6 +1030,105 @@ class API:
     
 
 
+    def generate_all_graphs(self, capteur_ids, options=None):
+        """
+        Générer tous les types de graphiques pour les mêmes capteurs, en parallèle
+
+        Chaque graphique est rendu sur sa propre figure : les types sont générés
+        simultanément dans un pool de threads.
+
+        Args:
+            capteur_ids (list): Liste des IDs des capteurs
+            options (dict, optional): Options communes (plage de dates, etc.)
+
+        Returns:
+            dict: Résultat de generate_graph pour chaque type de graphique
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+
+        try:
+            graph_types = [graph_type["id"] for graph_type in self.get_graph_types()["types"]]
+            with ThreadPoolExecutor(max_workers=min(len(graph_types), RENDER_WORKERS)) as executor:
+                results = executor.map(
+                    lambda graph_type: self.generate_graph(graph_type, capteur_ids, options), graph_types
+                )
+                graphs = dict(zip(graph_types, results))
+            return {"success": True, "graphs": graphs}
+        except Exception as e:
+            logger.error(f"Erreur lors de la génération des graphiques: {e}")
+            return {"success": False, "message": f"Erreur lors de la génération des graphiques: {e}"}
+
+    def get_condensation_events(self, capteur_ids, options=None):
+        """
+        Détecter les épisodes de risque de condensation (écart T - Td sous un seuil)
+
+        Args:
+            capteur_ids (list): Liste des IDs des capteurs
+            options (dict, optional): Seuil en °C ('threshold', 3 par défaut) et plage
+                de dates ('start_date', 'end_date')
+
+        Returns:
+            dict: Résultat contenant, par capteur, le résumé et la liste des épisodes
+            (début, fin, durée en heures, écart minimal, degrés-heures)
+        """
+        import logging
+        import pandas as pd
+        logger = logging.getLogger(__name__)
+
+        try:
+            options = options or {}
+            threshold = float(options.get("threshold", DEFAULT_THRESHOLD))
+            start_date = pd.to_datetime(options["start_date"]) if options.get("start_date") else None
+            end_date = pd.to_datetime(options["end_date"]) if options.get("end_date") else None
+
+            for capteur_id in capteur_ids:
+                if capteur_id not in self.capteurs:
+                    return {"success": False, "message": f"Capteur {capteur_id} non trouvé"}
+                capteur_data = self.capteurs[capteur_id]
+                columns = capteur_data.get("columns") or {}
+                if not capteur_data.get("file_path") or not (columns.get("date") and columns.get("temperature")):
+                    return {"success": False, "message": f"Le capteur {capteur_data['nom']} n'a pas de mappage complet pour les colonnes obligatoires"}
+                if not (columns.get("dew_point") or columns.get("humidity")):
+                    return {"success": False, "message": f"Le capteur {capteur_data['nom']} n'a ni point de rosée ni humidité"}
+
+            self.ingest_worker.wait(capteur_ids)
+            loaded = self.parallel_loader.load_many(
+                {capteur_id: self.capteurs[capteur_id] for capteur_id in capteur_ids}
+            )
+
+            results = []
+            for capteur_id in capteur_ids:
+                capteur_nom = self.capteurs[capteur_id]["nom"]
+                df = loaded[capteur_id]
+                if isinstance(df, Exception):
+                    return {"success": False, "message": f"Erreur lors du chargement des données pour {capteur_nom}: {df}"}
+
+                series = SensorSeries.from_frame(capteur_id, capteur_nom, df)
+                series = series.slice(*TimeRangeIndex(series.date).bounds(start_date, end_date))
+                events = self.graph_generator.condensation.detect(series, threshold)
+                results.append({
+                    "id": capteur_id,
+                    "nom": capteur_nom,
+                    "summary": self.graph_generator.condensation.summarize(events),
+                    "events": [
+                        {
+                            "start": start.isoformat(),
+                            "end": end.isoformat(),
+                            "duration_hours": round(duration.total_seconds() / 3600, 2),
+                            "min_gap": round(float(min_gap), 2),
+                            "degree_hours": round(float(degree_hours), 2),
+                        }
+                        for start, end, duration, min_gap, degree_hours in events.itertuples(index=False, name=None)
+                    ],
+                })
+
+            return {"success": True, "data": {"threshold": threshold, "capteurs": results}}
+
+        except Exception as e:
+            logger.error(f"Erreur lors de la détection des épisodes de condensation: {e}")
+            return {"success": False, "message": f"Erreur lors de la détection des épisodes de condensation: {e}"}
+
     def export_graph(self, graph_type, capteur_ids, format="png"):
         """
         Exporter un graphique en fichier image
@@ -0,0 +1,236 @@
+"""
+Module ParseCache - Cache disque des données de capteurs déjà analysées
+"""
+import os
+import json
+import shutil
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Version du format de cache (à incrémenter si la structure change)
+CACHE_VERSION = 4
+
+# Taille des blocs lus pour l'empreinte du contenu
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ParseCache:
+    """
+    Classe pour conserver sur disque les séries analysées, typées et mappées
+
+    Chaque fichier source possède une entrée (un dossier) contenant un fichier
+    meta.json et un fichier .npy par colonne : les dates en int64 (nanosecondes
+    depuis l'epoch) et les voies en float32, relus par projection mémoire.
+    L'entrée est invalidée dès que l'empreinte du fichier (taille, date de
+    modification, hash du contenu) ou le mappage des colonnes change.
+    """
+
+    def __init__(self, cache_dir):
+        """
+        Initialise le cache
+
+        Args:
+            cache_dir (str): Répertoire du cache
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def load_series(self, file_path, columns):
+        """
+        Charger une série depuis le cache
+
+        Args:
+            file_path (str): Chemin du fichier source
+            columns (dict): Mappage des colonnes utilisé pour l'analyse
+
+        Returns:
+            pandas.DataFrame: Données en cache, ou None si absentes ou périmées
+        """
+        meta = self._load_valid_meta(file_path)
+        if not meta or not meta.get("series"):
+            return None
+
+        series = meta["series"]
+        if series.get("columns") != self._clean_mapping(columns):
+            return None
+
+        entry_dir = self._entry_dir(file_path)
+        try:
+            data = {}
+            for name in series["channels"]:
+                values = np.load(os.path.join(entry_dir, f"{name}.npy"), mmap_mode="r")
+                data[name] = values.view("datetime64[ns]") if name == "date" else values
+            df = pd.DataFrame(data, copy=False)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrée de cache illisible pour {file_path}: {e}")
+            self.invalidate(file_path)
+            return None
+
+        logger.info(f"Données lues depuis le cache pour {file_path}: {len(df)} lignes")
+        return df
+
+    def save_series(self, file_path, columns, df):
+        """
+        Enregistrer une série analysée dans le cache
+
+        Args:
+            file_path (str): Chemin du fichier source
+            columns (dict): Mappage des colonnes utilisé pour l'analyse
+            df (pandas.DataFrame): Données préparées (colonne 'date' et voies)
+        """
+        try:
+            meta = self._load_valid_meta(file_path) or self._new_meta(file_path)
+            entry_dir = self._entry_dir(file_path)
+            os.makedirs(entry_dir, exist_ok=True)
+
+            channels = list(df.columns)
+            for name in channels:
+                if name == "date":
+                    values = df["date"].values.astype("datetime64[ns]").view(np.int64)
+                else:
+                    values = df[name].to_numpy(dtype=np.float32)
+                np.save(os.path.join(entry_dir, f"{name}.npy"), np.ascontiguousarray(values))
+
+            meta["series"] = {
+                "columns": self._clean_mapping(columns),
+                "channels": channels,
+                "rows": len(df),
+            }
+            # meta.json est écrit en dernier : il valide l'entrée
+            self._write_meta(file_path, meta)
+        except Exception as e:
+            logger.warning(f"Impossible d'écrire le cache pour {file_path}: {e}")
+
+    def load_summary(self, file_path):
+        """
+        Charger le résumé d'un fichier (colonnes et aperçu) depuis le cache
+
+        Args:
+            file_path (str): Chemin du fichier source
+
+        Returns:
+            dict: Résumé en cache, ou None si absent ou périmé
+        """
+        meta = self._load_valid_meta(file_path)
+        return meta.get("summary") if meta else None
+
+    def save_summary(self, file_path, summary):
+        """
+        Enregistrer le résumé d'un fichier (colonnes et aperçu)
+
+        Args:
+            file_path (str): Chemin du fichier source
+            summary (dict): Résumé sérialisable en JSON
+        """
+        try:
+            meta = self._load_valid_meta(file_path) or self._new_meta(file_path)
+            meta["summary"] = summary
+            self._write_meta(file_path, meta)
+        except Exception as e:
+            logger.warning(f"Impossible d'écrire le résumé en cache pour {file_path}: {e}")
+
+    def invalidate(self, file_path):
+        """
+        Supprimer l'entrée de cache d'un fichier
+
+        Args:
+            file_path (str): Chemin du fichier source
+        """
+        shutil.rmtree(self._entry_dir(file_path), ignore_errors=True)
+
+    def fingerprint(self, file_path):
+        """
+        Calculer l'empreinte d'un fichier
+
+        Args:
+            file_path (str): Chemin du fichier
+
+        Returns:
+            dict: Chemin, taille, date de modification et hash du contenu
+        """
+        stat = os.stat(file_path)
+        return {
+            "path": self._normalize_path(file_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": self._content_hash(file_path),
+        }
+
+    def _load_valid_meta(self, file_path):
+        """
+        Lire les métadonnées d'une entrée si elle correspond toujours au fichier
+
+        La taille et la date de modification évitent de recalculer le hash à chaque
+        appel ; si elles diffèrent, le hash du contenu tranche.
+        """
+        meta_file = os.path.join(self._entry_dir(file_path), "meta.json")
+        if not os.path.exists(meta_file) or not os.path.exists(file_path):
+            return None
+
+        try:
+            with open(meta_file, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            self.invalidate(file_path)
+            return None
+
+        known = meta.get("file", {})
+        if meta.get("version") != CACHE_VERSION or known.get("path") != self._normalize_path(file_path):
+            self.invalidate(file_path)
+            return None
+
+        stat = os.stat(file_path)
+        if known.get("size") == stat.st_size and known.get("mtime_ns") == stat.st_mtime_ns:
+            return meta
+
+        # Fichier touché : vérifier si le contenu a réellement changé
+        if known.get("size") == stat.st_size and known.get("hash") == self._content_hash(file_path):
+            known["mtime_ns"] = stat.st_mtime_ns
+            self._write_meta(file_path, meta)
+            return meta
+
+        logger.info(f"Cache périmé pour {file_path}, nouvelle analyse nécessaire")
+        self.invalidate(file_path)
+        return None
+
+    def _new_meta(self, file_path):
+        """Créer les métadonnées d'une nouvelle entrée"""
+        return {"version": CACHE_VERSION, "file": self.fingerprint(file_path)}
+
+    def _write_meta(self, file_path, meta):
+        """Écrire les métadonnées de façon atomique"""
+        entry_dir = self._entry_dir(file_path)
+        os.makedirs(entry_dir, exist_ok=True)
+        meta_file = os.path.join(entry_dir, "meta.json")
+        tmp_file = meta_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_file, meta_file)
+
+    def _entry_dir(self, file_path):
+        """Dossier de l'entrée associée à un fichier source"""
+        key = hashlib.sha1(self._normalize_path(file_path).encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.cache_dir, key)
+
+    @staticmethod
+    def _content_hash(file_path):
+        """Hash du contenu d'un fichier"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _normalize_path(file_path):
+        """Chemin absolu normalisé"""
+        return os.path.normcase(os.path.abspath(file_path))
+
+    @staticmethod
+    def _clean_mapping(columns):
+        """Mappage sans les entrées vides, pour comparaison"""
+        return {k: v for k, v in sorted((columns or {}).items()) if v}
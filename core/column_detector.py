@@ -0,0 +1,178 @@
+"""
+Module ColumnDetector - Détection des colonnes de date, température, humidité et point de rosée
+"""
+import re
+import logging
+import unicodedata
+import pandas as pd
+
+from core.date_parser import DateParser
+
+logger = logging.getLogger(__name__)
+
+# Nombre de lignes examinées pour les vérifications sur le contenu
+SAMPLE_ROWS = 200
+
+# Score minimal pour retenir une colonne
+MIN_SCORE = 3
+
+# Part minimale de valeurs numériques attendue dans une colonne de mesures
+MIN_NUMERIC_RATIO = 0.5
+
+# Motifs pondérés par type de colonne, appliqués aux en-têtes normalisés (sans accents,
+# en minuscules, ponctuation remplacée par des espaces). Un poids négatif écarte la colonne.
+KEYWORD_WEIGHTS = {
+    "date": [
+        (r"\bdate\b", 5),
+        (r"\bdatetime\b", 5),
+        (r"\bhorodatage\b", 5),
+        (r"\btimestamp\b", 5),
+        (r"\btime\b", 3),
+        (r"\bheure\b", 3),
+        (r"\bperiode\b", 2),
+        (r"\bjour\b", 2),
+        (r"\b(gmt|utc|cet|cest)\b", 2),
+    ],
+    "temperature": [
+        (r"\btemp(erature)?s?\b", 5),
+        (r"\b(celsius|thermique|degre|deg)\b", 4),
+        (r"\bt\b", 1),
+        (r"\b(dew|rosee|ptrosee|condensation)\b", -10),
+    ],
+    "humidity": [
+        (r"\bhumid(ite|ity)?\b", 5),
+        (r"\b(hr|rh)\b", 5),
+        (r"\b(hygrometrie|moisture)\b", 5),
+        (r"\b(batterie|battery|charge)\b", -10),
+    ],
+    "dew_point": [
+        (r"\bdew\s*point\b", 6),
+        (r"\bpoint\s+de\s+rosee\b", 6),
+        (r"\bpt\s*rosee\b", 6),
+        (r"\bptrosee\b", 6),
+        (r"\brosee\b", 5),
+        (r"\bdew\b", 5),
+        (r"\bpoint\s+de\s+condensation\b", 5),
+        (r"\bdp\b", 3),
+    ],
+}
+
+# Unités lues dans l'en-tête brut : bonus pour le type attendu
+UNIT_WEIGHTS = {
+    "temperature": (re.compile(r"°\s*c\b|\(c\)", re.IGNORECASE), 2),
+    "dew_point": (re.compile(r"°\s*c\b", re.IGNORECASE), 1),
+    "humidity": (re.compile(r"%"), 2),
+}
+
+# Précompilation des motifs
+KEYWORD_MATCHERS = {
+    col_type: [(re.compile(pattern), weight) for pattern, weight in patterns]
+    for col_type, patterns in KEYWORD_WEIGHTS.items()
+}
+
+# Informations d'appareil à ignorer dans les en-têtes (ex: "(LGR S/N: 9928996, SEN S/N: 9928996)")
+DEVICE_INFO_PATTERN = re.compile(r"\((?:LGR|SEN)\s+S/N[^)]*\)", re.IGNORECASE)
+NON_ALNUM_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
+class ColumnDetector:
+    """
+    Classe pour associer les colonnes d'un fichier aux grandeurs mesurées
+
+    Chaque en-tête est normalisé une seule fois puis noté pour chaque type de colonne
+    à l'aide de motifs précompilés pondérés (mots-clés, unités, exclusions). Les
+    colonnes sont attribuées par score décroissant, chacune à un seul type. Le contenu
+    n'est examiné que sur un échantillon borné de lignes.
+    """
+
+    def __init__(self, sample_rows=SAMPLE_ROWS):
+        """
+        Initialise le détecteur
+
+        Args:
+            sample_rows (int, optional): Nombre de lignes examinées pour le contenu
+        """
+        self.sample_rows = sample_rows
+        self.date_parser = DateParser()
+
+    def detect(self, df):
+        """
+        Détecter les colonnes de date, température, humidité et point de rosée
+
+        Args:
+            df (pandas.DataFrame): Données du fichier (le début suffit)
+
+        Returns:
+            dict: Mapping type de colonne -> nom de colonne
+        """
+        sample = df.head(self.sample_rows)
+        columns = df.columns.tolist()
+
+        candidates = []
+        for position, col in enumerate(columns):
+            header = str(col)
+            normalized = self.normalize(header)
+            for col_type, matchers in KEYWORD_MATCHERS.items():
+                score = sum(weight for matcher, weight in matchers if matcher.search(normalized))
+                unit = UNIT_WEIGHTS.get(col_type)
+                if unit and score >= 0 and unit[0].search(header):
+                    score += unit[1]
+                if score >= MIN_SCORE and self._content_matches(sample[col], col_type):
+                    # À score égal, la première colonne l'emporte
+                    candidates.append((score, -position, col_type, col))
+
+        mapping = {}
+        used = set()
+        for score, _, col_type, col in sorted(candidates, reverse=True):
+            if col_type not in mapping and col not in used:
+                mapping[col_type] = col
+                used.add(col)
+
+        if "date" not in mapping:
+            # Aucun en-tête reconnu : chercher une colonne d'horodatages par son contenu
+            for col in columns:
+                if col not in used and self._looks_like_dates(sample[col]):
+                    mapping["date"] = col
+                    break
+
+        # Ordre habituel des types
+        return {col_type: mapping[col_type] for col_type in KEYWORD_WEIGHTS if col_type in mapping}
+
+    @staticmethod
+    def normalize(header):
+        """
+        Normaliser un en-tête : sans accents ni informations d'appareil, en minuscules
+
+        Args:
+            header (str): En-tête brut
+
+        Returns:
+            str: En-tête normalisé (mots séparés par des espaces)
+        """
+        header = DEVICE_INFO_PATTERN.sub(" ", header)
+        header = unicodedata.normalize("NFKD", header).encode("ASCII", "ignore").decode("ascii")
+        return NON_ALNUM_PATTERN.sub(" ", header.lower()).strip()
+
+    def _content_matches(self, values, col_type):
+        """Vérifier sur l'échantillon que le contenu correspond au type"""
+        if col_type == "date":
+            return self._looks_like_dates(values)
+        if values.empty or pd.api.types.is_numeric_dtype(values):
+            return True
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return False
+        numeric = pd.to_numeric(values, errors="coerce")
+        return numeric.notna().mean() >= MIN_NUMERIC_RATIO
+
+    def _looks_like_dates(self, values):
+        """Vérifier sur l'échantillon qu'une colonne contient des horodatages"""
+        values = values.dropna()
+        if values.empty or pd.api.types.is_datetime64_any_dtype(values):
+            return True
+        if self.date_parser.infer_format(values) is not None:
+            return True
+        if pd.api.types.is_numeric_dtype(values):
+            # Nombres : seulement des numéros de série Excel ou des epochs plausibles
+            return False
+        parsed = pd.to_datetime(values.astype(str), errors="coerce", format="mixed")
+        return parsed.notna().mean() > 0.5
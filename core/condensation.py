@@ -0,0 +1,135 @@
+"""
+Module CondensationDetector - Détection des épisodes de risque de condensation
+"""
+import logging
+import numpy as np
+import pandas as pd
+
+from core.sensor_series import as_series
+
+logger = logging.getLogger(__name__)
+
+# Écart au point de rosée (°C) en dessous duquel la condensation est à craindre
+DEFAULT_THRESHOLD = 3.0
+
+# Au-delà de ce multiple de l'intervalle médian, un trou de mesures coupe l'épisode
+MAX_GAP_FACTOR = 2.0
+
+NS_PER_HOUR = 3600 * 10**9
+
+
+class CondensationDetector:
+    """
+    Classe pour détecter les épisodes où l'écart au point de rosée (T - Td) passe sous un seuil
+
+    La série est parcourue une seule fois : les mesures sous le seuil sont codées par
+    plages (run-length) à partir des changements d'état, puis chaque plage est réduite
+    en une passe (minimum de l'écart, degrés-heures cumulés sous le seuil). Chaque mesure
+    compte pour la durée qui la sépare de la suivante ; un trou dans les mesures
+    termine l'épisode en cours.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        """
+        Initialise le détecteur
+
+        Args:
+            threshold (float, optional): Seuil d'écart au point de rosée (°C)
+        """
+        self.threshold = threshold
+
+    def detect(self, series, threshold=None):
+        """
+        Détecter les épisodes de risque de condensation d'un capteur
+
+        Args:
+            series (SensorSeries or pandas.DataFrame): Série triée ('date', 'temperature'
+                et 'dew_point')
+            threshold (float, optional): Seuil (°C). Par défaut: celui du détecteur
+
+        Returns:
+            pandas.DataFrame: Un épisode par ligne (start, end, duration, min_gap,
+            degree_hours), dans l'ordre chronologique
+        """
+        threshold = self.threshold if threshold is None else threshold
+        series = as_series(series)
+        if len(series) == 0 or "ecart" not in series:
+            return self._empty()
+
+        dates = series.dates
+        gap = series.channel("ecart")
+
+        # Durée représentée par chaque mesure : jusqu'à la suivante, bornée en cas de trou
+        steps = np.diff(dates)
+        median_step = int(np.median(steps)) if len(steps) else NS_PER_HOUR
+        max_step = int(median_step * MAX_GAP_FACTOR)
+        weights = np.append(np.where(steps > max_step, median_step, steps), median_step)
+
+        # Plages de mesures sous le seuil (NaN : hors épisode), coupées aux trous
+        below = gap < threshold
+        breaks = np.append(steps > max_step, False)
+        edges = np.diff(below.astype(np.int8), prepend=0, append=0)
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        if len(starts) == 0:
+            return self._empty()
+        cut = np.flatnonzero(breaks & below & np.append(below[1:], False)) + 1
+        if len(cut):
+            starts = np.sort(np.concatenate((starts, cut)))
+            ends = np.sort(np.concatenate((ends, cut)))
+
+        # Réductions limitées à chaque plage [début, fin) : sommes cumulées et minimum
+        # par segments alternés début/fin (une valeur sentinelle termine le tableau)
+        deficit = np.where(below, threshold - gap, 0.0) * weights / NS_PER_HOUR
+        degree_hours = self._range_sums(deficit, starts, ends)
+        durations = self._range_sums(np.where(below, weights, 0), starts, ends)
+        bounds = np.column_stack((starts, ends)).ravel()
+        min_gap = np.minimum.reduceat(np.append(np.where(below, gap, np.inf), np.inf), bounds)[::2].astype(np.float64)
+
+        return pd.DataFrame({
+            "start": dates[starts].view("datetime64[ns]"),
+            "end": dates[ends - 1].view("datetime64[ns]"),
+            "duration": durations.view("timedelta64[ns]"),
+            "min_gap": min_gap,
+            "degree_hours": degree_hours,
+        })
+
+    @staticmethod
+    def summarize(events):
+        """
+        Résumer les épisodes d'un capteur
+
+        Args:
+            events (pandas.DataFrame): Épisodes renvoyés par detect()
+
+        Returns:
+            dict: Nombre d'épisodes, durée totale et plus longue (heures), écart
+            minimal et degrés-heures cumulés
+        """
+        if events.empty:
+            return {"count": 0, "total_hours": 0.0, "longest_hours": 0.0, "min_gap": None, "degree_hours": 0.0}
+        hours = events["duration"].to_numpy().view(np.int64) / NS_PER_HOUR
+        return {
+            "count": int(len(events)),
+            "total_hours": round(float(hours.sum()), 2),
+            "longest_hours": round(float(hours.max()), 2),
+            "min_gap": round(float(events["min_gap"].min()), 2),
+            "degree_hours": round(float(events["degree_hours"].sum()), 2),
+        }
+
+    @staticmethod
+    def _range_sums(values, starts, ends):
+        """Sommes des valeurs sur chaque plage [début, fin)"""
+        cumulative = np.concatenate(([0], np.cumsum(values)))
+        return cumulative[ends] - cumulative[starts]
+
+    @staticmethod
+    def _empty():
+        """Table d'épisodes vide"""
+        return pd.DataFrame({
+            "start": np.empty(0, dtype="datetime64[ns]"),
+            "end": np.empty(0, dtype="datetime64[ns]"),
+            "duration": np.empty(0, dtype="timedelta64[ns]"),
+            "min_gap": np.empty(0),
+            "degree_hours": np.empty(0),
+        })
@@ -0,0 +1,189 @@
+"""
+Module DailyAggregator - Agrégats journaliers partagés par tous les graphiques
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core.sensor_series import as_series
+
+logger = logging.getLogger(__name__)
+
+NS_PER_DAY = 86400 * 10**9
+
+# Statistiques calculées pour chaque grandeur
+DAILY_STATS = ("mean", "min", "max", "count")
+
+# Nombre de résultats conservés en mémoire
+MEMO_SIZE = 64
+
+
+def series_key(capteur_id, series):
+    """
+    Clé de mémorisation d'une série : capteur, plage de dates et empreinte des valeurs
+
+    Args:
+        capteur_id (str): ID du capteur
+        series (SensorSeries or pandas.DataFrame): Données du capteur
+
+    Returns:
+        tuple: Clé identifiant le contenu de la série
+    """
+    series = as_series(series)
+    dates = series.dates
+    if len(dates) == 0:
+        return (capteur_id, 0, None, None, None)
+
+    # Empreinte de toutes les valeurs : une correction entre deux lignes quelconques
+    # change la clé (blake2b sur quelques Mo : négligeable devant l'agrégation)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(dates).data)
+    for name in sorted(series.channels):
+        digest.update(name.encode("utf-8"))
+        digest.update(np.ascontiguousarray(series.channels[name]).data)
+    return (capteur_id, len(dates), int(dates.min()), int(dates.max()), digest.hexdigest())
+
+
+
+class DailyAggregator:
+    """
+    Classe pour calculer les agrégats journaliers des capteurs
+
+    Pour chaque capteur, la température, l'humidité et l'écart au point de rosée
+    (T - Td) sont agrégés par jour (moyenne, minimum, maximum, nombre de mesures) en
+    une seule passe vectorisée : les dates sont ramenées à des numéros de jour entiers
+    et chaque statistique est réduite par segment de jours consécutifs. Le résultat est
+    conservé par capteur et plage de dates, de sorte que tous les graphiques d'une
+    même série réutilisent le même calcul.
+    """
+
+    def __init__(self, memo_size=MEMO_SIZE):
+        """
+        Initialise l'agrégateur
+
+        Args:
+            memo_size (int, optional): Nombre de résultats conservés en mémoire
+        """
+        self.memo_size = memo_size
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, capteur_id, series):
+        """
+        Obtenir les agrégats journaliers d'un capteur
+
+        Args:
+            capteur_id (str): ID du capteur
+            series (SensorSeries or pandas.DataFrame): Données du capteur
+
+        Returns:
+            pandas.DataFrame: Une ligne par jour ('jour' puis, par grandeur, mean,
+            min, max et count)
+        """
+        series = as_series(series)
+        key = series_key(capteur_id, series)
+        with self._lock:
+            daily = self._memo.get(key)
+            if daily is not None:
+                self._memo.move_to_end(key)
+                return daily
+
+        daily = self.compute(series)
+        with self._lock:
+            self._memo[key] = daily
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return daily
+
+    def clear(self):
+        """Vider les résultats conservés"""
+        with self._lock:
+            self._memo.clear()
+
+    @staticmethod
+    def compute(series):
+        """
+        Calculer les agrégats journaliers d'une série
+
+        Les voies sont lues en float32 et accumulées en float64, sans copie préalable
+        de la série.
+
+        Args:
+            series (SensorSeries or pandas.DataFrame): Données du capteur
+
+        Returns:
+            pandas.DataFrame: Une ligne par jour ('jour' puis, par grandeur, mean,
+            min, max et count)
+        """
+        series = as_series(series)
+        dates = series.dates
+        channels = {name: series.channel(name) for name in ("temperature", "humidity", "dew_point", "ecart")
+                    if name in series}
+
+        order = None
+        if len(dates) > 1 and (np.diff(dates) < 0).any():
+            order = np.argsort(dates, kind="stable")
+            dates = dates[order]
+
+        day_keys = dates // NS_PER_DAY
+        if len(day_keys):
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(day_keys)) + 1))
+        else:
+            starts = np.empty(0, dtype=np.int64)
+
+        data = {"jour": (day_keys[starts] * NS_PER_DAY).view("datetime64[ns]")}
+        for name, values in channels.items():
+            if order is not None:
+                values = values[order]
+            data.update(DailyAggregator._reduce(name, values, starts))
+        return pd.DataFrame(data)
+
+    @staticmethod
+    def from_rollup(rollup):
+        """
+        Convertir des agrégats journaliers conservés au format de l'agrégateur
+
+        Args:
+            rollup (pandas.DataFrame): Agrégats par jour ('date' puis, par voie, count,
+                sum, min, max et mean)
+
+        Returns:
+            pandas.DataFrame: Une ligne par jour ('jour' puis, par grandeur, mean,
+            min, max et count)
+        """
+        data = {"jour": rollup["date"].to_numpy()}
+        for column in rollup.columns:
+            name, _, stat = column.rpartition("_")
+            if stat in DAILY_STATS:
+                values = rollup[column].to_numpy()
+                data[column] = values.astype(np.int64) if stat == "count" else values
+        return pd.DataFrame(data)
+
+    @staticmethod
+    def _reduce(name, values, starts):
+        """Moyenne, minimum, maximum et nombre de valeurs par segment de jour"""
+        if len(starts) == 0:
+            return {f"{name}_{stat}": np.empty(0) for stat in DAILY_STATS}
+
+        valid = ~np.isnan(values)
+        count = np.add.reduceat(valid.astype(np.int64), starts)
+        total = np.add.reduceat(np.where(valid, values, 0), starts, dtype=np.float64)
+        minimum = np.minimum.reduceat(np.where(valid, values, np.inf), starts).astype(np.float64)
+        maximum = np.maximum.reduceat(np.where(valid, values, -np.inf), starts).astype(np.float64)
+
+        empty = count == 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = total / count
+        mean[empty] = np.nan
+        minimum[empty] = np.nan
+        maximum[empty] = np.nan
+        return {
+            f"{name}_mean": mean,
+            f"{name}_min": minimum,
+            f"{name}_max": maximum,
+            f"{name}_count": count,
+        }
@@ -1,21 +1,77 @@
 """Module DataLoader - Chargement et traitement des données"""
 import pandas as pd
+import numpy as np
 import os
+import re
+import csv
+import codecs
 import logging
+from core.hobo_reader import HoboReader
+from core.cache import ParseCache
+from core.date_parser import DateParser
+from core.xlsx_reader import XlsxReader
+from core.series_store import SeriesStore
+from core.column_detector import ColumnDetector
+from core.psychrometrics import dew_point
 
 logger = logging.getLogger(__name__)
 
+# Taille lue pour détecter la structure d'un fichier texte
+SNIFF_BYTES = 64 * 1024
+
+# Nombre de lignes examinées pour trouver l'en-tête
+SNIFF_ROWS = 20
+
+# Nombre de lignes lues pour détecter les colonnes à l'association d'un fichier
+PREVIEW_ROWS = 200
+
+# Extensions des fichiers de données pris en charge
+SUPPORTED_EXTENSIONS = ('.csv', '.xlsx', '.xls', '.hobo')
+
+# Numéro de série de l'enregistreur dans les en-têtes HOBOware (ex: "LGR S/N: 9928996")
+SERIAL_PATTERN = re.compile(r'LGR S/N:\s*(\d+)')
+
+# Numéro de série en tête du nom des exports HOBOconnect (ex: "21027238 Nord 2023-09-27 ...")
+FILENAME_SERIAL_PATTERN = re.compile(r'^(\d{6,})\b')
+
+# Horodatage d'export ajouté par HOBOconnect à la fin des noms de fichiers
+EXPORT_SUFFIX_PATTERN = re.compile(r'\s+\d{4}-\d{2}-\d{2}\s+\d{2}_\d{2}_\d{2}.*$')
+
+# Séparateurs candidats pour les fichiers CSV
+SNIFF_DELIMITERS = (',', ';', '\t', '|')
+
 class DataLoader:
     """
     Classe pour charger et traiter les données des fichiers
     """
+
+    def __init__(self, cache_dir=None, series_dir=None):
+        """
+        Initialise le chargeur de données
+
+        Args:
+            cache_dir (str, optional): Répertoire du cache des données analysées
+            series_dir (str, optional): Répertoire des séries conservées par enregistreur
+        """
+        self.hobo_reader = HoboReader()
+        self.date_parser = DateParser()
+        self.column_detector = ColumnDetector()
+        self.xlsx_reader = XlsxReader()
+        self.cache = ParseCache(cache_dir) if cache_dir else None
+        self.series_store = SeriesStore(series_dir) if series_dir else None
     
-    def load_file(self, file_path):
+    def load_file(self, file_path, sniff=None, usecols=None, float_columns=None, nrows=None, skip_rows=0):
         """
         Charger un fichier de données (Excel, CSV ou HOBO)
         
         Args:
             file_path (str): Chemin du fichier à charger
+            sniff (dict, optional): Résultat de sniff_file déjà connu pour ce fichier
+            usecols (list, optional): Colonnes à lire (toutes par défaut). Les colonnes
+                absentes du fichier sont ignorées.
+            float_columns (list, optional): Colonnes à lire directement en float32
+            nrows (int, optional): Nombre maximal de lignes de données à lire
+            skip_rows (int, optional): Nombre de lignes de données à ignorer au début
             
         Returns:
             pandas.DataFrame: Données chargées
@@ -28,62 +84,297 @@ class DataLoader:
             raise FileNotFoundError(f"Le fichier n'existe pas: {file_path}")
             
         try:
-            file_extension = os.path.splitext(file_path.lower())[1]
+            # Réutiliser la détection d'en-tête si le fichier n'a pas changé depuis
+            if not self._sniff_is_current(file_path, sniff):
+                sniff = self.sniff_file(file_path)
+
+            # Projection : seules les colonnes demandées sont décodées et allouées
+            wanted = set(usecols) if usecols else None
+            column_filter = (lambda col: col in wanted) if wanted else None
+            dtype = {col: np.float32 for col in float_columns} if float_columns else None
             
-            if file_extension in ('.xlsx', '.xls'):
+            if sniff["format"] == 'excel' and file_path.lower().endswith('.xlsx'):
+                logger.info(f"Chargement du fichier Excel: {file_path}")
+                # Lecture en flux du XML de la feuille, mémoire bornée aux colonnes retenues
+                df = self.xlsx_reader.read(
+                    file_path,
+                    header_row=sniff["header_row"],
+                    usecols=usecols,
+                    float_columns=float_columns,
+                    sheet_index=sniff.get("sheet_name", 0),
+                    nrows=nrows,
+                    skip_rows=skip_rows,
+                )
+
+            elif sniff["format"] == 'excel':
                 logger.info(f"Chargement du fichier Excel: {file_path}")
-                df = pd.read_excel(file_path)
-                if df.shape[1] < 2:
-                    for header_row in range(10):
-                        df = pd.read_excel(file_path, header=header_row)
-                        if df.shape[1] >= 2:
-                            break
-                return df
+                read = lambda dtype: pd.read_excel(
+                    file_path,
+                    sheet_name=sniff.get("sheet_name", 0),
+                    header=sniff["header_row"],
+                    skiprows=range(sniff["header_row"] + 1, sniff["header_row"] + 1 + skip_rows) if skip_rows else None,
+                    usecols=column_filter,
+                    dtype=dtype,
+                    nrows=nrows,
+                )
+                df = self._read_typed(read, dtype, file_path)
                 
-            elif file_extension == '.csv':
+            elif sniff["format"] == 'csv':
                 logger.info(f"Chargement du fichier CSV: {file_path}")
-                df = pd.read_csv(file_path)
-                if df.shape[1] < 2:
-                    for header_row in range(10):
-                        df = pd.read_csv(file_path, header=header_row)
-                        if df.shape[1] >= 2:
-                            break
-                return df
+                if skip_rows:
+                    # Lignes sautées sans être analysées : seule la fin du fichier est lue
+                    read = lambda dtype: self._read_csv_tail(file_path, sniff, skip_rows, column_filter, dtype, nrows)
+                else:
+                    read = lambda dtype: pd.read_csv(
+                        file_path,
+                        sep=sniff["delimiter"],
+                        encoding=sniff["encoding"],
+                        skiprows=sniff["header_row"],
+                        usecols=column_filter,
+                        dtype=dtype,
+                        nrows=nrows,
+                    )
+                df = self._read_typed(read, dtype, file_path)
                 
-            elif file_extension == '.hobo':
+            elif sniff["format"] == 'hobo':
                 logger.info(f"Chargement du fichier HOBO: {file_path}")
-                # Les fichiers HOBO sont généralement des CSV avec des en-têtes spécifiques
-                # Détecter le nombre de lignes à sauter
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = []
-                    for i, line in enumerate(f):
-                        if i < 20:  # Lire les 20 premières lignes
-                            lines.append(line)
-                        else:
-                            break
-                
-                # Trouver la ligne qui contient probablement les en-têtes
-                header_row = 0
-                for i, line in enumerate(lines):
-                    if any(keyword in line.lower() for keyword in ['date', 'time', 'temp', 'rh']):
-                        header_row = i
-                        break
-                
-                # Lire le fichier avec le bon nombre de lignes à sauter
-                df = pd.read_csv(file_path, sep='\t', skiprows=header_row)
-                if df.shape[1] < 2:
-                    for skip_row in range(20):
-                        df = pd.read_csv(file_path, sep='\t', skiprows=skip_row)
-                        if df.shape[1] >= 2:
-                            break
-                return df                
+                # Les fichiers HOBOconnect sont binaires : décodage natif de l'en-tête et des mesures
+                df = self.hobo_reader.read(file_path, usecols)
+                if skip_rows:
+                    df = df.iloc[skip_rows:].reset_index(drop=True)
+                return df.head(nrows) if nrows is not None else df
             else:
                 raise ValueError(f"Format de fichier non pris en charge: {file_path}")
+
+            if sniff.get("title"):
+                df.attrs["title"] = sniff["title"]
+            return df
                 
         except Exception as e:
             logger.error(f"Erreur lors de la lecture du fichier {file_path}: {str(e)}")
             raise Exception(f"Erreur lors de la lecture du fichier: {str(e)}")
+
+    @staticmethod
+    def _read_csv_tail(file_path, sniff, skip_rows, usecols, dtype, nrows):
+        """Lire un CSV en sautant l'en-tête puis un nombre de lignes de données"""
+        with open(file_path, 'r', encoding=sniff["encoding"], newline='') as f:
+            for _ in range(sniff["header_row"]):
+                f.readline()
+            names = next(csv.reader([f.readline()], delimiter=sniff["delimiter"]))
+            for _ in range(skip_rows):
+                if not f.readline():
+                    break
+            return pd.read_csv(
+                f,
+                sep=sniff["delimiter"],
+                header=None,
+                names=names,
+                usecols=usecols,
+                dtype=dtype,
+                nrows=nrows,
+            )
+
+    @staticmethod
+    def _read_typed(read, dtype, file_path):
+        """
+        Lire un fichier avec les types imposés, sans types si une valeur n'est pas numérique
+
+        Les valeurs non numériques sont alors converties plus tard par pd.to_numeric.
+        """
+        if not dtype:
+            return read(None)
+        try:
+            return read(dtype)
+        except (ValueError, TypeError) as e:
+            logger.info(f"Lecture typée impossible pour {file_path} ({e}), lecture sans types")
+            return read(None)
+
+    def sniff_file(self, file_path):
+        """
+        Détecter la structure d'un fichier en ne lisant que son début
+
+        Pour les CSV, seuls les premiers Ko sont lus (encodage/BOM, séparateur, lignes de
+        titre, ligne d'en-tête) ; pour les fichiers Excel, seules les premières lignes de
+        la feuille sont parcourues en lecture seule.
+
+        Args:
+            file_path (str): Chemin du fichier
+
+        Returns:
+            dict: Format, ligne d'en-tête, séparateur, encodage, titre, taille et date de modification
+
+        Raises:
+            ValueError: Si le format de fichier n'est pas pris en charge
+        """
+        file_extension = os.path.splitext(file_path.lower())[1]
+
+        if file_extension in ('.xlsx', '.xls'):
+            sniff = self._sniff_excel(file_path)
+        elif file_extension == '.csv':
+            sniff = self._sniff_csv(file_path)
+        elif file_extension == '.hobo':
+            sniff = {"format": "hobo", "header_row": 0}
+        else:
+            raise ValueError(f"Format de fichier non pris en charge: {file_path}")
+
+        stat = os.stat(file_path)
+        sniff["size"] = stat.st_size
+        sniff["mtime_ns"] = stat.st_mtime_ns
+        logger.info(f"Structure détectée pour {file_path}: {sniff}")
+        return sniff
+
+    def _sniff_is_current(self, file_path, sniff):
+        """Vérifier qu'un résultat de détection correspond encore au fichier"""
+        if not sniff or "format" not in sniff:
+            return False
+        stat = os.stat(file_path)
+        return sniff.get("size") == stat.st_size and sniff.get("mtime_ns") == stat.st_mtime_ns
+
+    def _sniff_csv(self, file_path):
+        """Détecter encodage, séparateur, titre et ligne d'en-tête d'un CSV"""
+        with open(file_path, 'rb') as f:
+            head = f.read(SNIFF_BYTES)
+            truncated = bool(f.read(1))
+
+        encoding = self._detect_encoding(head)
+        text = head.decode(encoding, errors='ignore')
+        lines = text.splitlines()
+        if truncated and lines:
+            lines = lines[:-1]  # dernière ligne potentiellement coupée
+        lines = lines[:SNIFF_ROWS]
+
+        delimiter, header_row = ',', 0
+        best_score = -1
+        for candidate in SNIFF_DELIMITERS:
+            rows = list(csv.reader(lines, delimiter=candidate))
+            widths = [len(row) for row in rows if any(cell.strip() for cell in row)]
+            if not widths:
+                continue
+            width = max(set(widths), key=widths.count)
+            if width < 2:
+                continue
+            score = widths.count(width) * width
+            if score > best_score:
+                best_score = score
+                delimiter = candidate
+                header_row = next(i for i, row in enumerate(rows) if len(row) == width)
+
+        title = None
+        for line in lines[:header_row]:
+            cleaned = line.strip().strip('"').strip()
+            if cleaned:
+                title = cleaned.split(':', 1)[1].strip() if ':' in cleaned else cleaned
+                break
+
+        return {
+            "format": "csv",
+            "encoding": encoding,
+            "delimiter": delimiter,
+            "header_row": header_row,
+            "title": title,
+        }
+
+    def _sniff_excel(self, file_path):
+        """Trouver la ligne d'en-tête d'un classeur en lisant seulement ses premières lignes"""
+        if file_path.lower().endswith('.xlsx'):
+            rows = list(self.xlsx_reader.iter_rows(file_path, max_rows=SNIFF_ROWS))
+        else:
+            preview = pd.read_excel(file_path, header=None, nrows=SNIFF_ROWS)
+            rows = preview.itertuples(index=False, name=None)
+
+        widths = [sum(1 for cell in row if cell is not None and not pd.isna(cell) and str(cell).strip()) for row in rows]
+        width = max(widths) if widths else 0
+        header_row = next((i for i, w in enumerate(widths) if w >= 2 and w >= width - 1), 0)
+
+        return {"format": "excel", "sheet_name": 0, "header_row": header_row, "title": None}
+
+    @staticmethod
+    def _detect_encoding(head):
+        """Détecter l'encodage d'un début de fichier texte"""
+        if head.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return 'utf-16'
+        try:
+            # Ignorer un éventuel caractère multi-octets coupé en fin d'échantillon
+            codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'cp1252'
     
+    def inspect_file(self, file_path):
+        """
+        Examiner un fichier pour l'importer : structure, colonnes, enregistreur
+
+        Seul le début du fichier est lu ; l'analyse complète se fait ensuite.
+
+        Args:
+            file_path (str): Chemin du fichier
+
+        Returns:
+            dict: Chemin, structure détectée, colonnes détectées, numéro de série
+            (None si introuvable), nom proposé et date de modification
+        """
+        sniff = self.sniff_file(file_path)
+        df = self.load_file(file_path, sniff, nrows=PREVIEW_ROWS)
+        self.get_file_summary(file_path, df=df, sniff=sniff)
+
+        serial, name = self.read_logger_identity(file_path, sniff, df)
+        if not name:
+            stem = os.path.splitext(os.path.basename(file_path))[0]
+            name = EXPORT_SUFFIX_PATTERN.sub('', stem).strip() or stem
+
+        return {
+            "file_path": file_path,
+            "sniff": sniff,
+            "columns": self.detect_columns(df),
+            "serial": serial,
+            "name": name,
+            "mtime_ns": sniff["mtime_ns"],
+        }
+
+    def read_logger_identity(self, file_path, sniff, df):
+        """
+        Lire le numéro de série et le nom de l'enregistreur d'un fichier
+
+        Args:
+            file_path (str): Chemin du fichier
+            sniff (dict): Structure du fichier
+            df (pandas.DataFrame): Début du fichier déjà lu
+
+        Returns:
+            tuple: (numéro de série, nom), chacun None s'il est introuvable
+        """
+        serial, name = None, None
+
+        if sniff["format"] == 'hobo':
+            header = df.attrs.get("hobo") or self.hobo_reader.read_header(file_path)
+            serial, name = header.get("serial"), header.get("name")
+        elif sniff["format"] == 'excel' and file_path.lower().endswith('.xlsx'):
+            # Feuille "Details" des exports HOBOconnect : libellé puis valeur sur une ligne
+            sheets = self.xlsx_reader.sheet_names(file_path)
+            if "Details" in sheets:
+                for row in self.xlsx_reader.iter_rows(file_path, max_rows=SNIFF_ROWS * 2, sheet_index=sheets.index("Details")):
+                    cells = [cell for cell in row if cell is not None]
+                    if len(cells) >= 2 and cells[0] == "Serial Number":
+                        serial = str(cells[1]).strip()
+                    elif len(cells) >= 2 and cells[0] == "Name":
+                        name = str(cells[1]).strip()
+
+        if not serial:
+            for col in df.columns:
+                match = SERIAL_PATTERN.search(str(col))
+                if match:
+                    serial = match.group(1)
+                    break
+
+        if not serial:
+            match = FILENAME_SERIAL_PATTERN.match(os.path.basename(file_path))
+            if match:
+                serial = match.group(1)
+
+        return serial, name or df.attrs.get("title")
+
     def detect_columns(self, df):
         """
         Détecter automatiquement les colonnes de date, température, humidité et point de rosée
@@ -94,86 +385,303 @@ class DataLoader:
         Returns:
             dict: Mapping des colonnes détectées
         """
-        columns = df.columns.tolist()
-        mapping = {}
-        
-        # Dictionnaires de mots-clés pour chaque type de colonne
-        keywords = {
-    'date': [
-        'date', 'time', 'datetime', 'horodatage', 'timestamp', 'période', 
-        'date heure', 'gmt', 'date time', 'heure', 'jour'
-    ],
-    'temperature': [
-        'temp', 'température', 'temperature', '°c', 'degré', 'deg', 'celsius',
-        'temp.', 'lgr', 'sen', 's/n', 'température', 't°', 'thermique'
-    ],
-    'humidity': [
-        'humid', 'humidité', 'humidity', 'hr', 'rh', '%', 
-        'hr, %', 'humidité relative', 'hygrométrie', 'moisture'
-    ],
-    'dew_point': [
-        'dew', 'point', 'rosée', 'point de rosée', 'dew point', 'dew_point', 'dp',
-        'ptrosée', 'pt rosée', 'pt.rosée', 'condensation', 'point de condensation'
-    ]
-}
+        mapping = self.column_detector.detect(df)
+        logger.info(f"Colonnes détectées: {mapping}")
+        return mapping
+
+    def get_file_summary(self, file_path, preview_rows=6, df=None, sniff=None):
+        """
+        Obtenir les colonnes et un aperçu d'un fichier, depuis le cache si possible
+
+        Args:
+            file_path (str): Chemin du fichier
+            preview_rows (int, optional): Nombre de lignes d'aperçu. Par défaut: 6
+            df (pandas.DataFrame, optional): Données déjà chargées du fichier
+            sniff (dict, optional): Structure du fichier déjà détectée
 
+        Returns:
+            dict: {"columns": liste des colonnes, "data": lignes d'aperçu sérialisables}
+        """
+        if self.cache and df is None:
+            summary = self.cache.load_summary(file_path)
+            if summary is not None and len(summary["data"]) >= min(preview_rows, summary.get("rows", 0)):
+                return {"columns": summary["columns"], "data": summary["data"][:preview_rows]}
+
+        if df is None:
+            df = self.load_file(file_path, sniff)
+        summary = self.build_summary(df, preview_rows)
+        if self.cache:
+            self.cache.save_summary(file_path, dict(summary, rows=len(df)))
+        return summary
+
+    def build_summary(self, df, preview_rows=6):
+        """
+        Construire le résumé sérialisable (colonnes et aperçu) d'un DataFrame
+
+        Args:
+            df (pandas.DataFrame): Données du fichier
+            preview_rows (int, optional): Nombre de lignes d'aperçu. Par défaut: 6
+
+        Returns:
+            dict: {"columns": liste des colonnes, "data": lignes d'aperçu sérialisables}
+        """
+        def convert_to_serializable(val):
+            if isinstance(val, (pd.Timestamp, np.datetime64)):
+                return val.isoformat() if hasattr(val, "isoformat") else str(val)
+            elif isinstance(val, (np.integer, int)) and not isinstance(val, bool):
+                return int(val)
+            elif isinstance(val, (np.floating, float)):
+                return None if pd.isna(val) else float(val)
+            elif pd.isna(val):
+                return None
+            else:
+                return str(val)
+
+        data = [
+            [convert_to_serializable(val) for val in row]
+            for row in df.head(preview_rows).itertuples(index=False, name=None)
+        ]
+        return {"columns": df.columns.tolist(), "data": data}
+
+    def _current_sniff(self, capteur_data):
+        """
+        Obtenir la structure à jour du fichier d'un capteur et la conserver avec lui
+
+        Les formats de date déjà déduits sont repris si le fichier a été réexporté.
+        """
+        file_path = capteur_data["file_path"]
+        sniff = capteur_data.get("sniff")
+        if not self._sniff_is_current(file_path, sniff):
+            previous_formats = (sniff or {}).get("date_formats", {})
+            sniff = self.sniff_file(file_path)
+            sniff["date_formats"] = dict(previous_formats)
+            capteur_data["sniff"] = sniff
+        return sniff
+
+    def _read_mapped(self, file_path, sniff, columns, nrows=None, skip_rows=0):
+        """Lire les colonnes mappées d'un fichier, les mesures directement en float32"""
+        return self.load_file(
+            file_path,
+            sniff,
+            usecols=[col_name for col_name in columns.values() if col_name],
+            float_columns=[col_name for col_type, col_name in columns.items() if col_name and col_type != "date"],
+            nrows=nrows,
+            skip_rows=skip_rows,
+        )
+
+    def _prepare_series(self, df, columns, sniff):
+        """
+        Renommer, typer, trier et dédoublonner les colonnes mappées d'un fichier
+
+        Args:
+            df (pandas.DataFrame): Données lues du fichier
+            columns (dict): Mappage des colonnes
+            sniff (dict): Structure du fichier (formats de date déduits)
+
+        Returns:
+            pandas.DataFrame: Série préparée ('date' en datetime64[ns], voies en float32 ;
+            point de rosée calculé si l'humidité est mappée sans point de rosée)
+
+        Raises:
+            ValueError: Si une colonne mappée n'existe pas dans le fichier
+        """
+        # Vérifier que les colonnes mappées existent dans le DataFrame
+        for col_type, col_name in columns.items():
+            if col_name and col_name not in df.columns:
+                raise ValueError(f"La colonne mappée '{col_name}' pour '{col_type}' n'existe pas dans le fichier")
         
+        # Sélectionner les colonnes nécessaires
+        col_list = [columns["date"], columns["temperature"]]
+        if columns.get("humidity"):
+            col_list.append(columns["humidity"])
+        if columns.get("dew_point"):
+            col_list.append(columns["dew_point"])
         
+        # Créer une copie pour éviter les avertissements SettingWithCopyWarning
+        mapped_df = df[col_list].copy()
         
+        # Renommer les colonnes
+        new_columns = ["date", "temperature"]
+        if columns.get("humidity"):
+            new_columns.append("humidity")
+        if columns.get("dew_point"):
+            new_columns.append("dew_point")
         
-        # Fonction pour normaliser les noms de colonnes (supprimer accents, espaces, etc.)
-        def normalize_column_name(col):
-            import unicodedata
-            import re
-            # Convertir en minuscules et supprimer les accents
-            col = unicodedata.normalize('NFKD', col).encode('ASCII', 'ignore').decode('utf-8')
-            # Supprimer les caractères spéciaux
-            col = re.sub(r'[^a-zA-Z0-9]', ' ', col).lower()
-            return col
+        mapped_df.columns = new_columns
         
-        # Rechercher les colonnes pour chaque type
-        for col_type, col_keywords in keywords.items():
-            # D'abord, recherche exacte
-            for col in columns:
-                normalized_col = normalize_column_name(col)
-                if any(keyword == normalized_col for keyword in col_keywords):
-                    mapping[col_type] = col
-                    break
-            
-            # Si pas trouvé, recherche partielle
-            if col_type not in mapping:
-                for col in columns:
-                    normalized_col = normalize_column_name(col)
-                    if any(keyword in normalized_col for keyword in col_keywords):
-                        mapping[col_type] = col
-                        break
+        # Convertir les types de données
+        # Format de date déduit une fois par fichier puis appliqué à toute la colonne
+        date_formats = sniff.setdefault("date_formats", {})
+        mapped_df["date"], date_format = self.date_parser.parse(
+            mapped_df["date"], date_formats.get(columns["date"]), columns["date"]
+        )
+        if date_format:
+            date_formats[columns["date"]] = date_format
+        mapped_df["temperature"] = pd.to_numeric(mapped_df["temperature"], errors="coerce")
         
-        # Vérification supplémentaire pour les colonnes de date
-        if 'date' not in mapping:
-            # Essayer de détecter les colonnes de date par leur contenu
-            for col in columns:
-                try:
-                    # Vérifier si la colonne peut être convertie en datetime
-                    if pd.to_datetime(df[col], errors='coerce').notna().mean() > 0.5:
-                        mapping['date'] = col
-                        break
-                except:
-                    continue
+        if "humidity" in mapped_df.columns:
+            mapped_df["humidity"] = pd.to_numeric(mapped_df["humidity"], errors="coerce")
+            # S'assurer que l'humidité est en pourcentage (0-100)
+            if mapped_df["humidity"].max() <= 1.0:
+                mapped_df["humidity"] = mapped_df["humidity"] * 100
         
-        logger.info(f"Colonnes détectées: {mapping}")
-        return mapping
-    
-    
-    
-    
-    
-    
-    def load_capteur_data(self, capteur_data):
+        if "dew_point" in mapped_df.columns:
+            mapped_df["dew_point"] = pd.to_numeric(mapped_df["dew_point"], errors="coerce")
+        
+        # Supprimer les lignes avec des valeurs manquantes dans les colonnes requises
+        required_cols = ["date", "temperature"]
+        mapped_df = mapped_df.dropna(subset=required_cols)
+        
+        # Trier par date
+        mapped_df = mapped_df.sort_values("date")
+        
+        # Supprimer les doublons de date si nécessaire
+        if mapped_df["date"].duplicated().any():
+            mapped_df = mapped_df.drop_duplicates(subset=["date"], keep="first")
+
+        # Format compact : dates en datetime64[ns], voies en float32, index continu
+        mapped_df["date"] = mapped_df["date"].astype("datetime64[ns]")
+        value_columns = [col for col in mapped_df.columns if col != "date"]
+        mapped_df[value_columns] = mapped_df[value_columns].astype(np.float32)
+
+        # Point de rosée dérivé de la température et de l'humidité, calculé une seule fois
+        if "dew_point" not in mapped_df.columns and "humidity" in mapped_df.columns:
+            mapped_df["dew_point"] = dew_point(mapped_df["temperature"].to_numpy(), mapped_df["humidity"].to_numpy())
+        return mapped_df.reset_index(drop=True)
+
+    def _load_incremental(self, capteur_data, sniff):
+        """
+        Compléter la série conservée d'un enregistreur avec la fin d'un nouvel export
+
+        Le nouvel export doit reprendre l'historique conservé (même première mesure) ;
+        seules les lignes au-delà de celles du précédent fichier source sont analysées.
+        Les lignes déjà connues sont sautées sans être décodées : lignes de texte pour
+        un CSV, balises <row> comptées dans les octets décompressés de la feuille pour
+        un classeur .xlsx. La décompression de la feuille entière reste nécessaire
+        mais ne coûte qu'une fraction de l'analyse XML. Un fichier HOBO est décodé en
+        entier avant d'en extraire la fin.
+
+        Returns:
+            pandas.DataFrame: Série complète, ou None si une analyse complète est nécessaire
+        """
+        file_path = capteur_data["file_path"]
+        columns = capteur_data["columns"]
+        serial = capteur_data["serial"]
+
+        meta = self._stored_meta(capteur_data)
+        if not meta:
+            return None
+        source = meta["source"]
+
+        if self._is_stored_source(capteur_data, meta):
+            return self.series_store.load(serial)
+
+        # Même historique : la première mesure du fichier doit être celle de la série
+        head = self._prepare_series(self._read_mapped(file_path, sniff, columns, nrows=1), columns, sniff)
+        if head.empty or head["date"].iloc[0] != pd.Timestamp(meta["first_date"]):
+            return None
+
+        # Relire la dernière ligne déjà connue pour vérifier l'alignement
+        skip_rows = max(source.get("rows", 0) - 1, 0)
+        raw_tail = self._read_mapped(file_path, sniff, columns, skip_rows=skip_rows)
+        tail = self._prepare_series(raw_tail, columns, sniff)
+        if tail.empty or tail["date"].iloc[0] > pd.Timestamp(meta["last_date"]):
+            return None
+
+        self.series_store.append(serial, tail, self._source_info(file_path, skip_rows + len(raw_tail), columns))
+        logger.info(f"Export incrémental pour l'enregistreur {serial}: {len(raw_tail)} lignes relues")
+        return self.series_store.load(serial)
+
+    def load_rollup(self, capteur_data, level=None, start=None, end=None, max_points=None):
+        """
+        Charger les agrégats conservés d'un capteur (heure, jour, semaine ou mois)
+
+        Args:
+            capteur_data (dict): Données du capteur (chemin du fichier, mappage, numéro de série)
+            level (str, optional): Niveau d'agrégation. Par défaut: le plus fin donnant
+                au plus max_points périodes sur la plage
+            start (pandas.Timestamp, optional): Première date incluse
+            end (pandas.Timestamp, optional): Dernière date incluse
+            max_points (int, optional): Nombre maximal de périodes (si level est omis)
+
+        Returns:
+            pandas.DataFrame: Agrégats par période, ou None si la série conservée ne
+            correspond pas au fichier actuel du capteur
+        """
+        meta = self._stored_meta(capteur_data)
+        if not meta or not self._is_stored_source(capteur_data, meta):
+            return None
+        if level is None:
+            level = self.series_store.choose_level(
+                start if start is not None else meta["first_date"],
+                end if end is not None else meta["last_date"],
+                max_points,
+            )
+        return self.series_store.load_rollup(capteur_data["serial"], level, start, end)
+
+    def _stored_meta(self, capteur_data):
+        """Métadonnées de la série conservée d'un capteur, si elle suit le même mappage"""
+        serial = capteur_data.get("serial")
+        columns = capteur_data.get("columns") or {}
+        if not self.series_store or not serial:
+            return None
+        meta = self.series_store.get_meta(serial)
+        channels = self.series_channels(columns)
+        source = (meta or {}).get("source") or {}
+        if not meta or meta["channels"] != channels or source.get("columns") != self._clean_mapping(columns):
+            return None
+        return meta
+
+    def _is_stored_source(self, capteur_data, meta):
+        """Vérifier que la série conservée provient du fichier actuel du capteur"""
+        source = meta["source"]
+        try:
+            current = self._source_info(capteur_data["file_path"], None, capteur_data["columns"])
+        except OSError:
+            return False
+        return source.get("path") == current["path"] and source.get("size") == current["size"] \
+            and source.get("mtime_ns") == current["mtime_ns"]
+
+    def _source_info(self, file_path, rows, columns):
+        """Description du fichier source d'une série conservée"""
+        stat = os.stat(file_path)
+        return {
+            "path": os.path.normcase(os.path.abspath(file_path)),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "rows": rows,
+            "columns": self._clean_mapping(columns),
+        }
+
+    @staticmethod
+    def series_channels(columns):
+        """
+        Voies d'une série préparée selon le mappage des colonnes
+
+        Args:
+            columns (dict): Mappage des colonnes
+
+        Returns:
+            list: Noms des colonnes de la série ('date' puis les voies)
+        """
+        channels = ["date"] + [col_type for col_type in ("temperature", "humidity", "dew_point") if columns.get(col_type)]
+        if columns.get("humidity") and not columns.get("dew_point"):
+            # Point de rosée calculé à l'analyse
+            channels.append("dew_point")
+        return channels
+
+    @staticmethod
+    def _clean_mapping(columns):
+        """Mappage sans les entrées vides, pour comparaison"""
+        return {k: v for k, v in sorted((columns or {}).items()) if v}
+
+    def load_capteur_data(self, capteur_data, progress=None):
         """
         Charger et préparer les données d'un capteur
         
         Args:
             capteur_data (dict): Données du capteur (chemin du fichier et mappage des colonnes)
+            progress (callable, optional): Fonction appelée avec l'avancement (0 à 1)
             
         Returns:
             pandas.DataFrame: Données préparées
@@ -191,58 +699,40 @@ class DataLoader:
             raise ValueError("Mappage des colonnes incomplet")
         
         try:
-            # Charger le fichier
-            df = self.load_file(capteur_data["file_path"])
-            
-            # Vérifier que les colonnes mappées existent dans le DataFrame
+            # Réutiliser la série déjà analysée si le fichier et le mappage n'ont pas changé
+            if self.cache:
+                cached_df = self.cache.load_series(capteur_data["file_path"], capteur_data["columns"])
+                if cached_df is not None:
+                    if progress:
+                        progress(1.0)
+                    return cached_df
+
+            # Charger le fichier (structure détectée conservée avec le capteur)
+            sniff = self._current_sniff(capteur_data)
             columns = capteur_data["columns"]
-            for col_type, col_name in columns.items():
-                if col_name not in df.columns:
-                    raise ValueError(f"La colonne mappée '{col_name}' pour '{col_type}' n'existe pas dans le fichier")
-            
-            # Sélectionner les colonnes nécessaires
-            col_list = [columns["date"], columns["temperature"]]
-            if columns.get("humidity"):
-                col_list.append(columns["humidity"])
-            if columns.get("dew_point"):
-                col_list.append(columns["dew_point"])
-            
-            # Créer une copie pour éviter les avertissements SettingWithCopyWarning
-            mapped_df = df[col_list].copy()
-            
-            # Renommer les colonnes
-            new_columns = ["date", "temperature"]
-            if columns.get("humidity"):
-                new_columns.append("humidity")
-            if columns.get("dew_point"):
-                new_columns.append("dew_point")
-            
-            mapped_df.columns = new_columns
-            
-            # Convertir les types de données
-            mapped_df["date"] = pd.to_datetime(mapped_df["date"], errors="coerce")
-            mapped_df["temperature"] = pd.to_numeric(mapped_df["temperature"], errors="coerce")
-            
-            if "humidity" in mapped_df.columns:
-                mapped_df["humidity"] = pd.to_numeric(mapped_df["humidity"], errors="coerce")
-                # S'assurer que l'humidité est en pourcentage (0-100)
-                if mapped_df["humidity"].max() <= 1.0:
-                    mapped_df["humidity"] = mapped_df["humidity"] * 100
-            
-            if "dew_point" in mapped_df.columns:
-                mapped_df["dew_point"] = pd.to_numeric(mapped_df["dew_point"], errors="coerce")
-            
-            # Supprimer les lignes avec des valeurs manquantes dans les colonnes requises
-            required_cols = ["date", "temperature"]
-            mapped_df = mapped_df.dropna(subset=required_cols)
-            
-            # Trier par date
-            mapped_df = mapped_df.sort_values("date")
-            
-            # Supprimer les doublons de date si nécessaire
-            if mapped_df["date"].duplicated().any():
-                # logger.warning(f"Doublons de dates détectés dans {capteur_data.get('nom', 'capteur')}. Suppression des doublons.")
-                mapped_df = mapped_df.drop_duplicates(subset=["date"], keep="first")
+            serial = capteur_data.get("serial")
+
+            # Nouvel export d'un enregistreur déjà connu : n'analyser que la fin du fichier
+            mapped_df = None
+            if self.series_store and serial:
+                mapped_df = self._load_incremental(capteur_data, sniff)
+
+            if mapped_df is None:
+                df = self._read_mapped(capteur_data["file_path"], sniff, columns)
+                if progress:
+                    progress(0.6)
+                mapped_df = self._prepare_series(df, columns, sniff)
+                if self.series_store and serial:
+                    source = self._source_info(capteur_data["file_path"], len(df), columns)
+                    self.series_store.replace(serial, mapped_df, source)
+
+            if progress:
+                progress(0.9)
+
+            if self.cache:
+                self.cache.save_series(capteur_data["file_path"], capteur_data["columns"], mapped_df)
+            if progress:
+                progress(1.0)
             
             logger.info(f"Données chargées pour {capteur_data.get('nom', 'capteur')}: {len(mapped_df)} lignes")
             return mapped_df
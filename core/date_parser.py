@@ -0,0 +1,250 @@
+"""
+Module DateParser - Conversion vectorisée des horodatages des enregistreurs
+"""
+import re
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Formats candidats, du plus spécifique au plus général
+DATE_FORMATS = (
+    "%m/%d/%y %I:%M:%S %p",
+    "%m/%d/%Y %I:%M:%S %p",
+    "%m/%d/%y %I:%M %p",
+    "%m/%d/%Y %I:%M %p",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%y %H:%M:%S",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%y %H:%M",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%y %H:%M",
+    "%d.%m.%Y %H:%M:%S",
+    "%d.%m.%Y %H:%M",
+    "%d-%m-%Y %H:%M:%S",
+    "%d-%m-%Y %H:%M",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+)
+
+# Marqueurs de format spéciaux
+FORMAT_DATETIME = "datetime"
+FORMAT_ISO = "ISO8601"
+FORMAT_EPOCH_S = "epoch_s"
+FORMAT_EPOCH_MS = "epoch_ms"
+FORMAT_EXCEL_SERIAL = "excel_serial"
+
+# Nombre de valeurs utilisées pour déduire le format
+SAMPLE_SIZE = 200
+
+# Part maximale de valeurs non converties avec un format connu avant de le redéduire
+MAX_FAILURE_RATIO = 0.01
+
+# Décalage horaire de référence de l'application (heure normale d'Europe centrale)
+REFERENCE_UTC_OFFSET = 3600
+
+# Fuseaux nommés rencontrés dans les en-têtes des exports
+NAMED_OFFSETS = {
+    "UTC": 0,
+    "GMT": 0,
+    "WET": 0,
+    "CET": 3600,
+    "WEST": 3600,
+    "CEST": 7200,
+    "EET": 7200,
+}
+
+ISO_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?(Z|[+-]\d{2}:?\d{2})?$")
+OFFSET_PATTERN = re.compile(r"(?:GMT|UTC)\s*([+-])\s*(\d{1,2})(?::?(\d{2}))?", re.IGNORECASE)
+NAMED_OFFSET_PATTERN = re.compile(r"\b(" + "|".join(NAMED_OFFSETS) + r")\b")
+
+
+class DateParser:
+    """
+    Classe pour convertir une colonne d'horodatages en datetime64 de façon vectorisée
+
+    Le format exact est déduit d'un petit échantillon puis appliqué à toute la colonne,
+    ce qui évite l'inférence élément par élément de pandas. Les horodatages sont ramenés
+    au décalage horaire de référence quand l'en-tête de la colonne indique le sien.
+    """
+
+    def __init__(self, reference_offset=REFERENCE_UTC_OFFSET):
+        """
+        Initialise le convertisseur
+
+        Args:
+            reference_offset (int, optional): Décalage UTC de référence en secondes
+        """
+        self.reference_offset = reference_offset
+
+    def parse(self, values, date_format=None, column_name=None):
+        """
+        Convertir une colonne d'horodatages
+
+        Args:
+            values (pandas.Series): Valeurs brutes de la colonne de date
+            date_format (str, optional): Format déjà déduit pour ce fichier
+            column_name (str, optional): Nom de la colonne (pour le décalage horaire)
+
+        Returns:
+            tuple: (pandas.Series datetime64[ns], format utilisé)
+        """
+        if date_format:
+            parsed = self._parse_with_format(values, date_format)
+            if parsed is not None and self._failure_ratio(values, parsed) <= MAX_FAILURE_RATIO:
+                return self._to_reference(parsed, column_name), date_format
+            logger.info(f"Le format de date '{date_format}' ne convient plus, nouvelle détection")
+
+        date_format = self.infer_format(values)
+        if date_format:
+            parsed = self._parse_with_format(values, date_format)
+        else:
+            logger.warning("Format de date non reconnu, conversion élément par élément")
+            parsed = pd.to_datetime(values, errors="coerce")
+
+        return self._to_reference(parsed, column_name), date_format
+
+    def infer_format(self, values):
+        """
+        Déduire le format d'une colonne à partir d'un échantillon
+
+        Args:
+            values (pandas.Series): Valeurs brutes de la colonne de date
+
+        Returns:
+            str: Format strftime ou marqueur spécial, None si aucun ne convient
+        """
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return FORMAT_DATETIME
+
+        sample = self._sample(values)
+        if sample.empty:
+            return None
+
+        if pd.api.types.is_numeric_dtype(sample):
+            return self._infer_numeric_format(sample)
+
+        sample = sample.astype(str).str.strip()
+        if sample.str.match(ISO_PATTERN).all():
+            return FORMAT_ISO
+
+        # Plusieurs formats peuvent convenir (jour/mois ambigus) : privilégier
+        # celui qui donne des dates croissantes, comme dans un relevé d'enregistreur
+        candidates = []
+        for date_format in DATE_FORMATS:
+            parsed = pd.to_datetime(sample, format=date_format, errors="coerce")
+            if parsed.notna().all():
+                if parsed.is_monotonic_increasing:
+                    return date_format
+                candidates.append(date_format)
+
+        return candidates[0] if candidates else None
+
+    @staticmethod
+    def utc_offset_from_header(column_name):
+        """
+        Lire le décalage horaire indiqué dans un en-tête (ex: "Date Heure, GMT+01:00")
+
+        Args:
+            column_name (str): Nom de la colonne de date
+
+        Returns:
+            int: Décalage en secondes, None s'il n'est pas indiqué
+        """
+        if not isinstance(column_name, str):
+            return None
+
+        match = OFFSET_PATTERN.search(column_name)
+        if match:
+            sign, hours, minutes = match.groups()
+            offset = int(hours) * 3600 + int(minutes or 0) * 60
+            return -offset if sign == "-" else offset
+
+        match = NAMED_OFFSET_PATTERN.search(column_name)
+        if match:
+            return NAMED_OFFSETS[match.group(1)]
+        return None
+
+    def _parse_with_format(self, values, date_format):
+        """Appliquer un format connu à toute la colonne"""
+        try:
+            if date_format == FORMAT_DATETIME:
+                return pd.to_datetime(values, errors="coerce")
+            if date_format == FORMAT_ISO:
+                return pd.to_datetime(values, format="ISO8601", errors="coerce", utc=self._has_tz(values))
+            if date_format == FORMAT_EPOCH_S:
+                return pd.to_datetime(pd.to_numeric(values, errors="coerce"), unit="s", errors="coerce")
+            if date_format == FORMAT_EPOCH_MS:
+                return pd.to_datetime(pd.to_numeric(values, errors="coerce"), unit="ms", errors="coerce")
+            if date_format == FORMAT_EXCEL_SERIAL:
+                return pd.to_datetime(
+                    pd.to_numeric(values, errors="coerce"), unit="D", origin="1899-12-30", errors="coerce"
+                )
+            if pd.api.types.is_datetime64_any_dtype(values):
+                return values
+            return pd.to_datetime(values.astype(str).str.strip(), format=date_format, errors="coerce")
+        except (ValueError, TypeError) as e:
+            logger.info(f"Échec de la conversion avec le format '{date_format}': {e}")
+            return None
+
+    def _to_reference(self, parsed, column_name):
+        """Ramener des horodatages locaux au décalage de référence"""
+        if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+            # Fuseau explicite dans les valeurs : il prime sur l'en-tête
+            parsed = parsed.dt.tz_convert(None) + pd.Timedelta(seconds=self.reference_offset)
+            return parsed.astype("datetime64[ns]")
+
+        parsed = parsed.astype("datetime64[ns]")
+        offset = self.utc_offset_from_header(column_name)
+        if offset is not None and offset != self.reference_offset:
+            parsed = parsed + pd.Timedelta(seconds=self.reference_offset - offset)
+        return parsed
+
+    @staticmethod
+    def _infer_numeric_format(sample):
+        """Déduire le format d'une colonne numérique (epoch ou numéro de série Excel)"""
+        median = float(np.nanmedian(sample.astype(float)))
+        if 20000 <= median <= 80000:
+            return FORMAT_EXCEL_SERIAL
+        if 1e8 <= median < 1e11:
+            return FORMAT_EPOCH_S
+        if 1e11 <= median < 1e14:
+            return FORMAT_EPOCH_MS
+        return None
+
+    @staticmethod
+    def _sample(values):
+        """Échantillon réparti sur le début, le milieu et la fin de la colonne"""
+        non_null = values.dropna()
+        if len(non_null) <= SAMPLE_SIZE:
+            return non_null
+        third = SAMPLE_SIZE // 3
+        middle = len(non_null) // 2
+        return pd.concat([
+            non_null.iloc[:third],
+            non_null.iloc[middle - third // 2:middle + third // 2],
+            non_null.iloc[-third:],
+        ])
+
+    @staticmethod
+    def _has_tz(values):
+        """Indiquer si des horodatages ISO portent un fuseau explicite"""
+        first = values.dropna()
+        if first.empty:
+            return False
+        text = str(first.iloc[0]).strip()
+        return text.endswith("Z") or bool(re.search(r"[+-]\d{2}:?\d{2}$", text))
+
+    @staticmethod
+    def _failure_ratio(values, parsed):
+        """Part des valeurs non vides qui n'ont pas pu être converties"""
+        present = values.notna()
+        count = int(present.sum())
+        if not count:
+            return 0.0
+        return float((parsed.isna() & present).sum()) / count
@@ -0,0 +1,142 @@
+"""
+Module Decimation - Réduction des courbes à la résolution de l'image avant le tracé
+"""
+import numpy as np
+
+# Méthodes de réduction disponibles :
+# - 'lttb' : Largest-Triangle-Three-Buckets, un point par pixel conservant la forme
+# - 'minmax' : enveloppe par pixel (minimum et maximum), conserve pics et creux
+METHODS = ("lttb", "minmax")
+
+
+def decimate(x, y, pixels, method="lttb"):
+    """
+    Réduire une courbe plus dense que la largeur de l'image
+
+    Les premier et dernier points renseignés sont toujours conservés (mêmes limites
+    d'axe) et un point manquant (NaN) est gardé au début de chaque lacune afin que la
+    courbe reste interrompue au même endroit. Une courbe qui n'est pas plus dense que
+    l'image est renvoyée telle quelle.
+
+    Args:
+        x (numpy.ndarray): Abscisses croissantes (dates en jours matplotlib)
+        y (numpy.ndarray): Valeurs (NaN : mesure manquante)
+        pixels (int): Largeur de la zone de tracé en pixels
+        method (str, optional): 'lttb' ou 'minmax'
+
+    Returns:
+        tuple: (x, y) réduits
+
+    Raises:
+        ValueError: Si la méthode est inconnue
+    """
+    if method not in METHODS:
+        raise ValueError(f"Méthode de réduction inconnue: {method}")
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    pixels = max(int(pixels), 3)
+    # L'enveloppe garde deux points par pixel : inutile si la courbe n'en a pas plus
+    if len(x) <= (pixels if method == "lttb" else 2 * pixels):
+        return x, y
+
+    valid = np.flatnonzero(~np.isnan(y))
+    if len(valid) == 0:
+        return x[[0, -1]], y[[0, -1]]
+    if method == "lttb":
+        kept = valid[lttb(x[valid], y[valid], pixels)]
+    else:
+        kept = valid[minmax(x[valid], y[valid], pixels)]
+
+    indices = np.union1d(kept, _gap_starts(x, y, pixels))
+    return x[indices], y[indices]
+
+
+def lttb(x, y, points):
+    """
+    Choisir les points d'une courbe par Largest-Triangle-Three-Buckets
+
+    Les points intérieurs sont répartis en paquets de taille égale ; dans chaque
+    paquet, le point retenu forme le plus grand triangle avec le point retenu du
+    paquet précédent et la moyenne du paquet suivant.
+
+    Args:
+        x (numpy.ndarray): Abscisses croissantes (sans NaN)
+        y (numpy.ndarray): Valeurs (sans NaN)
+        points (int): Nombre de points à conserver (premier et dernier compris)
+
+    Returns:
+        numpy.ndarray: Indices des points conservés, croissants
+    """
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+
+    # Limites des paquets intérieurs (points - 2 paquets non vides entre 1 et n - 1)
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.append(np.add.reduceat(x[:n - 1], edges[:-1]) / counts, x[n - 1])
+    avg_y = np.append(np.add.reduceat(y[:n - 1], edges[:-1]) / counts, y[n - 1])
+
+    selected = np.empty(points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - avg_x[i + 1]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (avg_y[i + 1] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(x, y, pixels):
+    """
+    Choisir le minimum et le maximum de la courbe dans chaque pixel
+
+    Le tracé obtenu couvre, dans chaque colonne de pixels, le même intervalle de
+    valeurs que la courbe complète : aucun pic ni creux n'est perdu.
+
+    Args:
+        x (numpy.ndarray): Abscisses croissantes (sans NaN)
+        y (numpy.ndarray): Valeurs (sans NaN)
+        pixels (int): Nombre de colonnes de pixels
+
+    Returns:
+        numpy.ndarray: Indices des points conservés (premier, dernier, minimum et
+        maximum de chaque pixel), croissants
+    """
+    n = len(x)
+    if n <= 2:
+        return np.arange(n)
+    buckets = _buckets(x, x[0], x[-1], pixels)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    group = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, n]))
+
+    kept = [np.array([0, n - 1])]
+    for reduce in (np.minimum, np.maximum):
+        extreme = reduce.reduceat(y, starts)
+        hits = np.flatnonzero(y == extreme[group])
+        # Premier point atteignant l'extrême dans chaque pixel
+        _, first = np.unique(group[hits], return_index=True)
+        kept.append(hits[first])
+    return np.unique(np.concatenate(kept))
+
+
+def _gap_starts(x, y, pixels):
+    """Premier NaN de chaque lacune (un au plus par pixel)"""
+    missing = np.isnan(y)
+    starts = np.flatnonzero(missing & ~np.r_[False, missing[:-1]])
+    if len(starts) == 0:
+        return starts
+    _, first = np.unique(_buckets(x[starts], x[0], x[-1], pixels), return_index=True)
+    return starts[first]
+
+
+def _buckets(x, x0, x1, pixels):
+    """Colonne de pixels de chaque abscisse entre x0 et x1"""
+    if x1 <= x0:
+        return np.zeros(len(x), dtype=np.int64)
+    return np.minimum(((x - x0) * (pixels / (x1 - x0))).astype(np.int64), pixels - 1)
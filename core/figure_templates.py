@@ -0,0 +1,226 @@
+"""
+Module FigureTemplates - Figures de séries journalières réutilisées d'un rendu à l'autre
+"""
+import io
+import base64
+import logging
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.dates as mdates
+import matplotlib.ticker as ticker
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from core.decimation import decimate
+
+logger = logging.getLogger(__name__)
+
+# Nombre de figures inactives conservées par style (une par type de graphique suffit ;
+# les rendus simultanés d'un même type utilisent des figures temporaires)
+TEMPLATES_PER_STYLE = 1
+
+# Nombre de mises en page conservées par figure
+LAYOUT_MEMO_SIZE = 32
+
+
+class TimeSeriesTemplate:
+    """
+    Classe pour rendre un graphique de séries journalières sur une figure conservée
+
+    La figure 18×8, ses axes, titres, formateurs de dates, localisateurs et grilles
+    sont créés une seule fois. Un rendu remplace les données des courbes existantes
+    (set_data) et n'ajoute ou ne retire que les courbes manquantes ou en trop. Les
+    limites et les graduations de l'axe des dates ne sont recalculées que lorsque
+    l'étendue des dates change (elles sont ensuite figées), et la mise en page
+    (tight_layout) est conservée pour une étendue, une taille de légende et une
+    largeur de graduations de l'axe Y données. Une courbe plus dense que la zone de
+    tracé est d'abord réduite à sa résolution (méthode du style : 'lttb' ou 'minmax').
+    """
+
+    def __init__(self, style):
+        """
+        Initialise la figure
+
+        Args:
+            style (dict): Style du graphique (title, ylabel, y_major, y_minor,
+                legend_loc, linewidth, date_formatter ; figsize et decimation en option)
+        """
+        self.style = style
+        self.fig = Figure(figsize=style.get("figsize", (18, 8)))
+        FigureCanvasAgg(self.fig)
+        self.ax = self.fig.subplots()
+        self.lines = []
+        self._span = None
+        self._layouts = {}
+
+        ax = self.ax
+        ax.set_title(style["title"], fontsize=14)
+        ax.set_xlabel("Date")
+        ax.set_ylabel(style["ylabel"])
+
+        # Localisateurs de dates d'origine (remplacés par les graduations figées)
+        self._date_major = mdates.MonthLocator(interval=1)
+        self._date_minor = mdates.WeekdayLocator(byweekday=0)
+        ax.xaxis.set_major_locator(self._date_major)
+        ax.xaxis.set_minor_locator(self._date_minor)
+        ax.xaxis.set_major_formatter(style["date_formatter"]('%d %B\n%Y'))
+
+        # Quadrillage type papier millimétré
+        ax.set_axisbelow(True)
+        ax.yaxis.set_major_locator(ticker.MultipleLocator(style["y_major"]))
+        ax.yaxis.set_minor_locator(ticker.MultipleLocator(style["y_minor"]))
+        ax.grid(which='major', linestyle='-', linewidth=0.6, color='black', alpha=0.5)
+        ax.grid(which='minor', linestyle='-', linewidth=0.3, color='grey', alpha=0.3)
+
+    def render(self, series, decorate=None, legend_extra=None, dpi=150):
+        """
+        Rendre les séries sur la figure
+
+        Args:
+            series (list): Courbes (dates datetime64, valeurs, libellé, couleur, style de trait)
+            decorate (callable, optional): Appelée avec les axes pour ajouter des éléments
+                propres à ce rendu (zones, bandes) ; renvoie la liste des éléments ajoutés,
+                retirés après le rendu
+            legend_extra (list, optional): Entrées de légende supplémentaires (poignée, libellé)
+            dpi (int, optional): Résolution
+
+        Returns:
+            str: Image PNG en base64
+        """
+        ax = self.ax
+        self._update_lines(series, dpi)
+        ax.relim()
+        extras = decorate(ax) if decorate else []
+        try:
+            self._update_limits()
+
+            handles = list(self.lines)
+            labels = [line.get_label() for line in self.lines]
+            for handle, label in legend_extra or []:
+                handles.append(handle)
+                labels.append(label)
+            ax.legend(handles=handles, labels=labels, loc=self.style["legend_loc"], frameon=True, prop={'size': 12})
+
+            self._update_layout(labels)
+            buf = io.BytesIO()
+            self.fig.savefig(buf, format='png', dpi=dpi)
+            return base64.b64encode(buf.getvalue()).decode('utf-8')
+        finally:
+            for artist in extras:
+                artist.remove()
+
+    def _update_lines(self, series, dpi):
+        """Remplacer les données des courbes, en créant ou retirant les courbes nécessaires"""
+        while len(self.lines) > len(series):
+            self.lines.pop().remove()
+        method = self.style.get("decimation")
+        pixels = self.ax.get_position().width * self.fig.get_figwidth() * dpi
+        for index, (dates, values, label, color, linestyle) in enumerate(series):
+            x = mdates.date2num(np.asarray(dates, dtype="datetime64[ns]"))
+            y = np.asarray(values, dtype=np.float64)
+            if method:
+                x, y = decimate(x, y, pixels, method)
+            if index < len(self.lines):
+                line = self.lines[index]
+                line.set_data(x, y)
+            else:
+                line = Line2D(x, y, linewidth=self.style["linewidth"])
+                self.ax.add_line(line)
+                self.lines.append(line)
+            line.set_label(label)
+            line.set_color(color)
+            line.set_linestyle(linestyle)
+
+    def _update_limits(self):
+        """Limites : l'axe Y à chaque rendu, l'axe des dates seulement si l'étendue change"""
+        ax = self.ax
+        data_lim = ax.dataLim
+        span = (float(data_lim.x0), float(data_lim.x1)) if np.isfinite(data_lim.intervalx).all() else None
+
+        if span != self._span or span is None:
+            ax.set_autoscalex_on(True)
+            ax.xaxis.set_major_locator(self._date_major)
+            ax.xaxis.set_minor_locator(self._date_minor)
+            ax.autoscale_view(scaley=False)
+            # Limites figées : aucun recalcul automatique de l'axe des dates au tracé
+            ax.set_xlim(ax.get_xlim())
+            ax.xaxis.set_major_locator(ticker.FixedLocator(self._date_major()))
+            ax.xaxis.set_minor_locator(ticker.FixedLocator(self._date_minor()))
+            self._span = span
+        ax.autoscale_view(scalex=False)
+
+    def _update_layout(self, labels):
+        """Appliquer la mise en page conservée, ou la calculer (tight_layout) au premier rendu"""
+        ax = self.ax
+        y_ticks = ax.yaxis.get_major_locator().tick_values(*ax.get_ylim())
+        y_width = max((len(label) for label in ax.yaxis.get_major_formatter().format_ticks(y_ticks)), default=0)
+        key = (self._span, y_width, len(labels), max((len(label) for label in labels), default=0))
+
+        layout = self._layouts.get(key)
+        if layout is not None:
+            self.fig.subplots_adjust(**layout)
+            return
+        self.fig.tight_layout()
+        params = self.fig.subplotpars
+        if len(self._layouts) >= LAYOUT_MEMO_SIZE:
+            self._layouts.pop(next(iter(self._layouts)))
+        self._layouts[key] = {
+            "left": params.left, "right": params.right,
+            "bottom": params.bottom, "top": params.top,
+        }
+
+
+class FigureTemplatePool:
+    """
+    Classe pour prêter des figures de séries journalières conservées, par style
+
+    Une figure n'est utilisée que par un rendu à la fois : un rendu simultané du même
+    style reçoit une nouvelle figure, conservée ensuite dans la limite fixée. Une figure
+    dont le rendu a échoué est abandonnée.
+    """
+
+    def __init__(self, per_style=TEMPLATES_PER_STYLE):
+        """
+        Initialise le pool
+
+        Args:
+            per_style (int, optional): Nombre de figures inactives conservées par style
+        """
+        self.per_style = per_style
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self, name, style):
+        """
+        Emprunter la figure d'un style
+
+        Args:
+            name (str): Nom du style (type de graphique)
+            style (dict): Style du graphique (voir TimeSeriesTemplate)
+
+        Yields:
+            TimeSeriesTemplate: Figure prête pour un rendu
+        """
+        with self._lock:
+            idle = self._idle.setdefault(name, [])
+            template = idle.pop() if idle else None
+        if template is None or template.style is not style:
+            template = TimeSeriesTemplate(style)
+
+        yield template
+
+        with self._lock:
+            idle = self._idle.setdefault(name, [])
+            if len(idle) < self.per_style:
+                idle.append(template)
+
+    def clear(self):
+        """Libérer toutes les figures conservées"""
+        with self._lock:
+            self._idle.clear()
@@ -5,16 +5,32 @@ import os
 import io
 import base64
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+import matplotlib.ticker as ticker
 import matplotlib
 matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import base64
 import io
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import cycle
 from numpy import inf , random , arange,ones_like
 from matplotlib.patches import Patch
 
+from core.daily_aggregates import DailyAggregator
+from core.condensation import CondensationDetector
+from core.humidity_distribution import HumidityDistribution
+from core.spatial import SpatialInterpolator, GRID_RESOLUTION
+from core.figure_templates import FigureTemplatePool
+
+# Nombre de figures rendues en parallèle
+RENDER_WORKERS = min(4, os.cpu_count() or 1)
+
+# Nombre de processus pour le rendu des figures par capteur
+RENDER_PROCESSES = os.cpu_count() or 1
+
 
 
 # Dictionnaire de mois en français
@@ -24,30 +40,233 @@ mois_fr = {
     'July': 'Juil.', 'August': 'Août', 'September': 'Sept.',
     'October': 'Oct.', 'November': 'Nov.', 'December': 'Déc.'
 }
+# Dictionnaire de mois en français (noms complets)
+mois_fr_complet = {
+    "January": "janvier", "February": "février", "March": "mars",
+    "April": "avril", "May": "mai", "June": "juin",
+    "July": "juillet", "August": "août", "September": "septembre",
+    "October": "octobre", "November": "novembre", "December": "décembre"
+}
 # Format de date personnalisé
 class FrenchDateFormatter(mdates.DateFormatter):
+    mois = mois_fr
+
     def __call__(self, x, pos=0):
         result = super().__call__(x, pos)
-        for en, fr in mois_fr.items():
+        for en, fr in self.mois.items():
             result = result.replace(en, fr)
         return result
-    
-            
+
+# Format de date personnalisé (noms de mois complets)
+class FrenchLongDateFormatter(FrenchDateFormatter):
+    mois = mois_fr_complet
+
+
+# Styles des graphiques de séries journalières (figures conservées d'un rendu à l'autre).
+# Réduction des courbes denses : 'lttb' pour les moyennes, 'minmax' là où les pics et
+# creux comptent (amplitudes, écart au point de rosée)
+TIME_SERIES_STYLES = {
+    "temperature_time": {
+        "title": "Températures quotidiennes", "ylabel": "Température (°C)",
+        "y_major": 5, "y_minor": 1, "legend_loc": "lower right", "linewidth": 1.0,
+        "date_formatter": FrenchLongDateFormatter,
+        "decimation": "lttb",
+    },
+    "humidity_time": {
+        "title": "Humidité relative quotidienne moyenne", "ylabel": "Humidité (%)",
+        "y_major": 10, "y_minor": 2, "legend_loc": "upper right", "linewidth": 1.2,
+        "date_formatter": FrenchLongDateFormatter,
+        "decimation": "lttb",
+    },
+    "temperature_amplitude": {
+        "title": "Amplitudes thermiques quotidiennes", "ylabel": "Température (°C)",
+        "y_major": 1, "y_minor": 0.2, "legend_loc": "upper right", "linewidth": 0.8,
+        "date_formatter": FrenchDateFormatter,
+        "decimation": "minmax",
+    },
+    "humidity_amplitude": {
+        "title": "Amplitude hydrique quotidienne", "ylabel": "Humidité relative (%)",
+        "y_major": 5, "y_minor": 1, "legend_loc": "upper right", "linewidth": 0.8,
+        "date_formatter": FrenchDateFormatter,
+        "decimation": "minmax",
+    },
+    "dew_point_risk": {
+        "title": "Écart au point de rosée quotidien", "ylabel": "Température (°C)",
+        "y_major": 1, "y_minor": 0.2, "legend_loc": "upper right", "linewidth": 0.8,
+        "date_formatter": FrenchDateFormatter,
+        "decimation": "minmax",
+    },
+}
+
+
+
+def new_figure(figsize, nrows=1, ncols=1):
+    """
+    Créer une figure propre à l'appel, indépendante de l'état global de pyplot
+
+    Chaque graphique possède sa figure et son canevas Agg : plusieurs graphiques
+    peuvent être rendus en même temps dans des threads différents.
+
+    Args:
+        figsize (tuple): Taille de la figure en pouces
+        nrows (int, optional): Nombre de lignes de graphiques
+        ncols (int, optional): Nombre de colonnes de graphiques
+
+    Returns:
+        tuple: (Figure, axes)
+    """
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots(nrows, ncols)
+
+
+def render_png(fig, dpi=150):
+    """
+    Rendre une figure en PNG encodé en base64
+
+    Args:
+        fig (matplotlib.figure.Figure): Figure à rendre
+        dpi (int, optional): Résolution
+
+    Returns:
+        str: Image PNG en base64
+    """
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi)
+    return base64.b64encode(buf.getvalue()).decode('utf-8')
+
+
 class GraphGenerator:
 
     """
     Classe pour générer des graphiques à partir des données
     """
     
-    def __init__(self, output_dir):
+    def __init__(self, output_dir, render_processes=None):
         """
         Initialise le générateur de graphiques
         
         Args:
             output_dir (str): Répertoire de sortie pour les graphiques exportés
+            render_processes (int, optional): Nombre de processus de rendu. Par défaut:
+                nombre de cœurs
         """
 
         self.output_dir = output_dir
+        self.aggregator = DailyAggregator()
+        self.condensation = CondensationDetector()
+        self.spatial = SpatialInterpolator()
+        self.templates = FigureTemplatePool()
+        self._executor = None
+        self.render_processes = render_processes or RENDER_PROCESSES
+        self._process_pool = None
+
+    def render_many(self, render, jobs):
+        """
+        Rendre plusieurs figures en parallèle dans un pool de threads
+
+        Chaque rendu possède sa propre figure (new_figure) : aucun état de pyplot
+        n'est partagé entre les threads.
+
+        Args:
+            render (callable): Fonction de rendu appelée avec les arguments de chaque tâche
+            jobs (list): Arguments de chaque rendu (tuples)
+
+        Returns:
+            list: Résultats des rendus, dans l'ordre des tâches
+        """
+        if len(jobs) <= 1 or RENDER_WORKERS <= 1:
+            return [render(*job) for job in jobs]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="render")
+        return list(self._executor.map(lambda job: render(*job), jobs))
+
+    def render_in_processes(self, render, jobs):
+        """
+        Rendre plusieurs figures en parallèle dans un pool de processus
+
+        Les tâches ne transportent que des données déjà réduites (effectifs,
+        fréquences), jamais les séries. Les images sont renvoyées dans l'ordre des
+        tâches ; une tâche dont le processus échoue est rendue dans le processus
+        principal sans affecter les autres.
+
+        Args:
+            render (callable): Fonction de rendu de niveau module ou statique (sérialisable)
+            jobs (list): Arguments de chaque rendu (tuples)
+
+        Returns:
+            list: Résultats des rendus, dans l'ordre des tâches
+        """
+        if len(jobs) <= 1 or self.render_processes <= 1:
+            return self.render_many(render, jobs)
+
+        try:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.render_processes)
+            futures = [self._process_pool.submit(render, *job) for job in jobs]
+        except Exception as e:
+            print(f"[⚠️] Pool de processus indisponible, rendu dans le processus principal : {e}")
+            self.shutdown()
+            return self.render_many(render, jobs)
+
+        results = []
+        for future, job in zip(futures, jobs):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"[⚠️] Rendu en processus interrompu, rendu local : {e}")
+                self.shutdown()
+                results.append(render(*job))
+        return results
+
+    def render_time_series(self, name, series, decorate=None, legend_extra=None):
+        """
+        Rendre un graphique de séries journalières sur la figure conservée de son style
+
+        La figure (axes, titres, formateurs, grilles) est créée au premier rendu du
+        style puis réutilisée : seules les données des courbes sont remplacées.
+
+        Args:
+            name (str): Style du graphique (clé de TIME_SERIES_STYLES)
+            series (list): Courbes (dates, valeurs, libellé, couleur, style de trait)
+            decorate (callable, optional): Ajout d'éléments propres au rendu (voir
+                TimeSeriesTemplate.render)
+            legend_extra (list, optional): Entrées de légende supplémentaires (poignée, libellé)
+
+        Returns:
+            str: Image PNG en base64
+        """
+        with self.templates.acquire(name, TIME_SERIES_STYLES[name]) as template:
+            return template.render(series, decorate=decorate, legend_extra=legend_extra)
+
+    def shutdown(self):
+        """Arrêter les pools de rendu"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def daily(self, capteur_id, capteur):
+        """
+        Obtenir les agrégats journaliers d'un capteur
+
+        Les agrégats conservés à l'analyse du fichier sont utilisés s'ils sont fournis
+        ('daily') ; sinon ils sont calculés une seule fois par série.
+
+        Args:
+            capteur_id (str): ID du capteur
+            capteur (SensorSeries): Série du capteur (agrégats conservés dans 'daily')
+
+        Returns:
+            pandas.DataFrame: Une ligne par jour ('jour' puis, par grandeur, mean,
+            min, max et count)
+        """
+        if capteur.daily is not None:
+            return capteur.daily
+        return self.aggregator.get(capteur_id, capteur)
     
 
 
@@ -56,83 +275,36 @@ class GraphGenerator:
         Générer un graphique de température quotidienne moyenne en fonction du temps
         
         Args:
-            capteurs_data (dict): Données des capteurs
+            capteurs_data (dict): Séries des capteurs (SensorSeries)
             
         Returns:
             dict: Résultat contenant l'image base64 du graphique
         """
 
 
-        # Dictionnaire de mois en français
-        mois_fr = {
-            "January": "janvier", "February": "février", "March": "mars",
-            "April": "avril", "May": "mai", "June": "juin",
-            "July": "juillet", "August": "août", "September": "septembre",
-            "October": "octobre", "November": "novembre", "December": "décembre"
-        }
-
-        # Formatteur de date français
-        class FrenchDateFormatter(mdates.DateFormatter):
-            def __call__(self, x, pos=0):
-                result = super().__call__(x, pos)
-                for en, fr in mois_fr.items():
-                    result = result.replace(en, fr)
-                return result
-
-        # Créer la figure
-        fig, ax = plt.subplots(figsize=(18, 8))
-
         # Palette cyclique
         palette = [
             "#1f77b4", "#2ca02c", "#ff7f0e", "#d62728",
             "#9467bd", "#8c564b", "#e377c2", "#7f7f7f"
         ]
         color_index = 0
+        series = []
 
         # Traiter chaque capteur
         for capteur_id, capteur in capteurs_data.items():
-            df = capteur["data"].copy()
-            nom = capteur["nom"]
-            
-            df["date"] = pd.to_datetime(df["date"])
-            df["jour"] = df["date"].dt.floor("D")  # enlever l'heure
+            nom = capteur.nom
 
             # Moyenne quotidienne
-            df_journalier = df.groupby("jour")["temperature"].mean().reset_index()
+            df_journalier = self.daily(capteur_id, capteur)
 
             # Tracer
             color = palette[color_index % len(palette)]
             linestyle = '-' if "Ext" not in nom else ':'  # extérieur en pointillé
-            ax.plot(df_journalier["jour"], df_journalier["temperature"], 
-                    label=nom, color=color, linestyle=linestyle, linewidth=1.0)
+            series.append((df_journalier["jour"], df_journalier["temperature_mean"], nom, color, linestyle))
             color_index += 1
 
-        # Configuration du graphique
-        ax.set_title("Températures quotidiennes", fontsize=14)
-        ax.set_xlabel("Date")
-        ax.set_ylabel("Température (°C)")
-        # ax.set_ylim(-10, 40)
-
-        ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
-        ax.xaxis.set_major_formatter(FrenchDateFormatter('%d %B\n%Y'))
-
-        # Quadrillage type papier millimétré
-        ax.set_axisbelow(True)
-        ax.xaxis.set_minor_locator(mdates.WeekdayLocator(byweekday=0))
-        ax.yaxis.set_major_locator(plt.MultipleLocator(5))
-        ax.yaxis.set_minor_locator(plt.MultipleLocator(1))
-        ax.grid(which='major', linestyle='-', linewidth=0.6, color='black', alpha=0.5)
-        ax.grid(which='minor', linestyle='-', linewidth=0.3, color='grey', alpha=0.3)
-
-        ax.legend(loc='lower right', frameon=True,prop={'size': 12})
-        plt.tight_layout()
-
-        # Convertir en image base64
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150)
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close()
+        # Convertir en image base64 (figure conservée du style)
+        img_base64 = self.render_time_series("temperature_time", series)
 
         return {
             "success": True,
@@ -151,85 +323,42 @@ class GraphGenerator:
         Générer un graphique d'humidité quotidienne moyenne en fonction du temps.
         
         Args:
-            capteurs_data (dict): Données des capteurs
+            capteurs_data (dict): Séries des capteurs (SensorSeries)
             
         Returns:
             dict: Résultat contenant l'image base64 du graphique
         """
 
 
-        # Dictionnaire des mois en français
-        mois_fr = {
-            "January": "janvier", "February": "février", "March": "mars",
-            "April": "avril", "May": "mai", "June": "juin",
-            "July": "juillet", "August": "août", "September": "septembre",
-            "October": "octobre", "November": "novembre", "December": "décembre"
-        }
-
-        # Formatteur de date français
-        class FrenchDateFormatter(mdates.DateFormatter):
-            def __call__(self, x, pos=0):
-                result = super().__call__(x, pos)
-                for en, fr in mois_fr.items():
-                    result = result.replace(en, fr)
-                return result
-
         # Vérifier les colonnes
         for capteur_id, capteur in capteurs_data.items():
-            if "humidity" not in capteur["data"].columns:
+            if "humidity" not in capteur:
                 return {
                     "success": False,
-                    "message": f"Le capteur {capteur['nom']} n'a pas de données d'humidité"
+                    "message": f"Le capteur {capteur.nom} n'a pas de données d'humidité"
                 }
 
-        fig, ax = plt.subplots(figsize=(18, 8))
         palette = [
             "#1f77b4", "#2ca02c", "#ff7f0e", "#d62728",
             "#9467bd", "#8c564b", "#e377c2", "#7f7f7f"
         ]
         color_index = 0
+        series = []
 
         # Traiter chaque capteur
         for capteur_id, capteur in capteurs_data.items():
-            df = capteur["data"].copy()
-            nom = capteur["nom"]
-            df["date"] = pd.to_datetime(df["date"])
-            df["jour"] = df["date"].dt.floor("D")
+            nom = capteur.nom
 
             # Moyenne d'humidité quotidienne
-            df_journalier = df.groupby("jour")["humidity"].mean().reset_index()
+            df_journalier = self.daily(capteur_id, capteur)
 
             # Tracer
             color = palette[color_index % len(palette)]
             linestyle = '-' if "Ext" not in nom else ':'
-            ax.plot(df_journalier["jour"], df_journalier["humidity"], 
-                    label=nom, color=color, linestyle=linestyle, linewidth=1.2)
+            series.append((df_journalier["jour"], df_journalier["humidity_mean"], nom, color, linestyle))
             color_index += 1
 
-        # Configuration du graphique
-        ax.set_title("Humidité relative quotidienne moyenne", fontsize=14)
-        ax.set_xlabel("Date")
-        ax.set_ylabel("Humidité (%)")
-        #ax.set_ylim(0, 100)
-
-        ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
-        ax.xaxis.set_major_formatter(FrenchDateFormatter('%d %B\n%Y'))
-
-        ax.set_axisbelow(True)
-        ax.xaxis.set_minor_locator(mdates.WeekdayLocator(byweekday=0))
-        ax.yaxis.set_major_locator(plt.MultipleLocator(10))
-        ax.yaxis.set_minor_locator(plt.MultipleLocator(2))
-        ax.grid(which='major', linestyle='-', linewidth=0.6, color='black', alpha=0.5)
-        ax.grid(which='minor', linestyle='-', linewidth=0.3, color='grey', alpha=0.3)
-
-        ax.legend(loc='upper right', frameon=True,prop={'size': 12})
-        plt.tight_layout()
-
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150)
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close()
+        img_base64 = self.render_time_series("humidity_time", series)
 
         return {
             "success": True,
@@ -249,73 +378,43 @@ class GraphGenerator:
         Générer un graphique d'amplitudes thermiques quotidiennes (Tmax - Tmin) avec le style ISCGraph.
 
         Args:
-            capteurs_data (dict): Données des capteurs
+            capteurs_data (dict): Séries des capteurs (SensorSeries)
 
         Returns:
             dict: Résultat contenant les données pour Chart.js et l'image base64
         """
 
 
-        # Créer la figure
-        fig, ax = plt.subplots(figsize=(18, 8))
-
         # Palette cyclique
         palette = [
             "#1f77b4", "#2ca02c", "#ff7f0e", "#d62728",
             "#9467bd", "#8c564b", "#e377c2", "#7f7f7f"
         ]
         color_index = 0
+        series = []
 
         # Tracer les amplitudes thermiques par jour
         for capteur_id, capteur in capteurs_data.items():
-            df = capteur["data"].copy()
-            nom = capteur["nom"]
+            nom = capteur.nom
 
             # Calculer les amplitudes journalières
-            df["date_only"] = df["date"].dt.floor("D")
-            grouped = df.groupby("date_only")["temperature"]
-            amplitude = (grouped.max() - grouped.min()).reset_index()
-            amplitude.columns = ["date", "amplitude"]
+            daily = self.daily(capteur_id, capteur)
+            amplitude = pd.DataFrame({"date": daily["jour"], "amplitude": daily["temperature_max"] - daily["temperature_min"]})
 
             color = palette[color_index % len(palette)]
             linestyle = '-' if "Ext" not in nom else ':'
-            ax.plot(amplitude["date"], amplitude["amplitude"], label=nom, color=color, linestyle=linestyle, linewidth=0.8)
+            series.append((amplitude["date"], amplitude["amplitude"], nom, color, linestyle))
             color_index += 1
 
-        # Configuration du graphique
-        ax.set_title("Amplitudes thermiques quotidiennes", fontsize=14)
-        ax.set_xlabel("Date")
-        ax.set_ylabel("Température (°C)")
-        #ax.set_ylim(0, 10)
-
-        # Axe X : format français, espacé tous les 2 mois
-        ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
-        ax.xaxis.set_major_formatter(FrenchDateFormatter('%d %B\n%Y'))
-        ax.xaxis.set_minor_locator(mdates.WeekdayLocator(byweekday=0))
-
-        # Grille millimétrée
-        ax.set_axisbelow(True)
-        ax.yaxis.set_major_locator(plt.MultipleLocator(1))
-        ax.yaxis.set_minor_locator(plt.MultipleLocator(0.2))
-        ax.grid(which='major', linestyle='-', linewidth=0.6, color='black', alpha=0.5)
-        ax.grid(which='minor', linestyle='-', linewidth=0.3, color='grey', alpha=0.3)
-
-        ax.legend(loc='upper right', frameon=True,prop={'size': 12})
-        plt.tight_layout()
-
-        # Convertir la figure en image base64
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150)
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close()
+        # Convertir la figure en image base64 (figure conservée du style)
+        img_base64 = self.render_time_series("temperature_amplitude", series)
 
         # Chart.js : formatter les données (si jamais tu veux les afficher aussi en JS)
         datasets = []
         all_dates = []
 
         # for capteur_id, capteur in capteurs_data.items():
-        #     df = capteur["data"].copy()
+        #     df = capteur.data.copy()
         #     df["date_only"] = df["date"].dt.floor("D")
         #     grouped = df.groupby("date_only")["temperature"]
         #     amplitude = (grouped.max() - grouped.min()).reset_index()
@@ -327,7 +426,7 @@ class GraphGenerator:
 
         #     r, g, b = random.randint(0, 200, 3)
         #     datasets.append({
-        #         "label": capteur["nom"],
+        #         "label": capteur.nom,
         #         "data": values,
         #         "borderColor": f"rgba({r},{g},{b},1)",
         #         "backgroundColor": f"rgba({r},{g},{b},0.2)",
@@ -361,73 +460,41 @@ class GraphGenerator:
         """
 
 
-        # Créer la figure
-        fig, ax = plt.subplots(figsize=(18, 8))
-
         # Palette cyclique
         palette = [
             "#1f77b4", "#2ca02c", "#ff7f0e", "#d62728",
             "#9467bd", "#8c564b", "#e377c2", "#7f7f7f"
         ]
         color_index = 0
+        series = []
 
         for capteur_id, capteur in capteurs_data.items():
-            df = capteur["data"].copy()
-            nom = capteur["nom"]
+            nom = capteur.nom
 
-            if "humidity" not in df.columns:
+            if "humidity" not in capteur:
                 continue  # Sauter si le capteur n’a pas d’humidité
 
-            df["date_only"] = df["date"].dt.floor("D")
-            grouped = df.groupby("date_only")["humidity"]
-            amplitude = (grouped.max() - grouped.min()).reset_index()
-            amplitude.columns = ["date", "amplitude"]
+            daily = self.daily(capteur_id, capteur)
+            amplitude = pd.DataFrame({"date": daily["jour"], "amplitude": daily["humidity_max"] - daily["humidity_min"]})
 
             color = palette[color_index % len(palette)]
             linestyle = '-' if "Ext" not in nom else ':'
-            ax.plot(amplitude["date"], amplitude["amplitude"], label=nom, color=color, linestyle=linestyle, linewidth=0.8)
+            series.append((amplitude["date"], amplitude["amplitude"], nom, color, linestyle))
             color_index += 1
 
-        # Configuration du graphique
-        ax.set_title("Amplitude hydrique quotidienne", fontsize=14)
-        ax.set_xlabel("Date")
-        ax.set_ylabel("Humidité relative (%)")
-        #ax.set_ylim(0, 40)
-
-        ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
-        ax.xaxis.set_major_formatter(FrenchDateFormatter('%d %B\n%Y'))
-        ax.xaxis.set_minor_locator(mdates.WeekdayLocator(byweekday=0))
-
-        # Grille papier millimétré
-        ax.set_axisbelow(True)
-        ax.yaxis.set_major_locator(plt.MultipleLocator(5))
-        ax.yaxis.set_minor_locator(plt.MultipleLocator(1))
-        ax.grid(which='major', linestyle='-', linewidth=0.6, color='black', alpha=0.5)
-        ax.grid(which='minor', linestyle='-', linewidth=0.3, color='grey', alpha=0.3)
-
-        ax.legend(loc='upper right', frameon=True,prop={'size': 12})
-        plt.tight_layout()
-
-        # Export en base64
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150)
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close()
+        # Export en base64 (figure conservée du style)
+        img_base64 = self.render_time_series("humidity_amplitude", series)
 
         # Préparer les données pour Chart.js (si affiché en JS)
         datasets = []
         all_dates = []
 
         for capteur_id, capteur in capteurs_data.items():
-            df = capteur["data"].copy()
-            if "humidity" not in df.columns:
+            if "humidity" not in capteur:
                 continue
 
-            df["date_only"] = df["date"].dt.floor("D")
-            grouped = df.groupby("date_only")["humidity"]
-            amplitude = (grouped.max() - grouped.min()).reset_index()
-            amplitude.columns = ["date", "amplitude"]
+            daily = self.daily(capteur_id, capteur)
+            amplitude = pd.DataFrame({"date": daily["jour"], "amplitude": daily["humidity_max"] - daily["humidity_min"]})
 
             dates = amplitude["date"].dt.strftime('%Y-%m-%d').tolist()
             values = amplitude["amplitude"].round(2).tolist()
@@ -435,7 +502,7 @@ class GraphGenerator:
 
             r, g, b = random.randint(0, 200, 3)
             datasets.append({
-                "label": capteur["nom"],
+                "label": capteur.nom,
                 "data": values,
                 "borderColor": f"rgba({r},{g},{b},1)",
                 "backgroundColor": f"rgba({r},{g},{b},0.2)",
@@ -472,7 +539,7 @@ class GraphGenerator:
         """
 
 
-        fig, ax = plt.subplots(figsize=(18, 8))
+        fig, ax = new_figure((18, 8))
 
         palette = [
             "#1f77b4", "#2ca02c", "#ff7f0e", "#d62728",
@@ -481,18 +548,16 @@ class GraphGenerator:
         color_index = 0
 
         for capteur_id, capteur in capteurs_data.items():
-            df = capteur["data"].copy()
-            nom = capteur["nom"]
+            df = capteur.data
+            nom = capteur.nom
 
             if "date" not in df.columns or "temperature" not in df.columns:
                 print(f"[⚠️] Capteur ignoré (colonnes manquantes) : {nom}")
                 continue
 
             try:
-                df["date"] = pd.to_datetime(df["date"])
-                df["date_only"] = df["date"].dt.floor("D")
-                grouped = df.groupby("date_only")["temperature"].mean().reset_index()
-                grouped.columns = ["date", "ecart"]
+                daily = self.daily(capteur_id, capteur)
+                grouped = pd.DataFrame({"date": daily["jour"], "ecart": daily["temperature_mean"]})
 
                 color = palette[color_index % len(palette)]
                 linestyle = '-' if "Ext" not in nom else ':'
@@ -526,20 +591,14 @@ class GraphGenerator:
         ax.xaxis.set_minor_locator(mdates.WeekdayLocator(byweekday=0))
 
         ax.set_axisbelow(True)
-        ax.yaxis.set_major_locator(plt.MultipleLocator(1))
-        ax.yaxis.set_minor_locator(plt.MultipleLocator(0.2))
+        ax.yaxis.set_major_locator(ticker.MultipleLocator(1))
+        ax.yaxis.set_minor_locator(ticker.MultipleLocator(0.2))
         ax.grid(which='major', linestyle='-', linewidth=0.6, color='black', alpha=0.5)
         ax.grid(which='minor', linestyle='-', linewidth=0.3, color='grey', alpha=0.3)
 
         ax.legend(loc='lower right', frameon=True,prop={'size': 12})
-        plt.tight_layout()
-
         # Export de l'image
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150)
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close()
+        img_base64 = render_png(fig)
 
         return {
             "success": True,
@@ -556,8 +615,8 @@ class GraphGenerator:
 
 
 
-    def generate_all_humidity_distribution_pair_graphs(self, capteurs_data, applito_pie=True, applito_hist=True):
-        images_base64 = []
+    def generate_all_humidity_distribution_pair_graphs(self, capteurs_data, applito_pie=True, applito_hist=True,
+                                                       humidity_bins=None, amplitude_bins=None):
         recapitulatif = {}
 
         pie_colors = [
@@ -568,135 +627,53 @@ class GraphGenerator:
             "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728",
             "#9467bd", "#8c564b", "#e377c2", "#7f7f7f"
         ]
-        hist_color_cycle = iter(hist_colors)
-
-        # ✅ Bins et labels pour humidité relative
-        humidity_bins = [-inf, 65, 70, 75, 80, 85, 90, 95, inf]
-        humidity_labels = [
-            "HR < 65%",
-            "65% ≤ HR < 70%",
-            "70% ≤ HR < 75%",
-            "75% ≤ HR < 80%",
-            "80% ≤ HR < 85%",
-            "85% ≤ HR < 90%",
-            "90% ≤ HR < 95%",
-            "HR ≥ 95%"
-        ]
-        
-        humidity_bins = [-inf, 40, 50, 60, 70, 80, 90, inf]
-        humidity_labels = [
-            "HR < 40%", 
-            "40% ≤ HR < 50%", 
-            "50% ≤ HR < 60%", 
-            "60% ≤ HR < 70%",
-            "70% ≤ HR < 80%", 
-            "80% ≤ HR < 90%", 
-            "HR ≥ 90%"
-        ]
+        hist_color_cycle = cycle(hist_colors)
 
+        # ✅ Classes d'humidité relative et d'amplitude (configurables par campagne)
+        distribution = HumidityDistribution(humidity_bins, amplitude_bins)
+        humidity_labels = distribution.humidity_labels
+        amplitude_edges = distribution.amplitude_edges
 
-        # ✅ Bins pour amplitude
-        amplitude_bins = arange(0, 26, 1)  # 0 à 25
-        amplitude_labels = [f"{i}-{i+1} % " for i in range(25)]
-
+        # ✅ Effectifs de tous les capteurs calculés en une fois
+        retenus = {}
         for capteur_id, capteur in capteurs_data.items():
-            df = capteur["data"].copy()
-            nom = capteur["nom"]
-
-            if not {"date", "humidity"}.issubset(df.columns):
-                print(f"[⚠️] Capteur ignoré (colonnes manquantes) : {nom}")
-                continue
-
-            try:
-                df["date"] = pd.to_datetime(df["date"])
-                df["jour"] = df["date"].dt.floor("D")
-
-                df_journalier = df.groupby("jour")["humidity"].mean().reset_index()
-
-                fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(13, 5))
-
-                # 🟠 CAMEMBERT
-                cat = pd.cut(df["humidity"], bins=humidity_bins, labels=humidity_labels, include_lowest=True)
-                freqs = cat.value_counts().sort_index()
-                freqs = freqs.reindex(humidity_labels, fill_value=0)
-
-                labels_with_counts = [f"{label} : {count}" for label, count in zip(humidity_labels, freqs)]
-
-                # Affichage console
-                # print(f"\n🔹 Répartition HR - {nom}")
-                # for line in labels_with_counts:
-                #     print(line)
-
-                recapitulatif[nom] = {
-                    "repartition_hr": dict(zip(humidity_labels, freqs.astype(int))),
-                }
-
-                pie_col = pie_colors if applito_pie else None
-                ax1.pie(freqs, 
-                        labels=None, 
-                        colors=pie_col, 
-                        startangle=90, counterclock=False,
-                        wedgeprops={"linewidth": 0})
-                ax1.set_title(f"Capteur {nom}", fontsize=12)
-                ax1.legend(humidity_labels, 
-                           loc="center left", 
-                           bbox_to_anchor=(1, 0.5), 
-                           #title="Légende"
-                           prop={'size': 12}
-                           )
-                
-
-                # 🔵 HISTOGRAMME
-                grouped = df.groupby("jour")["humidity"]
-                amplitude = (grouped.max() - grouped.min()).dropna()
-                
-                
-
-                hist_color = next(hist_color_cycle) if applito_hist else "#1e4f73"
-                n, bins_hist, patches = ax2.hist(amplitude, 
-                                                bins=amplitude_bins, 
-                                                color=hist_color, 
-                                                edgecolor='white', 
-                                                weights=ones_like(amplitude) / len(amplitude),
-                                                rwidth=.4)
-
-                # # Texte au-dessus des barres
-                # for i in range(len(patches)):
-                #     height = patches[i].get_height()
-                #     if height > 0:
-                #         ax2.text(patches[i].get_x() + patches[i].get_width() / 2,
-                #                 height + 0.5,
-                #                 f'{int(height)}',
-                #                 ha='center', va='bottom', fontsize=8)
-
-                ax2.set_title(f"Capteur {nom}", fontsize=12)
-                ax2.set_xlabel("Amplitude hydrique quotidienne (RH %)")
-                ax2.set_ylabel("Fréquence (%)")
-                ax2.set_xlim(0, 25)
-                ax2.yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: f'{int(y * 100)}%'))
-                
-
-                # Affichage console
-                # amplitude_counts = pd.cut(amplitude, bins=amplitude_bins, right=False).value_counts().sort_index()
-                # print(f"\n🔹 Amplitudes hydriques - {nom}")
-                # amplitude_text_lines = []
-                # for label, count in zip(amplitude_labels, amplitude_counts):
-                #     print(f"{label}: {count} mesure{'s' if count != 1 else ''}")
-                #     amplitude_text_lines.append((label, int(count)))
-
-                # recapitulatif[nom]["amplitudes"] = dict(amplitude_text_lines)
-
-                plt.tight_layout()
-
-                buf = io.BytesIO()
-                plt.savefig(buf, format='png', dpi=150)
-                buf.seek(0)
-                images_base64.append(base64.b64encode(buf.read()).decode('utf-8'))
-                plt.close()
-
-            except Exception as e:
-                print(f"[❌] Erreur pour le capteur {nom} : {e}")
+            if "humidity" not in capteur:
+                print(f"[⚠️] Capteur ignoré (colonnes manquantes) : {capteur.nom}")
                 continue
+            retenus[capteur_id] = capteur
+
+        daily_data = {capteur_id: self.daily(capteur_id, capteur) for capteur_id, capteur in retenus.items()}
+        humidity_counts = distribution.humidity_counts(
+            {capteur_id: capteur.channel("humidity") for capteur_id, capteur in retenus.items()}
+        )
+        amplitudes = distribution.amplitude_histograms(
+            {capteur_id: (daily["humidity_max"] - daily["humidity_min"]).to_numpy()
+             for capteur_id, daily in daily_data.items()}
+        )
+
+        # Rendu des capteurs en parallèle dans des processus (une figure par capteur ;
+        # seuls les effectifs calculés ci-dessus sont transmis)
+        jobs = []
+        for capteur_id, capteur in retenus.items():
+            nom = capteur.nom
+            counts = humidity_counts[capteur_id]
+            amplitude = amplitudes[capteur_id]
+
+            recapitulatif[nom] = {
+                "humidity_labels": humidity_labels,
+                "humidity_counts": counts.tolist(),
+                "amplitude_bins": amplitude_edges.tolist(),
+                "amplitude_counts": amplitude["counts"].tolist(),
+                "days": amplitude["days"],
+            }
+
+            hist_color = next(hist_color_cycle) if applito_hist else "#1e4f73"
+            pie_col = pie_colors if applito_pie else None
+            jobs.append((nom, counts, humidity_labels, pie_col, amplitude_edges,
+                         amplitude["counts"] / max(amplitude["days"], 1), hist_color))
+
+        images = self.render_in_processes(GraphGenerator._render_humidity_profile, jobs)
+        images_base64 = [image for image in images if image is not None]
 
         return {
             "success": True,
@@ -706,7 +683,7 @@ class GraphGenerator:
                 "x_axis": "Catégories / Amplitude (RH %)",
                 "y_axis": "Nombre de mesures",
                 "description": "Pour chaque capteur, cette figure affiche un camembert des classes d'humidité relative (moyenne quotidienne) et un histogramme des amplitudes hydriques journalières avec les effectifs.",
-                # "details": recapitulatif  # <== Résumé chiffré ici
+                "details": recapitulatif
             },
             "image": images_base64
         }
@@ -715,6 +692,51 @@ class GraphGenerator:
 
 
 
+    @staticmethod
+    def _render_humidity_profile(nom, counts, humidity_labels, pie_colors, amplitude_edges, frequencies, hist_color):
+        """
+        Rendre le camembert des classes d'humidité et l'histogramme des amplitudes d'un capteur
+
+        Returns:
+            str: Image PNG en base64, ou None en cas d'erreur
+        """
+        try:
+            fig, (ax1, ax2) = new_figure((13, 5), ncols=2)
+
+            # 🟠 CAMEMBERT
+            ax1.pie(counts, 
+                    labels=None, 
+                    colors=pie_colors, 
+                    startangle=90, counterclock=False,
+                    wedgeprops={"linewidth": 0})
+            ax1.set_title(f"Capteur {nom}", fontsize=12)
+            ax1.legend(humidity_labels, 
+                       loc="center left", 
+                       bbox_to_anchor=(1, 0.5), 
+                       #title="Légende"
+                       prop={'size': 12}
+                       )
+
+            # 🔵 HISTOGRAMME (effectifs déjà comptés : une barre par classe)
+            ax2.hist(amplitude_edges[:-1], 
+                     bins=amplitude_edges, 
+                     color=hist_color, 
+                     edgecolor='white', 
+                     weights=frequencies,
+                     rwidth=.4)
+
+            ax2.set_title(f"Capteur {nom}", fontsize=12)
+            ax2.set_xlabel("Amplitude hydrique quotidienne (RH %)")
+            ax2.set_ylabel("Fréquence (%)")
+            ax2.set_xlim(amplitude_edges[0], amplitude_edges[-1])
+            ax2.yaxis.set_major_formatter(ticker.FuncFormatter(lambda y, _: f'{int(y * 100)}%'))
+
+            return render_png(fig)
+
+        except Exception as e:
+            print(f"[❌] Erreur pour le capteur {nom} : {e}")
+            return None
+
     def generate_all_humidity_distribution_pair_graphs_(self, capteurs_data, applito_pie=True, applito_hist=True):
         """
         Génère une image par capteur avec :
@@ -755,26 +777,22 @@ class GraphGenerator:
         ]
 
         for capteur_id, capteur in capteurs_data.items():
-            df = capteur["data"].copy()
-            nom = capteur["nom"]
+            df = capteur.data
+            nom = capteur.nom
 
             if not {"date", "humidity"}.issubset(df.columns):
                 print(f"[⚠️] Capteur ignoré (colonnes manquantes) : {nom}")
                 continue
 
             try:
-                df["date"] = pd.to_datetime(df["date"])
-                df["jour"] = df["date"].dt.floor("D")
-                # df["jour"] = df["date"]
-
                 # Moyenne journalière d'humidité pour le camembert
-                df_journalier = df.groupby("jour")["humidity"].mean().reset_index()
+                daily = self.daily(capteur_id, capteur)
 
                 # Création de la figure
-                fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+                fig, (ax1, ax2) = new_figure((12, 5), ncols=2)
 
                 # 🟠 CAMEMBERT
-                cat = pd.cut(df_journalier["humidity"], bins=bins, labels=labels, include_lowest=True)
+                cat = pd.cut(daily["humidity_mean"], bins=bins, labels=labels, include_lowest=True)
                 freqs = cat.value_counts().sort_index()
                 freqs = freqs.reindex(labels, fill_value=0)  # assure le bon ordre
 
@@ -786,8 +804,7 @@ class GraphGenerator:
                 ax1.legend(labels, loc="center left", bbox_to_anchor=(1, 0.5), title="Légende",prop={'size': 12})
 
                 # 🔵 HISTOGRAMME
-                grouped = df.groupby("jour")["humidity"]
-                amplitude = (grouped.max() - grouped.min()).dropna()
+                amplitude = (daily["humidity_max"] - daily["humidity_min"]).dropna()
 
                 hist_color = next(hist_color_cycle) if applito_hist else "#1e4f73"
                 ax2.hist(amplitude, 
@@ -801,16 +818,10 @@ class GraphGenerator:
                 ax2.set_xlabel("Amplitude hydrique quotidienne (RH %)")
                 ax2.set_ylabel("Fréquence (%)")
                 ax2.set_xlim(0, 25)
-                ax2.yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: f'{int(y * 100)}%'))
+                ax2.yaxis.set_major_formatter(ticker.FuncFormatter(lambda y, _: f'{int(y * 100)}%'))
 
-                plt.tight_layout()
-
-                buf = io.BytesIO()
-                plt.savefig(buf, format='png', dpi=150)
-                buf.seek(0)
-                images_base64.append(base64.b64encode(buf.read()).decode('utf-8'))
+                images_base64.append(render_png(fig))
                 noms.append(nom)
-                plt.close()
 
             except Exception as e:
                 print(f"[❌] Erreur pour le capteur {nom} : {e}")
@@ -841,14 +852,19 @@ class GraphGenerator:
     def generate_dew_point_risk_graph_(self, capteurs_data):
         """
         Générer un graphique des écarts au point de rosée à partir des colonnes 'temperature' et 'dew_point'.
-        Trace une zone rouge lorsque l'écart < 3°C (risque de condensation).
+        Trace une zone rouge lorsque l'écart < 3°C (risque de condensation) et, en bas du
+        graphique, une bande par capteur marquant chaque épisode sous le seuil détecté
+        sur les mesures (y compris les épisodes de quelques heures).
 
         Returns:
-            dict: Résultat contenant l'image base64.
+            dict: Résultat contenant l'image base64 et le résumé des épisodes par capteur.
         """
 
 
-        fig, ax = plt.subplots(figsize=(18, 8))
+        episodes = {}
+        series = []
+        # Zones et bandes de chaque capteur, tracées sur la figure conservée du style
+        zones = []
 
         palette = [
             "#1f77b4", "#2ca02c", "#ff7f0e", "#d62728",
@@ -857,75 +873,64 @@ class GraphGenerator:
         color_index = 0
 
         for capteur_id, capteur in capteurs_data.items():
-            df = capteur["data"].copy()
-            nom = capteur["nom"]
+            nom = capteur.nom
 
-            if not {"date", "temperature", "dew_point"}.issubset(df.columns):
+            if "ecart" not in capteur:
                 print(f"[⚠️] Capteur ignoré (colonnes manquantes) : {nom}")
-                print(df.columns)
                 continue
 
             try:
-                df["date"] = pd.to_datetime(df["date"])
-                df["date_only"] = df["date"].dt.floor("D")
-                df["ecart"] = df["temperature"] - df["dew_point"]
-
-                grouped = df.groupby("date_only")["ecart"].mean().reset_index()
-                grouped.columns = ["date", "ecart"]
+                daily = self.daily(capteur_id, capteur)
+                grouped = pd.DataFrame({"date": daily["jour"], "ecart": daily["ecart_mean"]})
 
                 color = palette[color_index % len(palette)]
                 linestyle = '-' if "Ext" not in nom else ':'
 
-                ax.plot(grouped["date"], grouped["ecart"], label=nom, color=color, linestyle=linestyle, linewidth=0.8)
+                # Épisodes infra-journaliers : bande en bas du graphique
+                events = self.condensation.detect(capteur, 3)
+                episodes[nom] = self.condensation.summarize(events)
+                xranges = None
+                if not events.empty:
+                    xranges = list(zip(
+                        mdates.date2num(events["start"].to_numpy()),
+                        events["duration"].to_numpy() / np.timedelta64(1, "D"),
+                    ))
+
+                series.append((grouped["date"], grouped["ecart"], nom, color, linestyle))
+                zones.append((grouped, color, xranges))
+                color_index += 1
+
+            except Exception as e:
+                print(f"[❌] Erreur avec le capteur {nom} : {e}")
+                continue
 
+        def decorate(ax):
+            artists = []
+            strip = 0
+            for grouped, color, xranges in zones:
                 # Zone rouge : risque de condensation (< 3°C)
-                ax.fill_between(
+                artists.append(ax.fill_between(
                     grouped["date"],
                     0,
                     3,
                     where=grouped["ecart"] < 3,
                     color='red',
                     alpha=0.2,
-                    
-                )
-
-                color_index += 1
+                ))
+                # Bande des épisodes (hauteur en fraction des axes)
+                if xranges:
+                    artists.append(ax.broken_barh(xranges, (0.01 + strip * 0.025, 0.02),
+                                                  transform=ax.get_xaxis_transform(), color=color, alpha=0.8))
+                    strip += 1
+            return artists
 
-            except Exception as e:
-                print(f"[❌] Erreur avec le capteur {nom} : {e}")
-                continue
-
-        # Mise en forme
-        ax.set_title("Écart au point de rosée quotidien", fontsize=14)
-        ax.set_xlabel("Date")
-        ax.set_ylabel("Température (°C)")
-        #ax.set_ylim(0, 15)
-
-        ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
-        ax.xaxis.set_major_formatter(FrenchDateFormatter('%d %B\n%Y'))
-        ax.xaxis.set_minor_locator(mdates.WeekdayLocator(byweekday=0))
-
-        ax.yaxis.set_major_locator(plt.MultipleLocator(1))
-        ax.yaxis.set_minor_locator(plt.MultipleLocator(0.2))
-        ax.grid(which='major', linestyle='-', linewidth=0.6, color='black', alpha=0.5)
-        ax.grid(which='minor', linestyle='-', linewidth=0.3, color='grey', alpha=0.3)
-        ax.set_axisbelow(True)
-        
-        handles, labels = ax.get_legend_handles_labels()
         # Ajouter un patch personnalisé pour la zone rouge
-        red_patch = Patch(color='red', alpha=0.2, label="Zone à risque (< 3°C)")
-        handles.append(red_patch)
-        labels.append("Zone à risque (< 3°C)")
+        legend_extra = [(Patch(color='red', alpha=0.2, label="Zone à risque (< 3°C)"), "Zone à risque (< 3°C)")]
+        if any(xranges for _, _, xranges in zones):
+            legend_extra.append((Patch(color='grey', alpha=0.8), "Épisodes < 3°C (mesures)"))
 
-        ax.legend(handles=handles, labels=labels, loc='upper right', frameon=True,prop={'size': 12})
-        plt.tight_layout()
-
-        # Export base64
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150)
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close()
+        # Export base64 (figure conservée du style)
+        img_base64 = self.render_time_series("dew_point_risk", series, decorate=decorate, legend_extra=legend_extra)
 
         return {
             "success": True,
@@ -933,7 +938,8 @@ class GraphGenerator:
                 "type": "line",
                 "title": "Écart au point de rosée quotidien",
                 "x_axis": "Date",
-                "y_axis": "Température (°C)"
+                "y_axis": "Température (°C)",
+                "episodes": episodes
             },
             "image": [img_base64]
         }
@@ -949,36 +955,28 @@ class GraphGenerator:
         Returns:
             dict: Contient l’image base64 et les métadonnées du graphique.
         """
-        import matplotlib
-        matplotlib.use('Agg')
-        import matplotlib.pyplot as plt
         import matplotlib.dates as mdates
-        import matplotlib.ticker as ticker
         import numpy as np
         import pandas as pd
         import io
         import base64
 
-        fig, ax = plt.subplots(figsize=(18, 8))
+        fig, ax = new_figure((18, 8))
 
         palette = ["#1f77b4", "#2ca02c", "#ff7f0e"]
         legend_names = ["T-PR_Nord", "C4 (Est)", "C6 (Sud Est)"]
         color_index = 0
 
         for capteur_id, capteur in capteurs_data.items():
-            df = capteur["data"].copy()
-            nom = capteur["nom"]
+            df = capteur.data
+            nom = capteur.nom
 
             if not {"date", "temperature", "dew_point"}.issubset(df.columns):
                 print(f"[⚠️] Capteur ignoré : {nom}")
                 continue
 
-            df["date"] = pd.to_datetime(df["date"])
-            df["date_only"] = df["date"].dt.floor("D")
-            df["ecart"] = df["temperature"] - df["dew_point"]
-
-            grouped = df.groupby("date_only")["ecart"].mean().reset_index()
-            grouped.columns = ["date", "ecart"]
+            daily = self.daily(capteur_id, capteur)
+            grouped = pd.DataFrame({"date": daily["jour"], "ecart": daily["ecart_mean"]})
 
             color = palette[color_index % len(palette)]
             label = legend_names[color_index] if color_index < len(legend_names) else nom
@@ -1022,14 +1020,8 @@ class GraphGenerator:
         ax.grid(which='minor', linestyle='-', linewidth=0.3, color='grey', alpha=0.3)
 
         ax.legend(loc='upper right', frameon=True,prop={'size': 12})
-        plt.tight_layout()
-
         # Export base64
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150)
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close()
+        img_base64 = render_png(fig)
 
         return {
             "success": True,
@@ -1041,3 +1033,114 @@ class GraphGenerator:
             },
             "image": [img_base64]
         }
+
+    def generate_humidity_map_graph(self, capteurs_data, method="idw", extent=None, resolution=None,
+                                    model="spherical", variogram_range=None):
+        """
+        Générer la cartographie hygrométrique interpolée entre les positions des capteurs
+
+        Les humidités moyennes quotidiennes de tous les capteurs sont interpolées en une
+        fois (une carte par jour), puis moyennées sur la période et sur chaque mois.
+
+        Args:
+            capteurs_data (dict): Séries des capteurs (SensorSeries, avec 'position' : {"x", "y"})
+            method (str, optional): 'idw' ou 'kriging'
+            extent (list, optional): Emprise de la carte (xmin, xmax, ymin, ymax)
+            resolution (int, optional): Nombre de points sur la plus grande dimension
+            model (str, optional): Modèle de variogramme du krigeage
+            variogram_range (float, optional): Portée du variogramme
+
+        Returns:
+            dict: Résultat contenant les images base64 des cartes (période puis mois)
+        """
+        # Capteurs positionnés avec des mesures d'humidité
+        retenus = {
+            capteur_id: capteur for capteur_id, capteur in capteurs_data.items()
+            if capteur.position and "humidity" in capteur
+        }
+        if len(retenus) < 2:
+            return {
+                "success": False,
+                "message": "Au moins deux capteurs positionnés avec des données d'humidité sont nécessaires"
+            }
+
+        # Matrice jours × capteurs des humidités moyennes quotidiennes
+        series = {}
+        for capteur_id, capteur in retenus.items():
+            daily = self.daily(capteur_id, capteur)
+            series[capteur_id] = pd.Series(daily["humidity_mean"].to_numpy(), index=pd.DatetimeIndex(daily["jour"]))
+        values = pd.DataFrame(series).sort_index()
+        positions = np.array([[capteur.position["x"], capteur.position["y"]] for capteur in retenus.values()],
+                             dtype=float)
+        noms = [capteur.nom for capteur in retenus.values()]
+
+        # Toutes les cartes quotidiennes en un seul calcul
+        result = self.spatial.interpolate(
+            positions, values.to_numpy(), method=method, extent=extent,
+            resolution=resolution or GRID_RESOLUTION, model=model, variogram_range=variogram_range
+        )
+        maps = result["maps"]
+        jours = values.index
+
+        # Cartes moyennes : période complète puis chaque mois
+        periodes = [(f"{jours[0]:%d/%m/%Y} - {jours[-1]:%d/%m/%Y}", np.ones(len(jours), dtype=bool))]
+        mois = jours.to_period("M")
+        for periode in mois.unique():
+            libelle = f"{mois_fr[periode.strftime('%B')]} {periode.year}"
+            periodes.append((libelle, np.asarray(mois == periode)))
+
+        with np.errstate(all="ignore"):
+            moyennes = [(libelle, np.nanmean(maps[selection], axis=0), values[selection].mean().to_numpy())
+                        for libelle, selection in periodes]
+        vmin = np.nanmin([np.nanmin(carte) for _, carte, _ in moyennes])
+        vmax = np.nanmax([np.nanmax(carte) for _, carte, _ in moyennes])
+
+        # Rendu des cartes en parallèle (une figure par période)
+        jobs = [(libelle, carte, mesures, result, positions, noms, vmin, vmax) for libelle, carte, mesures in moyennes]
+        images_base64 = self.render_many(self._render_humidity_map, jobs)
+        details = [
+            {
+                "periode": libelle,
+                "min": round(float(np.nanmin(carte)), 1),
+                "max": round(float(np.nanmax(carte)), 1),
+                "moyenne": round(float(np.nanmean(carte)), 1),
+            }
+            for libelle, carte, _ in moyennes
+        ]
+
+        return {
+            "success": True,
+            "data": {
+                "type": "map",
+                "title": "Cartographie hygrométrique",
+                "x_axis": "x (m)",
+                "y_axis": "y (m)",
+                "method": method,
+                "days": len(jours),
+                "details": details
+            },
+            "image": images_base64
+        }
+
+    @staticmethod
+    def _render_humidity_map(libelle, carte, mesures, grid, positions, noms, vmin, vmax):
+        """
+        Rendre une carte d'humidité avec les capteurs et leur humidité moyenne
+
+        Returns:
+            str: Image PNG en base64
+        """
+        fig, ax = new_figure((10, 7))
+        image = ax.imshow(carte, origin="lower", extent=grid["extent"], cmap="Blues",
+                          vmin=vmin, vmax=vmax, interpolation="bilinear", aspect="equal")
+        ax.contour(grid["x"], grid["y"], carte, levels=8, colors="black", linewidths=0.4, alpha=0.5)
+        ax.scatter(positions[:, 0], positions[:, 1], color="#d62728", s=25, zorder=3)
+        for nom, (x, y), mesure in zip(noms, positions, mesures):
+            texte = f"{nom}\n{mesure:.0f}%" if not np.isnan(mesure) else nom
+            ax.annotate(texte, (x, y), textcoords="offset points", xytext=(5, 5), fontsize=9, color="#d62728")
+
+        ax.set_title(f"Humidité relative moyenne - {libelle}", fontsize=14)
+        ax.set_xlabel("x (m)")
+        ax.set_ylabel("y (m)")
+        fig.colorbar(image, ax=ax, label="Humidité (%)")
+        return render_png(fig)
@@ -0,0 +1,423 @@
+"""
+Module HoboReader - Décodage natif des fichiers binaires HOBOconnect (.hobo)
+"""
+import os
+import struct
+import logging
+import datetime
+import numpy as np
+import pandas as pd
+
+from core.date_parser import NAMED_OFFSETS
+
+logger = logging.getLogger(__name__)
+
+# Signature en tête de chaque fichier .hobo
+HOBO_MAGIC = b"HOBO"
+
+# Octet introduisant chaque entrée de l'en-tête (tag, longueur, valeur)
+HEADER_ENTRY = 0x88
+
+# Tags connus de l'en-tête
+TAG_DATA_OFFSET = 0x0D
+TAG_HEADER_SIZE = 0x1D
+TAG_MANUFACTURER = 0x04
+TAG_MODEL = 0x05
+TAG_SERIAL = 0x06
+TAG_LAUNCH_TIME = 0x07
+TAG_INTERVAL = 0x08
+TAG_FIRST_SAMPLE_DELAY = 0x09
+TAG_NAME = 0x0A
+TAG_UTC_OFFSET = 0x12
+TAG_TIMEZONE = 0x14
+TAG_BATTERY = 0x1E
+TAG_APP = 0x34
+TAG_CHANNEL = 0x16
+TAG_CHANNEL_ENABLED = 0x0B
+TAG_CHANNEL_TYPE = 0x0C
+
+# Types de voies connus (code capteur -> nom, libellé, unité)
+CHANNEL_TYPES = {
+    0xFE: ("battery", "Battery", "V"),
+    0x95: ("temperature", "Temperature", "°C"),
+    0x42: ("humidity", "RH", "%"),
+    0x30: ("light", "Light", "lux"),
+    0x7F: ("dew_point", "Dew Point", "°C"),
+}
+
+# Types d'événements connus
+EVENT_TYPES = {
+    0x00: "Host Connected",
+    0x01: "Started",
+}
+
+# Un mot de 16 bits à 0xFFFF en début d'enregistrement introduit un événement
+EVENT_MARKER = 0xFFFF
+
+# Coefficients Steinhart-Hart étendus de la thermistance (1/T = A + B.ln r + C.ln² r + D.ln³ r)
+THERMISTOR_COEFFS = (3.35447701e-03, -2.79023585e-04, 4.27556927e-06, -1.56306395e-07)
+
+
+class HoboReader:
+    """
+    Classe pour décoder les fichiers binaires exportés par HOBOconnect (ex: MX1104)
+
+    Le fichier est composé d'un en-tête TLV (numéro de série, modèle, fuseau horaire,
+    voies) suivi d'un flux de données aligné sur le quartet : chaque mesure est un
+    enregistrement de 16 bits par voie active, les événements (connexion, démarrage...)
+    sont intercalés et introduits par le marqueur 0xFFFF.
+
+    Les mesures sont datées en UTC à partir de l'heure de lancement puis converties
+    en heure locale du fuseau de l'enregistreur, heure d'été comprise, comme dans les
+    exports xlsx de HOBOconnect.
+    """
+
+    def read_header(self, file_path):
+        """
+        Lire uniquement l'en-tête d'un fichier HOBO
+
+        Args:
+            file_path (str): Chemin du fichier .hobo
+
+        Returns:
+            dict: Informations de l'enregistreur (serial, model, timezone, channels...)
+
+        Raises:
+            ValueError: Si le fichier n'est pas un fichier HOBO valide
+        """
+        with open(file_path, "rb") as f:
+            head = f.read(4096)
+        return self._parse_header(head)
+
+    def read(self, file_path, usecols=None):
+        """
+        Décoder un fichier HOBO complet en une seule passe
+
+        Args:
+            file_path (str): Chemin du fichier .hobo
+            usecols (list, optional): Colonnes à produire (toutes par défaut) ; les voies
+                non demandées ne sont pas converties
+
+        Returns:
+            pandas.DataFrame: Une colonne de date puis une colonne par voie enregistrée,
+            avec l'en-tête décodé dans ``df.attrs["hobo"]``
+
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas
+            ValueError: Si le fichier n'est pas un fichier HOBO valide
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Le fichier n'existe pas: {file_path}")
+
+        with open(file_path, "rb") as f:
+            buffer = f.read()
+
+        header = self._parse_header(buffer)
+        channels = [c for c in header["channels"] if c["enabled"]]
+        if not channels:
+            raise ValueError("Aucune voie de mesure active dans le fichier HOBO")
+
+        raw, events = self._decode_records(buffer[header["data_offset"]:], len(channels), header)
+
+        # Horodatage régulier en UTC à partir de la première mesure, puis heure locale
+        first = np.datetime64(header["first_sample_utc"], "s")
+        step = np.timedelta64(header["interval"], "s")
+        dates = self._local_times(first + np.arange(len(raw), dtype=np.int64) * step, header)
+
+        # Mappages enregistrés avant la prise en compte de l'heure d'été : la colonne de
+        # date portait le décalage UTC fixe de l'en-tête (ex: "Date-Time (GMT+01:00)")
+        date_column = header["date_column"]
+        legacy_column = f"Date-Time ({self._format_utc_offset(header['utc_offset'])})"
+        if usecols and date_column not in usecols and legacy_column in usecols:
+            date_column = legacy_column
+
+        data = {}
+        if not usecols or date_column in usecols:
+            data[date_column] = dates
+        for index, channel in enumerate(channels):
+            if usecols and channel["column"] not in usecols:
+                continue
+            data[channel["column"]] = self._convert_channel(channel["type"], raw[:, index]).astype(np.float32)
+
+        df = pd.DataFrame(data)
+        df.attrs["hobo"] = dict(header, events=events)
+
+        logger.info(
+            f"Fichier HOBO décodé: {header['serial']} ({header['model']}), "
+            f"{len(df)} mesures, {len(events)} événements"
+        )
+        return df
+
+    def _parse_header(self, buffer):
+        """
+        Décoder les entrées TLV de l'en-tête
+
+        Args:
+            buffer (bytes): Début du fichier (au moins l'en-tête)
+
+        Returns:
+            dict: Informations de l'en-tête
+        """
+        if not buffer.startswith(HOBO_MAGIC):
+            raise ValueError("Le fichier n'est pas un fichier HOBO valide (signature absente)")
+
+        entries = []
+        pos = len(HOBO_MAGIC)
+        while pos + 3 <= len(buffer) and buffer[pos] == HEADER_ENTRY:
+            tag, length = buffer[pos + 1], buffer[pos + 2]
+            entries.append((tag, buffer[pos + 3:pos + 3 + length]))
+            pos += 3 + length
+
+        values = {}
+        channels = []
+        for tag, value in entries:
+            if tag == TAG_CHANNEL:
+                channels.append({"number": len(channels) + 1, "enabled": False, "code": None})
+            elif channels and tag == TAG_CHANNEL_ENABLED:
+                channels[-1]["enabled"] = bool(value and value[0])
+            elif channels and tag == TAG_CHANNEL_TYPE:
+                channels[-1]["code"] = value[0] if value else None
+            else:
+                values.setdefault(tag, value)
+
+        if TAG_LAUNCH_TIME not in values or TAG_INTERVAL not in values:
+            raise ValueError("En-tête HOBO incomplet (heure de lancement ou intervalle manquant)")
+
+        utc_offset = self._int(values.get(TAG_UTC_OFFSET), signed=True)
+        timezone = self._text(values.get(TAG_TIMEZONE))
+        zone = self._zone(timezone)
+
+        for channel in channels:
+            name, label, unit = CHANNEL_TYPES.get(
+                channel["code"], (f"channel_{channel['number']}", f"Channel {channel['number']}", "")
+            )
+            channel["type"] = name
+            channel["unit"] = unit
+            channel["column"] = f"Ch: {channel['number']} - {label}   ({unit})"
+
+        # Heure de lancement : heure locale en vigueur au lancement (heure d'été comprise)
+        launch_time = self._parse_datetime(values[TAG_LAUNCH_TIME])
+        first_sample_delay = self._int(values.get(TAG_FIRST_SAMPLE_DELAY))
+        launch_utc = self._to_utc(launch_time, zone, utc_offset)
+
+        battery = values.get(TAG_BATTERY)
+        header = {
+            "manufacturer": self._text(values.get(TAG_MANUFACTURER)),
+            "model": self._text(values.get(TAG_MODEL)),
+            "serial": self._text(values.get(TAG_SERIAL)),
+            "name": self._text(values.get(TAG_NAME)),
+            "application": self._text(values.get(TAG_APP)),
+            "timezone": timezone,
+            "zone": zone,
+            "utc_offset": utc_offset,
+            "launch_time": launch_time,
+            "launch_utc": launch_utc,
+            "first_sample_utc": launch_utc + datetime.timedelta(seconds=first_sample_delay),
+            "interval": self._int(values[TAG_INTERVAL]),
+            "battery_voltage": struct.unpack(">d", battery)[0] if battery and len(battery) == 8 else None,
+            "data_offset": self._int(values.get(TAG_DATA_OFFSET)) or 4096,
+            "header_size": self._int(values.get(TAG_HEADER_SIZE)),
+            "channels": channels,
+            "date_column": f"Date-Time ({self._zone_label(zone, utc_offset, launch_time.year)})",
+        }
+        header["first_sample_time"] = self._local_time(header["first_sample_utc"], header)
+        return header
+
+    def _decode_records(self, data, channel_count, header):
+        """
+        Décoder le flux de mesures et d'événements
+
+        Args:
+            data (bytes): Zone de données du fichier
+            channel_count (int): Nombre de voies actives
+            header (dict): En-tête décodé (pour dater les événements)
+
+        Returns:
+            tuple: (numpy.ndarray des valeurs brutes (n, voies), liste des événements)
+        """
+        raw_bytes = np.frombuffer(data, dtype=np.uint8)
+
+        # Flux de quartets puis mots de 16 bits commençant à chaque quartet
+        nibbles = np.empty(raw_bytes.size * 2, dtype=np.uint16)
+        nibbles[0::2] = raw_bytes >> 4
+        nibbles[1::2] = raw_bytes & 0x0F
+        words = (nibbles[:-3] << 12) | (nibbles[1:-2] << 8) | (nibbles[2:-1] << 4) | nibbles[3:]
+
+        record_size = 4 * channel_count
+        interval = datetime.timedelta(seconds=header["interval"])
+        last_time = header["launch_utc"]
+        sample_count = 0
+        segments = []
+        events = []
+        pos = 0
+
+        while pos < words.size:
+            # Recherche vectorisée du prochain marqueur d'événement sur les débuts d'enregistrement
+            starts = words[pos::record_size]
+            markers = np.flatnonzero(starts == EVENT_MARKER)
+            count = int(markers[0]) if markers.size else (words.size - pos) // record_size
+            if count:
+                segments.append(pos + record_size * np.arange(count))
+                sample_count += count
+                last_time = header["first_sample_utc"] + (sample_count - 1) * interval
+            if not markers.size:
+                break
+
+            pos += count * record_size
+            # Un quartet 0xF après le marqueur signale la fin des données (mémoire vierge)
+            if pos + 8 > nibbles.size or nibbles[pos + 4] == 0x0F:
+                break
+
+            event_type = int(nibbles[pos + 5]) << 4 | int(nibbles[pos + 6])
+            delay_size = int(nibbles[pos + 7])
+            delay = self._nibbles_value(nibbles[pos + 8:pos + 8 + delay_size])
+            payload_start = pos + 9 + delay_size
+            payload_size = int(nibbles[payload_start - 1])
+            payload = self._nibbles_value(nibbles[payload_start:payload_start + payload_size])
+
+            last_time = last_time + datetime.timedelta(seconds=delay)
+            events.append({
+                "type": EVENT_TYPES.get(event_type, f"0x{event_type:02X}"),
+                "date": self._local_time(last_time, header),
+                "value": payload if payload_size else None,
+            })
+            pos = payload_start + payload_size
+
+        if segments:
+            positions = np.concatenate(segments)
+        else:
+            positions = np.empty(0, dtype=np.int64)
+
+        offsets = 4 * np.arange(channel_count)
+        raw = words[positions[:, None] + offsets[None, :]]
+        return raw, events
+
+    def _convert_channel(self, channel_type, raw):
+        """
+        Convertir les valeurs brutes d'une voie en unités physiques
+
+        Args:
+            channel_type (str): Type de la voie
+            raw (numpy.ndarray): Mots de 16 bits
+
+        Returns:
+            numpy.ndarray: Valeurs converties
+        """
+        raw = raw.astype(np.float64)
+        if channel_type == "temperature":
+            ratio = raw / 65536.0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                log_r = np.log((1.0 - ratio) / ratio)
+            a, b, c, d = THERMISTOR_COEFFS
+            return 1.0 / (a + log_r * (b + log_r * (c + log_r * d))) - 273.15
+        if channel_type == "humidity":
+            return raw / 655.36
+        if channel_type == "light":
+            # Mantisse de 12 bits, exposant de 4 bits, en centièmes de lux
+            words = raw.astype(np.uint32)
+            return (words & 0x0FFF) * np.exp2(words >> 12) / 100.0
+        return raw
+
+    @staticmethod
+    def _zone(timezone):
+        """
+        Vérifier le fuseau horaire de l'en-tête (ex: "Europe/Paris")
+
+        Args:
+            timezone (str): Nom du fuseau lu dans l'en-tête
+
+        Returns:
+            str: Nom du fuseau, None s'il est absent ou inconnu (décalage fixe utilisé)
+        """
+        if not timezone:
+            return None
+        try:
+            pd.Timestamp(0, tz=timezone)
+        except (KeyError, ValueError, TypeError):
+            logger.warning(f"Fuseau horaire HOBO inconnu: {timezone}, décalage UTC fixe utilisé")
+            return None
+        return timezone
+
+    @staticmethod
+    def _to_utc(local_time, zone, utc_offset):
+        """Convertir une heure locale de l'en-tête en UTC (sans fuseau)"""
+        if zone is None:
+            return local_time - datetime.timedelta(seconds=utc_offset)
+        stamp = pd.Timestamp(local_time).tz_localize(zone, ambiguous=True, nonexistent="shift_forward")
+        return stamp.tz_convert("UTC").tz_localize(None).to_pydatetime()
+
+    @staticmethod
+    def _local_times(utc_times, header):
+        """
+        Convertir des horodatages UTC en heure locale de l'enregistreur
+
+        Args:
+            utc_times (numpy.ndarray): Horodatages UTC (datetime64)
+            header (dict): En-tête décodé (fuseau et décalage UTC)
+
+        Returns:
+            numpy.ndarray: Horodatages locaux (datetime64[ns])
+        """
+        utc_times = np.asarray(utc_times, dtype="datetime64[ns]")
+        if header["zone"] is None:
+            return utc_times + np.timedelta64(header["utc_offset"], "s")
+        local = pd.DatetimeIndex(utc_times).tz_localize("UTC").tz_convert(header["zone"])
+        return local.tz_localize(None).to_numpy(dtype="datetime64[ns]")
+
+    @classmethod
+    def _local_time(cls, utc_time, header):
+        """Convertir une date UTC en heure locale de l'enregistreur"""
+        local = cls._local_times(np.array([np.datetime64(utc_time, "s")]), header)[0]
+        return pd.Timestamp(local).to_pydatetime()
+
+    @classmethod
+    def _zone_label(cls, zone, utc_offset, year):
+        """
+        Libellé du fuseau de la colonne de date, comme dans les exports HOBOconnect
+
+        L'abréviation de l'heure normale du fuseau (ex: CET) est utilisée quand elle est
+        connue de DateParser, de sorte que les horodatages locaux (heure d'été comprise)
+        soient lus comme ceux d'un export xlsx ; à défaut, le décalage UTC fixe
+        (ex: GMT+01:00).
+        """
+        if zone is not None:
+            for month in (1, 7):
+                name = pd.Timestamp(year=year, month=month, day=1, tz=zone).tzname()
+                if NAMED_OFFSETS.get(name) == utc_offset:
+                    return name
+        return cls._format_utc_offset(utc_offset)
+
+    @staticmethod
+    def _nibbles_value(nibbles):
+        """Convertir une suite de quartets en entier"""
+        value = 0
+        for nibble in nibbles:
+            value = (value << 4) | int(nibble)
+        return value
+
+    @staticmethod
+    def _int(value, signed=False):
+        """Convertir une valeur big-endian en entier (0 si absente)"""
+        if not value:
+            return 0
+        return int.from_bytes(value, "big", signed=signed)
+
+    @staticmethod
+    def _text(value):
+        """Convertir une valeur en texte"""
+        if not value:
+            return None
+        return value.decode("utf-8", errors="ignore").strip()
+
+    @staticmethod
+    def _parse_datetime(value):
+        """Décoder une date de l'en-tête (année sur 2 octets, mois, jour, h, min, s)"""
+        year = value[0] * 100 + value[1]
+        return datetime.datetime(year, value[2], value[3], value[4], value[5], value[6])
+
+    @staticmethod
+    def _format_utc_offset(seconds):
+        """Formater un décalage UTC comme dans les exports HOBO (GMT+01:00)"""
+        sign = "+" if seconds >= 0 else "-"
+        hours, remainder = divmod(abs(seconds), 3600)
+        return f"GMT{sign}{hours:02d}:{remainder // 60:02d}"
@@ -0,0 +1,131 @@
+"""
+Module HumidityDistribution - Répartition des mesures d'humidité par classes et des amplitudes journalières
+"""
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Limites des classes d'humidité relative (%), par jeu de classes
+HUMIDITY_BIN_PRESETS = {
+    "standard": [40, 50, 60, 70, 80, 90],
+    "humide": [65, 70, 75, 80, 85, 90, 95],
+}
+DEFAULT_HUMIDITY_PRESET = "standard"
+
+# Classes d'amplitude hydrique journalière (%) : de 0 à 25 par pas de 1
+DEFAULT_AMPLITUDE_BINS = list(range(0, 26))
+
+
+class HumidityDistribution:
+    """
+    Classe pour compter les mesures par classe d'humidité et les amplitudes journalières par classe
+
+    Les valeurs de tous les capteurs sont concaténées en un tableau contigu avec le
+    numéro de leur capteur ; la classe de chaque valeur est trouvée par recherche
+    dichotomique dans les limites (np.digitize) et les effectifs de tous les capteurs
+    sont obtenus en un seul comptage (np.bincount sur capteur × classe). Les classes
+    sont fermées à gauche : « 40% ≤ HR < 50% ».
+    """
+
+    def __init__(self, humidity_bins=None, amplitude_bins=None):
+        """
+        Initialise la répartition
+
+        Args:
+            humidity_bins (list or str, optional): Limites intérieures des classes
+                d'humidité (%) ou nom d'un jeu de classes (HUMIDITY_BIN_PRESETS)
+            amplitude_bins (list, optional): Limites des classes d'amplitude (%),
+                de la première à la dernière
+        Raises:
+            ValueError: Si les limites ne sont pas croissantes ou le jeu de classes inconnu
+        """
+        if humidity_bins is None:
+            humidity_bins = DEFAULT_HUMIDITY_PRESET
+        if isinstance(humidity_bins, str):
+            if humidity_bins not in HUMIDITY_BIN_PRESETS:
+                raise ValueError(f"Jeu de classes d'humidité inconnu: {humidity_bins}")
+            humidity_bins = HUMIDITY_BIN_PRESETS[humidity_bins]
+        self.humidity_edges = self._check_edges(humidity_bins, 1)
+        self.amplitude_edges = self._check_edges(amplitude_bins if amplitude_bins is not None else DEFAULT_AMPLITUDE_BINS, 2)
+
+    @property
+    def humidity_labels(self):
+        """list: Libellés des classes d'humidité"""
+        edges = [self._format(edge) for edge in self.humidity_edges]
+        labels = [f"HR < {edges[0]}%"]
+        labels += [f"{low}% ≤ HR < {high}%" for low, high in zip(edges[:-1], edges[1:])]
+        labels.append(f"HR ≥ {edges[-1]}%")
+        return labels
+
+    @property
+    def amplitude_labels(self):
+        """list: Libellés des classes d'amplitude"""
+        edges = [self._format(edge) for edge in self.amplitude_edges]
+        return [f"{low}-{high} %" for low, high in zip(edges[:-1], edges[1:])]
+
+    def humidity_counts(self, samples):
+        """
+        Compter les mesures de chaque capteur par classe d'humidité
+
+        Args:
+            samples (dict): Humidités (%) par capteur (tableaux, NaN ignorés)
+
+        Returns:
+            dict: Effectifs par capteur (numpy.ndarray d'entiers, une case par classe)
+        """
+        n_classes = len(self.humidity_edges) + 1
+        keys, values, owners = self._concatenate(samples)
+        classes = np.digitize(values, self.humidity_edges)
+        counts = np.bincount(owners * n_classes + classes, minlength=len(keys) * n_classes)
+        return dict(zip(keys, counts.reshape(len(keys), n_classes)))
+
+    def amplitude_histograms(self, amplitudes):
+        """
+        Compter les amplitudes journalières de chaque capteur par classe
+
+        Les amplitudes hors des limites ne sont comptées dans aucune classe ; la
+        dernière classe inclut sa borne supérieure (comme numpy.histogram).
+
+        Args:
+            amplitudes (dict): Amplitudes journalières (%) par capteur (NaN ignorés)
+
+        Returns:
+            dict: Par capteur, effectifs par classe et nombre total de jours
+            ({"counts": numpy.ndarray, "days": int})
+        """
+        edges = self.amplitude_edges
+        n_classes = len(edges) - 1
+        keys, values, owners = self._concatenate(amplitudes)
+        classes = np.searchsorted(edges, values, side="right") - 1
+        classes[values == edges[-1]] = n_classes - 1
+        inside = (classes >= 0) & (classes < n_classes)
+        counts = np.bincount(owners[inside] * n_classes + classes[inside], minlength=len(keys) * n_classes)
+        days = np.bincount(owners, minlength=len(keys))
+        return {
+            key: {"counts": row, "days": int(total)}
+            for key, row, total in zip(keys, counts.reshape(len(keys), n_classes), days)
+        }
+
+    @staticmethod
+    def _concatenate(arrays):
+        """Concaténer les valeurs renseignées de chaque capteur avec leur numéro de capteur"""
+        keys = list(arrays)
+        parts = [np.asarray(arrays[key], dtype=np.float64) for key in keys]
+        parts = [part[~np.isnan(part)] for part in parts]
+        values = np.concatenate(parts) if parts else np.empty(0)
+        owners = np.repeat(np.arange(len(keys)), [len(part) for part in parts])
+        return keys, values, owners
+
+    @staticmethod
+    def _check_edges(edges, minimum):
+        """Vérifier que les limites sont croissantes"""
+        edges = np.asarray(edges, dtype=np.float64)
+        if edges.ndim != 1 or len(edges) < minimum or np.any(np.diff(edges) <= 0):
+            raise ValueError("Les limites des classes doivent être une liste de valeurs croissantes")
+        return edges
+
+    @staticmethod
+    def _format(value):
+        """Limite affichée sans décimales inutiles"""
+        return f"{value:g}"
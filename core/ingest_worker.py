@@ -0,0 +1,153 @@
+"""
+Module IngestWorker - Analyse en arrière-plan des fichiers associés aux capteurs
+"""
+import copy
+import queue
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# États d'analyse exposés à l'interface
+STATE_INGESTING = "ingesting"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
+
+
+class IngestWorker:
+    """
+    Classe pour analyser, normaliser et mettre en cache les données des capteurs en arrière-plan
+
+    Un fil de travail traite les demandes dans l'ordre. Chaque demande porte un numéro
+    de version par capteur : si le fichier ou le mappage change pendant l'analyse, le
+    résultat de l'ancienne demande est ignoré.
+    """
+
+    def __init__(self, data_loader):
+        """
+        Initialise le fil d'analyse
+
+        Args:
+            data_loader (DataLoader): Chargeur utilisé pour l'analyse (avec cache)
+        """
+        self.data_loader = data_loader
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._status = {}
+        self._versions = {}
+        self._done = {}
+        self._thread = threading.Thread(target=self._run, name="ingest-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, capteur_id, capteur_data):
+        """
+        Demander l'analyse du fichier d'un capteur
+
+        Args:
+            capteur_id (str): ID du capteur
+            capteur_data (dict): Données du capteur (chemin du fichier et mappage des colonnes)
+        """
+        # Copie : le capteur peut être modifié ou sauvegardé pendant l'analyse
+        snapshot = dict(capteur_data, sniff=copy.deepcopy(capteur_data.get("sniff")))
+        with self._lock:
+            version = self._versions.get(capteur_id, 0) + 1
+            self._versions[capteur_id] = version
+            self._status[capteur_id] = {"state": STATE_INGESTING, "progress": 0.0, "message": None}
+            # Une analyse déjà en attente est remplacée : ses attentes suivent la nouvelle
+            done = self._done.get(capteur_id)
+            if done is None or done.is_set():
+                self._done[capteur_id] = threading.Event()
+        self._queue.put((capteur_id, version, snapshot, capteur_data))
+
+    def forget(self, capteur_id):
+        """
+        Oublier l'état d'un capteur (capteur supprimé)
+
+        Args:
+            capteur_id (str): ID du capteur
+        """
+        with self._lock:
+            self._versions[capteur_id] = self._versions.get(capteur_id, 0) + 1
+            self._status.pop(capteur_id, None)
+            done = self._done.pop(capteur_id, None)
+        if done:
+            done.set()
+
+    def get_status(self, capteur_id):
+        """
+        Obtenir l'état d'analyse d'un capteur
+
+        Args:
+            capteur_id (str): ID du capteur
+
+        Returns:
+            dict: État (ingesting, ready ou failed), progression (0 à 1) et message,
+            ou None si aucune analyse n'a été demandée
+        """
+        with self._lock:
+            status = self._status.get(capteur_id)
+            return dict(status) if status else None
+
+    def wait(self, capteur_ids, timeout=None):
+        """
+        Attendre la fin des analyses en cours pour des capteurs
+
+        Args:
+            capteur_ids (list): IDs des capteurs
+            timeout (float, optional): Délai maximal d'attente en secondes par capteur
+        """
+        with self._lock:
+            events = [self._done[capteur_id] for capteur_id in capteur_ids if capteur_id in self._done]
+        for event in events:
+            event.wait(timeout)
+
+    def _run(self):
+        """Boucle du fil d'analyse"""
+        while True:
+            capteur_id, version, snapshot, capteur_data = self._queue.get()
+            try:
+                if self._is_current(capteur_id, version):
+                    self._ingest(capteur_id, version, snapshot, capteur_data)
+            except Exception as e:
+                logger.error(f"Erreur inattendue lors de l'analyse du capteur {capteur_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _ingest(self, capteur_id, version, snapshot, capteur_data):
+        """Analyser un capteur et publier son état"""
+        try:
+            self.data_loader.load_capteur_data(
+                snapshot, progress=lambda value: self._set_progress(capteur_id, version, value)
+            )
+        except Exception as e:
+            logger.warning(f"Analyse en arrière-plan impossible pour {snapshot.get('nom', capteur_id)}: {e}")
+            self._finish(capteur_id, version, STATE_FAILED, str(e))
+            return
+
+        with self._lock:
+            if self._versions.get(capteur_id) == version:
+                # Conserver la structure et les formats de date déduits
+                capteur_data["sniff"] = snapshot.get("sniff")
+        self._finish(capteur_id, version, STATE_READY, None)
+        logger.info(f"Capteur {snapshot.get('nom', capteur_id)} prêt")
+
+    def _set_progress(self, capteur_id, version, progress):
+        """Mettre à jour la progression d'une analyse encore d'actualité"""
+        with self._lock:
+            if self._versions.get(capteur_id) == version:
+                self._status[capteur_id]["progress"] = progress
+
+    def _finish(self, capteur_id, version, state, message):
+        """Publier l'état final d'une analyse encore d'actualité"""
+        with self._lock:
+            if self._versions.get(capteur_id) != version:
+                return
+            self._status[capteur_id] = {"state": state, "progress": 1.0, "message": message}
+            done = self._done.get(capteur_id)
+        if done:
+            done.set()
+
+    def _is_current(self, capteur_id, version):
+        """Vérifier qu'aucune demande plus récente n'a été faite pour ce capteur"""
+        with self._lock:
+            return self._versions.get(capteur_id) == version
@@ -0,0 +1,137 @@
+"""
+Module ParallelLoader - Chargement parallèle des fichiers de plusieurs capteurs
+"""
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from core.data_loader import DataLoader
+
+logger = logging.getLogger(__name__)
+
+# Chargeur propre à chaque processus de travail (créé à la première tâche)
+_worker_loader = None
+
+
+def _ingest(capteur_data, cache_dir, series_dir):
+    """
+    Analyser le fichier d'un capteur dans un processus de travail
+
+    La série préparée est écrite dans le cache (un fichier .npy par colonne) ; seule
+    la structure du fichier mise à jour est renvoyée au processus principal.
+
+    Args:
+        capteur_data (dict): Données du capteur (chemin du fichier et mappage des colonnes)
+        cache_dir (str): Répertoire du cache des données analysées
+        series_dir (str): Répertoire des séries conservées par enregistreur
+
+    Returns:
+        dict: Structure du fichier détectée (avec les formats de date déduits)
+    """
+    global _worker_loader
+    if _worker_loader is None or _worker_loader.cache.cache_dir != cache_dir:
+        _worker_loader = DataLoader(cache_dir, series_dir)
+
+    _worker_loader.load_capteur_data(capteur_data)
+    return capteur_data.get("sniff")
+
+
+class ParallelLoader:
+    """
+    Classe pour charger les données de plusieurs capteurs dans un pool de processus
+
+    Les séries déjà en cache sont lues directement dans le processus principal ; seuls
+    les fichiers à analyser sont répartis entre les processus. Chaque processus écrit
+    ses colonnes typées dans le cache disque, que le processus principal projette en
+    mémoire : aucun DataFrame n'est sérialisé entre les processus.
+    """
+
+    def __init__(self, data_loader, max_workers=None):
+        """
+        Initialise le chargeur parallèle
+
+        Args:
+            data_loader (DataLoader): Chargeur du processus principal (avec cache)
+            max_workers (int, optional): Nombre de processus. Par défaut: nombre de cœurs
+        """
+        self.data_loader = data_loader
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = None
+
+    def load_many(self, capteurs):
+        """
+        Charger les données de plusieurs capteurs
+
+        Args:
+            capteurs (dict): Données des capteurs par identifiant
+
+        Returns:
+            dict: Par identifiant, le DataFrame préparé ou l'exception levée au chargement
+        """
+        cache = self.data_loader.cache
+        results = {}
+        pending = {}
+
+        for capteur_id, capteur_data in capteurs.items():
+            cached_df = cache.load_series(capteur_data.get("file_path"), capteur_data.get("columns")) if cache else None
+            if cached_df is not None:
+                results[capteur_id] = cached_df
+            else:
+                pending[capteur_id] = capteur_data
+
+        if not cache or len(pending) <= 1 or self.max_workers <= 1:
+            for capteur_id, capteur_data in pending.items():
+                results[capteur_id] = self._load_local(capteur_data)
+            return results
+
+        logger.info(f"Chargement parallèle de {len(pending)} capteurs ({self.max_workers} processus)")
+        series_store = self.data_loader.series_store
+        series_dir = series_store.store_dir if series_store else None
+        try:
+            executor = self._get_executor()
+            futures = {
+                capteur_id: executor.submit(_ingest, capteur_data, cache.cache_dir, series_dir)
+                for capteur_id, capteur_data in pending.items()
+            }
+        except Exception as e:
+            logger.warning(f"Pool de processus indisponible, chargement séquentiel: {e}")
+            self.shutdown()
+            futures = {}
+
+        for capteur_id, capteur_data in pending.items():
+            future = futures.get(capteur_id)
+            if future is None:
+                results[capteur_id] = self._load_local(capteur_data)
+                continue
+            try:
+                sniff = future.result()
+            except Exception as e:
+                results[capteur_id] = e
+                continue
+            if sniff:
+                # Conserver la structure et les formats de date déduits par le processus
+                capteur_data["sniff"] = sniff
+            # Projection mémoire des colonnes écrites par le processus (ou analyse locale
+            # si l'écriture du cache a échoué)
+            results[capteur_id] = self._load_local(capteur_data)
+
+        return results
+
+    def shutdown(self):
+        """Arrêter le pool de processus"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _load_local(self, capteur_data):
+        """Charger un capteur dans le processus principal"""
+        try:
+            return self.data_loader.load_capteur_data(capteur_data)
+        except Exception as e:
+            return e
+
+    def _get_executor(self):
+        """Pool de processus, créé au premier besoin puis réutilisé"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
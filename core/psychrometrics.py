@@ -0,0 +1,33 @@
+"""
+Module Psychrometrics - Grandeurs dérivées de la température et de l'humidité relative
+"""
+import numpy as np
+
+# Coefficients de Magnus au-dessus de l'eau (Sonntag 1990), valables de -45 °C à 60 °C
+MAGNUS_A = 17.62
+MAGNUS_B = 243.12
+
+
+def dew_point(temperature, humidity):
+    """
+    Calculer le point de rosée par la formule de Magnus-Tetens
+
+    Le calcul est vectorisé et fait en float32 : Td = b·γ / (a − γ), avec
+    γ = ln(HR/100) + a·T / (b + T). Une humidité nulle, négative ou manquante donne
+    NaN ; une humidité supérieure à 100 % est ramenée à 100 %.
+
+    Args:
+        temperature (numpy.ndarray): Températures (°C)
+        humidity (numpy.ndarray): Humidités relatives (%)
+
+    Returns:
+        numpy.ndarray: Points de rosée (°C) en float32
+    """
+    temperature = np.asarray(temperature, dtype=np.float32)
+    humidity = np.asarray(humidity, dtype=np.float32)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative = np.minimum(humidity, np.float32(100)) / np.float32(100)
+        relative = np.where(relative > 0, relative, np.float32(np.nan))
+        gamma = np.log(relative) + np.float32(MAGNUS_A) * temperature / (np.float32(MAGNUS_B) + temperature)
+        return (np.float32(MAGNUS_B) * gamma / (np.float32(MAGNUS_A) - gamma)).astype(np.float32, copy=False)
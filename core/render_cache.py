@@ -0,0 +1,313 @@
+"""
+Module RenderCache - Cache des graphiques déjà générés (mémoire et disque)
+"""
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Version du format des graphiques (à incrémenter si le rendu change)
+RENDER_CACHE_VERSION = 2
+
+# Taille maximale des graphiques conservés en mémoire (octets)
+MEMORY_MAX_BYTES = 64 * 1024 * 1024
+
+# Taille maximale des graphiques conservés sur disque (octets)
+DISK_MAX_BYTES = 256 * 1024 * 1024
+
+# Index des capteurs de chaque graphique du cache disque (sans les images)
+INDEX_FILE = "capteurs.index"
+
+
+class RenderCache:
+    """
+    Classe pour conserver les résultats de generate_graph et les resservir à l'identique
+
+    La clé d'un graphique réunit son type, les capteurs (triés) avec l'empreinte de
+    leurs données (fichier : taille et date de modification ; mappage, nom et
+    position), la plage de dates et les options de rendu : tout changement de fichier
+    ou de mappage produit une autre clé. Les résultats récents sont gardés en mémoire
+    (LRU limité en octets) et, si un répertoire est fourni, sur disque (un fichier JSON
+    par graphique, les plus anciens supprimés au-delà de la limite). Un petit index
+    (clé → capteurs) permet d'oublier les graphiques d'un capteur sans relire les images.
+    """
+
+    def __init__(self, cache_dir=None, memory_max_bytes=MEMORY_MAX_BYTES, disk_max_bytes=DISK_MAX_BYTES):
+        """
+        Initialise le cache
+
+        Args:
+            cache_dir (str, optional): Répertoire du cache disque (sans : mémoire seule)
+            memory_max_bytes (int, optional): Taille maximale en mémoire
+            disk_max_bytes (int, optional): Taille maximale sur disque
+        """
+        self.cache_dir = cache_dir
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._index = None
+        self._index_lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def make_key(self, graph_type, capteurs, options=None):
+        """
+        Construire la clé d'un graphique
+
+        Args:
+            graph_type (str): Type de graphique
+            capteurs (dict): Données des capteurs par identifiant (fichier, mappage, nom...)
+            options (dict, optional): Options de rendu (plage de dates comprise)
+
+        Returns:
+            str: Clé du graphique
+        """
+        description = {
+            "version": RENDER_CACHE_VERSION,
+            "type": graph_type,
+            "capteurs": [
+                [capteur_id, self.fingerprint(capteurs[capteur_id])] for capteur_id in sorted(capteurs)
+            ],
+            "options": options or {},
+        }
+        encoded = json.dumps(description, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=20).hexdigest()
+
+    @staticmethod
+    def fingerprint(capteur_data):
+        """
+        Empreinte des données d'un capteur, sans lire le fichier
+
+        Args:
+            capteur_data (dict): Données du capteur
+
+        Returns:
+            list: Fichier (chemin, taille, date de modification), mappage, nom et position
+        """
+        file_path = capteur_data.get("file_path")
+        try:
+            stat = os.stat(file_path) if file_path else None
+        except OSError:
+            stat = None
+        return [
+            file_path,
+            [stat.st_size, stat.st_mtime_ns] if stat else None,
+            capteur_data.get("columns"),
+            capteur_data.get("nom"),
+            capteur_data.get("position"),
+        ]
+
+    def get(self, key):
+        """
+        Obtenir un graphique conservé
+
+        Args:
+            key (str): Clé du graphique
+
+        Returns:
+            dict: Résultat de generate_graph, ou None s'il n'est pas conservé
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry["result"]
+
+        entry = self._read_disk(key)
+        if entry is None:
+            return None
+        self._remember(key, entry)
+        return entry["result"]
+
+    def put(self, key, capteur_ids, result):
+        """
+        Conserver un graphique généré
+
+        Args:
+            key (str): Clé du graphique
+            capteur_ids (list): Capteurs du graphique (pour l'invalidation)
+            result (dict): Résultat de generate_graph
+        """
+        entry = {"capteurs": sorted(capteur_ids), "result": result}
+        encoded = json.dumps(entry, default=str)
+        entry["size"] = len(encoded)
+        self._remember(key, entry)
+        self._write_disk(key, entry["capteurs"], encoded)
+
+    def invalidate(self, capteur_id):
+        """
+        Oublier les graphiques d'un capteur (fichier, mappage ou capteur supprimé)
+
+        Args:
+            capteur_id (str): ID du capteur
+        """
+        with self._lock:
+            for key in [key for key, entry in self._memory.items() if capteur_id in entry["capteurs"]]:
+                self._memory_bytes -= self._memory.pop(key)["size"]
+
+        if not self.cache_dir:
+            return
+        with self._index_lock:
+            index = self._load_index()
+            keys = [key for key, capteurs in index.items() if capteur_id in capteurs]
+            for key in keys:
+                self._remove(self._disk_path(key))
+                del index[key]
+            if keys:
+                self._save_index()
+
+    def clear(self):
+        """Vider le cache (mémoire et disque)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        with self._index_lock:
+            for path in self._disk_files():
+                self._remove(path)
+            if self.cache_dir:
+                self._remove(os.path.join(self.cache_dir, INDEX_FILE))
+            self._index = {}
+
+    def _remember(self, key, entry):
+        """Garder une entrée en mémoire en évinçant les plus anciennes au-delà de la limite"""
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous["size"]
+            if entry["size"] > self.memory_max_bytes:
+                return
+            self._memory[key] = entry
+            self._memory_bytes += entry["size"]
+            while self._memory_bytes > self.memory_max_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted["size"]
+
+    def _read_disk(self, key):
+        """Lire une entrée du cache disque"""
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                encoded = f.read()
+            entry = json.loads(encoded)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Graphique en cache illisible ({key}): {e}")
+            self._remove(path)
+            return None
+        entry["size"] = len(encoded)
+        # Entrée récemment utilisée : conservée en priorité
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def _write_disk(self, key, capteurs, encoded):
+        """Écrire une entrée sur disque, l'indexer puis limiter la taille du cache"""
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(encoded)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Impossible d'enregistrer le graphique en cache: {e}")
+            self._remove(tmp_path)
+            return
+
+        with self._index_lock:
+            index = self._load_index()
+            index[key] = capteurs
+            files = []
+            for file_path in self._disk_files():
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime_ns, stat.st_size, file_path))
+            total = sum(size for _, size, _ in files)
+            for _, size, file_path in sorted(files):
+                if total <= self.disk_max_bytes:
+                    break
+                self._remove(file_path)
+                index.pop(os.path.basename(file_path)[:-len(".json")], None)
+                total -= size
+            self._save_index()
+
+    def _load_index(self):
+        """
+        Index clé → capteurs du cache disque (appelé sous _index_lock)
+
+        L'index est lu une fois depuis son fichier puis tenu à jour en mémoire. Il est
+        rapproché des fichiers présents : les entrées sans fichier sont oubliées et
+        seuls les graphiques absents de l'index (écriture interrompue, ancien cache)
+        sont relus.
+        """
+        if self._index is not None:
+            return self._index
+
+        index = {}
+        path = os.path.join(self.cache_dir, INDEX_FILE)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Index du cache des graphiques illisible, reconstruit: {e}")
+        if not isinstance(index, dict):
+            index = {}
+
+        present = {os.path.basename(file_path)[:-len(".json")]: file_path for file_path in self._disk_files()}
+        self._index = {key: capteurs for key, capteurs in index.items() if key in present}
+        missing = [key for key in present if key not in self._index]
+        for key in missing:
+            try:
+                with open(present[key], "r", encoding="utf-8") as f:
+                    self._index[key] = json.load(f).get("capteurs", [])
+            except (OSError, ValueError):
+                self._remove(present[key])
+        if missing or len(self._index) != len(index):
+            self._save_index()
+        return self._index
+
+    def _save_index(self):
+        """Écrire l'index sur disque (appelé sous _index_lock)"""
+        path = os.path.join(self.cache_dir, INDEX_FILE)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Impossible d'enregistrer l'index du cache des graphiques: {e}")
+            self._remove(tmp_path)
+
+    def _disk_files(self):
+        """Fichiers du cache disque"""
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return []
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+
+    def _disk_path(self, key):
+        """Chemin du fichier d'une entrée"""
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    @staticmethod
+    def _remove(path):
+        """Supprimer un fichier sans erreur s'il n'existe plus"""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,146 @@
+"""
+Module GridResampler - Alignement des séries de capteurs sur une grille de temps commune
+"""
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core.daily_aggregates import series_key
+from core.sensor_series import as_series
+
+logger = logging.getLogger(__name__)
+
+# Nombre de séries alignées conservées en mémoire
+MEMO_SIZE = 32
+
+
+class GridResampler:
+    """
+    Classe pour rééchantillonner les séries des capteurs sur une grille commune
+
+    La grille est ancrée sur l'epoch : deux capteurs alignés au même pas partagent
+    exactement les mêmes instants. La valeur en un point de la grille est la moyenne
+    pondérée par le temps du signal (interpolé linéairement entre les mesures) sur la
+    période centrée sur ce point, calculée à partir de l'intégrale cumulée des mesures :
+    exacte pour un échantillonnage irrégulier, qu'il soit plus fin ou plus grossier que
+    la grille. Les résultats sont conservés par capteur, série et pas.
+    """
+
+    def __init__(self, memo_size=MEMO_SIZE):
+        """
+        Initialise le rééchantillonneur
+
+        Args:
+            memo_size (int, optional): Nombre de séries alignées conservées en mémoire
+        """
+        self.memo_size = memo_size
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    def align(self, capteur_id, series, step):
+        """
+        Aligner la série d'un capteur sur la grille commune
+
+        Args:
+            capteur_id (str): ID du capteur
+            series (SensorSeries or pandas.DataFrame): Série triée
+            step (pandas.Timedelta): Pas de la grille
+
+        Returns:
+            SensorSeries: Série alignée (dates aux points de la grille couverts par la
+            série, voies en float32)
+        """
+        series = as_series(series)
+        step_ns = int(pd.Timedelta(step).value)
+        key = (series_key(capteur_id, series), step_ns)
+        with self._lock:
+            aligned = self._memo.get(key)
+            if aligned is not None:
+                self._memo.move_to_end(key)
+                return aligned
+
+        aligned = self.resample(series, step_ns)
+        with self._lock:
+            self._memo[key] = aligned
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return aligned
+
+    def clear(self):
+        """Vider les séries conservées"""
+        with self._lock:
+            self._memo.clear()
+
+    @staticmethod
+    def resample(series, step_ns):
+        """
+        Rééchantillonner une série au pas donné
+
+        Args:
+            series (SensorSeries): Série triée
+            step_ns (int): Pas de la grille en nanosecondes
+
+        Returns:
+            SensorSeries: Série alignée sur la grille
+        """
+        dates = series.dates
+        channels = list(series.channels)
+        empty = {col: np.empty(0, dtype=np.float32) for col in channels}
+        if len(dates) == 0 or step_ns <= 0:
+            return series.replace_data(np.empty(0, dtype=np.int64), empty)
+
+        # Points de la grille couverts par la série
+        first = -(-dates[0] // step_ns) * step_ns
+        grid = np.arange(first, dates[-1] + 1, step_ns, dtype=np.int64)
+        if len(grid) == 0:
+            return series.replace_data(grid, empty)
+        data = {}
+
+        # Temps en secondes depuis la première mesure (précision des intégrales)
+        origin = dates[0]
+        times = (dates - origin) / 1e9
+        half = step_ns / 2e9
+        grid_times = (grid - origin) / 1e9
+
+        for col in channels:
+            values = series.channels[col].astype(np.float64)
+            valid = ~np.isnan(values)
+            if valid.sum() == 0:
+                data[col] = np.full(len(grid), np.nan, dtype=np.float32)
+                continue
+            data[col] = GridResampler._window_means(
+                times[valid], values[valid], grid_times - half, grid_times + half
+            ).astype(np.float32)
+        return series.replace_data(grid, data)
+
+    @staticmethod
+    def _window_means(times, values, lo, hi):
+        """Moyenne pondérée par le temps du signal linéaire par morceaux sur chaque fenêtre"""
+        # Fenêtres limitées à la partie couverte par les mesures
+        lo = np.clip(lo, times[0], times[-1])
+        hi = np.clip(hi, times[0], times[-1])
+        if len(times) == 1:
+            return np.full(len(lo), values[0])
+
+        # Intégrale cumulée (trapèzes) aux instants de mesure
+        widths = np.diff(times)
+        cumulative = np.concatenate(([0.0], np.cumsum((values[1:] + values[:-1]) / 2 * widths)))
+
+        def integral(x):
+            # Intégrale exacte jusqu'à x : segments complets puis fraction du segment courant
+            i = np.clip(np.searchsorted(times, x, side="right") - 1, 0, len(times) - 2)
+            dx = x - times[i]
+            slope = (values[i + 1] - values[i]) / widths[i]
+            return cumulative[i] + values[i] * dx + slope * dx * dx / 2
+
+        span = hi - lo
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = (integral(hi) - integral(lo)) / span
+        # Fenêtre réduite à un instant : valeur interpolée
+        point = span <= 0
+        if point.any():
+            means[point] = np.interp(lo[point], times, values)
+        return means
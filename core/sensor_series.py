@@ -0,0 +1,177 @@
+"""
+Module SensorSeries - Série de mesures d'un capteur partagée sans copie du chargement au rendu
+"""
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+class SensorSeries:
+    """
+    Classe pour porter la série d'un capteur jusqu'aux graphiques
+
+    Les dates sont des nanosecondes epoch (int64) et chaque voie un tableau float32 ;
+    tous sont en lecture seule et généralement des vues des colonnes projetées en
+    mémoire par le cache. Une plage de dates est une vue des mêmes tableaux. Les
+    grandeurs dérivées (écart au point de rosée) sont calculées au premier accès puis
+    partagées par l'agrégateur, le détecteur d'épisodes et les graphiques.
+    """
+
+    __slots__ = ("capteur_id", "nom", "dates", "channels", "position", "daily", "_derived", "_frame")
+
+    def __init__(self, capteur_id, nom, dates, channels, position=None, daily=None):
+        """
+        Initialise la série
+
+        Args:
+            capteur_id (str): ID du capteur
+            nom (str): Nom du capteur
+            dates (numpy.ndarray): Dates triées en nanosecondes epoch (int64)
+            channels (dict): Valeurs par voie (float32, même longueur que les dates)
+            position (dict, optional): Position du capteur ({"x", "y"})
+            daily (pandas.DataFrame, optional): Agrégats journaliers déjà connus
+        """
+        self.capteur_id = capteur_id
+        self.nom = nom
+        self.dates = self._read_only(np.asarray(dates, dtype=np.int64))
+        self.channels = {
+            name: self._read_only(np.asarray(values, dtype=np.float32))
+            for name, values in channels.items()
+        }
+        self.position = position
+        self.daily = daily
+        self._derived = {}
+        self._frame = None
+
+    @classmethod
+    def from_frame(cls, capteur_id, nom, df, position=None):
+        """
+        Construire la série à partir d'un DataFrame préparé (sans copie si les colonnes
+        sont déjà typées)
+
+        Args:
+            capteur_id (str): ID du capteur
+            nom (str): Nom du capteur
+            df (pandas.DataFrame): Série ('date' et voies)
+            position (dict, optional): Position du capteur
+
+        Returns:
+            SensorSeries: Série du capteur
+        """
+        dates = df["date"]
+        if not pd.api.types.is_datetime64_dtype(dates):
+            dates = pd.to_datetime(dates)
+        channels = {}
+        for name in df.columns:
+            if name == "date":
+                continue
+            column = df[name]
+            if column.dtype != np.float32:
+                column = pd.to_numeric(column, errors="coerce")
+            channels[name] = column.to_numpy(dtype=np.float32)
+        return cls(capteur_id, nom, dates.to_numpy(dtype="datetime64[ns]").view(np.int64), channels, position)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __contains__(self, name):
+        return name == "date" or name in self.channels or (name == "ecart" and self._has_gap())
+
+    @property
+    def columns(self):
+        """list: Colonnes de la série ('date' puis les voies mesurées)"""
+        return ["date", *self.channels]
+
+    @property
+    def date(self):
+        """numpy.ndarray: Dates en datetime64[ns] (vue)"""
+        return self.dates.view("datetime64[ns]")
+
+    @property
+    def data(self):
+        """pandas.DataFrame: Vue de la série en DataFrame (sans copie, en lecture seule)"""
+        if self._frame is None:
+            self._frame = pd.DataFrame({"date": self.date, **self.channels}, copy=False)
+        return self._frame
+
+    def channel(self, name):
+        """
+        Obtenir une voie mesurée ou dérivée
+
+        Args:
+            name (str): Nom de la voie ('ecart' : température - point de rosée)
+
+        Returns:
+            numpy.ndarray: Valeurs en float32 (lecture seule)
+
+        Raises:
+            KeyError: Si la voie n'existe pas
+        """
+        if name in self.channels:
+            return self.channels[name]
+        if name == "ecart" and self._has_gap():
+            gap = self._derived.get(name)
+            if gap is None:
+                gap = self._read_only(self.channels["temperature"] - self.channels["dew_point"])
+                self._derived[name] = gap
+            return gap
+        raise KeyError(name)
+
+    def slice(self, lo, hi):
+        """
+        Extraire une plage de lignes
+
+        Args:
+            lo (int): Première ligne
+            hi (int): Ligne suivant la dernière
+
+        Returns:
+            SensorSeries: Série réduite à la plage (vues des mêmes tableaux)
+        """
+        part = SensorSeries(
+            self.capteur_id, self.nom, self.dates[lo:hi],
+            {name: values[lo:hi] for name, values in self.channels.items()},
+            self.position,
+        )
+        part._derived = {name: values[lo:hi] for name, values in self._derived.items()}
+        return part
+
+    def replace_data(self, dates, channels):
+        """
+        Obtenir la même série de capteur avec d'autres mesures (série alignée, par exemple)
+
+        Args:
+            dates (numpy.ndarray): Dates en nanosecondes epoch (int64)
+            channels (dict): Valeurs par voie
+
+        Returns:
+            SensorSeries: Nouvelle série (nom, position et agrégats journaliers conservés)
+        """
+        return SensorSeries(self.capteur_id, self.nom, dates, channels, self.position, self.daily)
+
+    def _has_gap(self):
+        """Indique si l'écart au point de rosée peut être calculé"""
+        return "temperature" in self.channels and "dew_point" in self.channels
+
+    @staticmethod
+    def _read_only(values):
+        """Vue en lecture seule (le tableau d'origine n'est pas modifié)"""
+        view = values.view()
+        view.flags.writeable = False
+        return view
+
+
+def as_series(data):
+    """
+    Vue SensorSeries d'un DataFrame de capteur (sans copie si les colonnes sont typées)
+
+    Args:
+        data (SensorSeries or pandas.DataFrame): Données du capteur
+
+    Returns:
+        SensorSeries: Série du capteur
+    """
+    if isinstance(data, SensorSeries):
+        return data
+    return SensorSeries.from_frame(None, None, data)
@@ -0,0 +1,471 @@
+"""
+Module SeriesStore - Séries persistantes par enregistreur, complétées au fil des exports
+"""
+import os
+import re
+import json
+import shutil
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Version du format de stockage (à incrémenter si la structure change)
+STORE_VERSION = 4
+
+# Niveaux d'agrégation conservés, du plus fin au plus grossier
+ROLLUP_LEVELS = ("hour", "day", "week", "month")
+
+# Statistiques conservées pour chaque voie et chaque niveau
+ROLLUP_STATS = ("count", "sum", "min", "max")
+
+NS_PER_HOUR = 3600 * 10**9
+NS_PER_DAY = 86400 * 10**9
+
+# Durée approximative d'une période de chaque niveau (choix du niveau)
+LEVEL_SPANS = {
+    "hour": NS_PER_HOUR,
+    "day": NS_PER_DAY,
+    "week": 7 * NS_PER_DAY,
+    "month": 30.44 * NS_PER_DAY,
+}
+
+# Le 5 janvier 1970 est un lundi : les semaines commencent le lundi
+WEEK_ORIGIN_DAYS = 4
+
+
+class SeriesStore:
+    """
+    Classe pour conserver la série de chaque enregistreur et l'étendre avec les nouveaux exports
+
+    Chaque enregistreur (identifié par son numéro de série) possède un dossier contenant
+    meta.json et un fichier binaire brut par colonne (dates en int64, voies en float32),
+    ouverts en ajout : compléter la série n'écrit que les nouvelles lignes. Les agrégats
+    par heure, jour, semaine et mois (nombre, somme, minimum, maximum par voie, écart
+    au point de rosée compris) sont conservés de la même façon et seules les périodes
+    touchées par un ajout sont recalculées.
+    """
+
+    def __init__(self, store_dir):
+        """
+        Initialise le stockage
+
+        Args:
+            store_dir (str): Répertoire des séries
+        """
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+
+    def get_meta(self, key):
+        """
+        Lire les métadonnées de la série d'un enregistreur
+
+        Args:
+            key (str): Numéro de série de l'enregistreur
+
+        Returns:
+            dict: Voies, nombre de lignes, première et dernière date, fichier source,
+            ou None si aucune série n'est conservée
+        """
+        meta_file = os.path.join(self._entry_dir(key), "meta.json")
+        if not os.path.exists(meta_file):
+            return None
+        try:
+            with open(meta_file, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            self.delete(key)
+            return None
+        if meta.get("version") != STORE_VERSION:
+            self.delete(key)
+            return None
+        return meta
+
+    def load(self, key):
+        """
+        Charger la série d'un enregistreur
+
+        Args:
+            key (str): Numéro de série de l'enregistreur
+
+        Returns:
+            pandas.DataFrame: Série conservée, ou None si absente
+        """
+        meta = self.get_meta(key)
+        if not meta:
+            return None
+        entry_dir = self._entry_dir(key)
+        rows = meta["rows"]
+        data = {}
+        try:
+            for name in meta["channels"]:
+                dtype = np.int64 if name == "date" else np.float32
+                values = self._read(os.path.join(entry_dir, f"{name}.bin"), dtype, 0, rows)
+                data[name] = values.view("datetime64[ns]") if name == "date" else values
+        except (OSError, ValueError) as e:
+            logger.warning(f"Série conservée illisible pour {key}: {e}")
+            self.delete(key)
+            return None
+        return pd.DataFrame(data, copy=False)
+
+    def load_rollup(self, key, level, start=None, end=None):
+        """
+        Charger les agrégats d'un enregistreur à un niveau donné
+
+        Les périodes entièrement comprises dans la plage sont lues telles quelles ;
+        celles coupées par une borne sont recalculées à partir des seules mesures de
+        la plage, de sorte que le résultat est identique à une agrégation des mesures
+        filtrées.
+
+        Args:
+            key (str): Numéro de série de l'enregistreur
+            level (str): Niveau d'agrégation ('hour', 'day', 'week' ou 'month')
+            start (pandas.Timestamp, optional): Première date incluse
+            end (pandas.Timestamp, optional): Dernière date incluse
+
+        Returns:
+            pandas.DataFrame: Une ligne par période ('date' puis, par voie, count, sum,
+            min, max et mean), ou None si absente
+
+        Raises:
+            ValueError: Si le niveau n'existe pas
+        """
+        if level not in ROLLUP_LEVELS:
+            raise ValueError(f"Niveau d'agrégation inconnu: {level}")
+        meta = self.get_meta(key)
+        if not meta:
+            return None
+        entry_dir = self._entry_dir(key)
+        count = meta["rollups"][level]
+        start_ns = pd.Timestamp(start).value if start is not None else None
+        end_ns = pd.Timestamp(end).value if end is not None else None
+
+        try:
+            periods = self._read(self._rollup_file(entry_dir, level, "date"), np.int64, 0, count)
+            # Périodes qui recouvrent la plage
+            lo = 0 if start_ns is None else int(np.searchsorted(periods, self.period_floor(np.array([start_ns]), level)[0]))
+            hi = count if end_ns is None else int(np.searchsorted(periods, end_ns, side="right"))
+            periods = periods[lo:hi]
+            data = {"date": periods}
+            for name in meta["rollup_channels"]:
+                for stat in ROLLUP_STATS:
+                    data[f"{name}_{stat}"] = self._read(self._rollup_file(entry_dir, level, f"{name}_{stat}"), np.float64, lo, hi - lo)
+
+            # Périodes coupées par une borne : recalculées sur les mesures de la plage
+            partial = np.zeros(len(periods), dtype=bool)
+            if len(periods) and start_ns is not None:
+                partial[0] |= periods[0] < start_ns
+            if len(periods) and end_ns is not None:
+                partial[-1] |= self.period_end(periods[-1:], level)[0] - 1 > end_ns
+            keep = np.ones(len(periods), dtype=bool)
+            for index in np.flatnonzero(partial):
+                first = max(int(periods[index]), start_ns if start_ns is not None else int(periods[index]))
+                last = int(self.period_end(periods[index:index + 1], level)[0]) - 1
+                if end_ns is not None:
+                    last = min(last, end_ns)
+                stats = self._reduce_range(entry_dir, meta, first, last)
+                if stats is None:
+                    keep[index] = False
+                    continue
+                for name, values in stats.items():
+                    data[name][index] = values
+        except (OSError, ValueError) as e:
+            logger.warning(f"Agrégats illisibles pour {key}: {e}")
+            self.delete(key)
+            return None
+
+        df = pd.DataFrame(data)[keep].reset_index(drop=True)
+        df["date"] = df["date"].to_numpy().view("datetime64[ns]")
+        for name in meta["rollup_channels"]:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                df[f"{name}_mean"] = df[f"{name}_sum"] / df[f"{name}_count"]
+        return df
+
+    def load_daily(self, key, start=None, end=None):
+        """
+        Charger les agrégats journaliers d'un enregistreur
+
+        Args:
+            key (str): Numéro de série de l'enregistreur
+            start (pandas.Timestamp, optional): Première date incluse
+            end (pandas.Timestamp, optional): Dernière date incluse
+
+        Returns:
+            pandas.DataFrame: Une ligne par jour, ou None si absente
+        """
+        return self.load_rollup(key, "day", start, end)
+
+    @staticmethod
+    def choose_level(start, end, max_points):
+        """
+        Choisir le niveau le plus fin dont le nombre de périodes sur la plage ne dépasse pas max_points
+
+        Args:
+            start (pandas.Timestamp): Début de la plage
+            end (pandas.Timestamp): Fin de la plage
+            max_points (int): Nombre maximal de points souhaités
+
+        Returns:
+            str: Niveau d'agrégation (le plus grossier si aucun ne convient)
+        """
+        span = pd.Timestamp(end).value - pd.Timestamp(start).value
+        for level in ROLLUP_LEVELS:
+            if span / LEVEL_SPANS[level] <= max_points:
+                return level
+        return ROLLUP_LEVELS[-1]
+
+    @staticmethod
+    def period_floor(values, level):
+        """
+        Début de la période contenant chaque date
+
+        Args:
+            values (numpy.ndarray): Dates en nanosecondes (int64)
+            level (str): Niveau d'agrégation
+
+        Returns:
+            numpy.ndarray: Débuts de période en nanosecondes (int64)
+        """
+        if level == "hour":
+            return values // NS_PER_HOUR * NS_PER_HOUR
+        if level == "day":
+            return values // NS_PER_DAY * NS_PER_DAY
+        if level == "week":
+            days = values // NS_PER_DAY
+            return ((days - WEEK_ORIGIN_DAYS) // 7 * 7 + WEEK_ORIGIN_DAYS) * NS_PER_DAY
+        months = values.view("datetime64[ns]").astype("datetime64[M]")
+        return months.astype("datetime64[ns]").view(np.int64)
+
+    @staticmethod
+    def period_end(periods, level):
+        """
+        Fin (exclue) de chaque période
+
+        Args:
+            periods (numpy.ndarray): Débuts de période en nanosecondes (int64)
+            level (str): Niveau d'agrégation
+
+        Returns:
+            numpy.ndarray: Fins de période en nanosecondes (int64)
+        """
+        if level == "month":
+            months = periods.view("datetime64[ns]").astype("datetime64[M]") + 1
+            return months.astype("datetime64[ns]").view(np.int64)
+        return periods + int(LEVEL_SPANS[level])
+
+    def replace(self, key, df, source):
+        """
+        Remplacer la série d'un enregistreur
+
+        Args:
+            key (str): Numéro de série de l'enregistreur
+            df (pandas.DataFrame): Série préparée (colonne 'date' triée et voies)
+            source (dict): Fichier source (chemin, taille, date de modification, lignes lues)
+        """
+        self.delete(key)
+        entry_dir = self._entry_dir(key)
+        os.makedirs(entry_dir, exist_ok=True)
+
+        meta = {
+            "version": STORE_VERSION,
+            "key": key,
+            "channels": list(df.columns),
+            "rollup_channels": self._rollup_channels(list(df.columns)),
+            "rows": 0,
+            "rollups": {level: 0 for level in ROLLUP_LEVELS},
+            "first_date": None,
+            "last_date": None,
+        }
+        self._append_rows(entry_dir, meta, df)
+        self._rebuild_rollups_from(entry_dir, meta, None)
+        meta["source"] = source
+        self._write_meta(entry_dir, meta)
+        logger.info(f"Série conservée pour l'enregistreur {key}: {meta['rows']} lignes")
+
+    def append(self, key, tail, source):
+        """
+        Ajouter à la série d'un enregistreur les lignes postérieures à sa dernière date
+
+        Args:
+            key (str): Numéro de série de l'enregistreur
+            tail (pandas.DataFrame): Fin de série préparée (mêmes colonnes, triée)
+            source (dict): Nouveau fichier source
+
+        Returns:
+            int: Nombre de lignes ajoutées
+        """
+        meta = self.get_meta(key)
+        entry_dir = self._entry_dir(key)
+
+        # Le recouvrement avec la série conservée est écarté par date
+        last_date = pd.Timestamp(meta["last_date"])
+        new_rows = tail[tail["date"] > last_date]
+        if not new_rows.empty:
+            first_date = new_rows["date"].iloc[0].value
+            self._append_rows(entry_dir, meta, new_rows[meta["channels"]])
+            self._rebuild_rollups_from(entry_dir, meta, first_date)
+
+        meta["source"] = source
+        self._write_meta(entry_dir, meta)
+        logger.info(f"Série de l'enregistreur {key} complétée: {len(new_rows)} nouvelles lignes")
+        return len(new_rows)
+
+    def delete(self, key):
+        """
+        Supprimer la série d'un enregistreur
+
+        Args:
+            key (str): Numéro de série de l'enregistreur
+        """
+        shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+    def _append_rows(self, entry_dir, meta, df):
+        """Écrire des lignes à la fin des fichiers de colonnes"""
+        if df.empty:
+            return
+        for name in meta["channels"]:
+            if name == "date":
+                values = df["date"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+            else:
+                values = df[name].to_numpy(dtype=np.float32)
+            # Écriture après la dernière ligne validée par meta.json (écarte un ajout interrompu)
+            self._write_at(os.path.join(entry_dir, f"{name}.bin"), meta["rows"] * values.itemsize, values)
+
+        meta["rows"] += len(df)
+        if meta["first_date"] is None:
+            meta["first_date"] = df["date"].iloc[0].isoformat()
+        meta["last_date"] = df["date"].iloc[-1].isoformat()
+
+    def _rebuild_rollups_from(self, entry_dir, meta, first_date):
+        """Recalculer les agrégats de chaque niveau à partir d'une date (tous si None)"""
+        rows = meta["rows"]
+        date_file = os.path.join(entry_dir, "date.bin")
+
+        # Lignes et périodes concernées : recherche dichotomique, seule la fin est relue
+        bounds = {}
+        for level in ROLLUP_LEVELS:
+            if first_date is None:
+                bounds[level] = (0, 0)
+            else:
+                floor = int(self.period_floor(np.array([first_date], dtype=np.int64), level)[0])
+                kept = self._search(self._rollup_file(entry_dir, level, "date"), meta["rollups"][level], floor)
+                bounds[level] = (self._search(date_file, rows, floor), kept)
+
+        first_row = min(start_row for start_row, _ in bounds.values())
+        dates = self._read(date_file, np.int64, first_row, rows - first_row)
+        channels = self._read_channels(entry_dir, meta, first_row, rows - first_row)
+
+        for level, (start_row, kept) in bounds.items():
+            offset = start_row - first_row
+            periods = self.period_floor(dates[offset:], level)
+            period_values, starts = np.unique(periods, return_index=True)
+
+            files = {"date": period_values.astype(np.int64)}
+            for name, values in channels.items():
+                stats = self._reduce_segments(values[offset:], starts)
+                for stat in ROLLUP_STATS:
+                    files[f"{name}_{stat}"] = stats[stat]
+
+            for name, values in files.items():
+                self._write_at(self._rollup_file(entry_dir, level, name), kept * values.itemsize, values)
+            meta["rollups"][level] = kept + len(period_values)
+
+    def _reduce_range(self, entry_dir, meta, first, last):
+        """Statistiques des mesures comprises entre deux dates (incluses), ou None si aucune"""
+        date_file = os.path.join(entry_dir, "date.bin")
+        start_row = self._search(date_file, meta["rows"], first)
+        stop_row = self._search(date_file, meta["rows"], last + 1)
+        if stop_row <= start_row:
+            return None
+        channels = self._read_channels(entry_dir, meta, start_row, stop_row - start_row)
+        stats = {}
+        for name, values in channels.items():
+            reduced = self._reduce_segments(values, np.array([0]))
+            for stat in ROLLUP_STATS:
+                stats[f"{name}_{stat}"] = reduced[stat][0]
+        return stats
+
+    def _read_channels(self, entry_dir, meta, start, count):
+        """Lire une plage des voies en float64, écart au point de rosée compris"""
+        channels = {}
+        for name in self._value_channels(meta):
+            values = self._read(os.path.join(entry_dir, f"{name}.bin"), np.float32, start, count)
+            channels[name] = values.astype(np.float64)
+        if "ecart" in meta["rollup_channels"]:
+            channels["ecart"] = channels["temperature"] - channels["dew_point"]
+        return channels
+
+    @staticmethod
+    def _reduce_segments(values, starts):
+        """Nombre, somme, minimum et maximum des valeurs renseignées par segment"""
+        if len(starts) == 0:
+            return {stat: np.empty(0, dtype=np.float64) for stat in ROLLUP_STATS}
+        valid = ~np.isnan(values)
+        count = np.add.reduceat(valid.astype(np.float64), starts)
+        total = np.add.reduceat(np.where(valid, values, 0.0), starts)
+        minimum = np.minimum.reduceat(np.where(valid, values, np.inf), starts)
+        maximum = np.maximum.reduceat(np.where(valid, values, -np.inf), starts)
+        empty = count == 0
+        minimum[empty] = np.nan
+        maximum[empty] = np.nan
+        return {"count": count, "sum": total, "min": minimum, "max": maximum}
+
+    def _write_meta(self, entry_dir, meta):
+        """Écrire les métadonnées de façon atomique"""
+        meta_file = os.path.join(entry_dir, "meta.json")
+        tmp_file = meta_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_file, meta_file)
+
+    def _entry_dir(self, key):
+        """Dossier de la série d'un enregistreur"""
+        safe_key = re.sub(r"[^0-9A-Za-z_.-]", "_", str(key))
+        return os.path.join(self.store_dir, safe_key)
+
+    @staticmethod
+    def _rollup_file(entry_dir, level, name):
+        """Fichier d'une colonne d'agrégats"""
+        return os.path.join(entry_dir, f"rollup_{level}_{name}.bin")
+
+    @staticmethod
+    def _rollup_channels(channels):
+        """Voies agrégées : mesures et écart au point de rosée si disponible"""
+        names = [name for name in channels if name != "date"]
+        if "temperature" in names and "dew_point" in names:
+            names.append("ecart")
+        return names
+
+    @staticmethod
+    def _value_channels(meta):
+        """Voies de mesure (hors date)"""
+        return [name for name in meta["channels"] if name != "date"]
+
+    @staticmethod
+    def _read(path, dtype, start, count):
+        """Lire une plage de valeurs d'un fichier binaire"""
+        if count <= 0:
+            return np.empty(0, dtype=dtype)
+        itemsize = np.dtype(dtype).itemsize
+        return np.fromfile(path, dtype=dtype, count=count, offset=start * itemsize)
+
+    @staticmethod
+    def _search(path, length, value):
+        """Position d'insertion d'une valeur dans un fichier d'int64 triés"""
+        if length == 0:
+            return 0
+        values = np.memmap(path, dtype=np.int64, mode="r", shape=(length,))
+        try:
+            return int(np.searchsorted(values, value, side="left"))
+        finally:
+            # Libérer la projection avant toute réécriture du fichier (Windows)
+            del values
+
+    @staticmethod
+    def _write_at(path, offset, values):
+        """Écrire des valeurs à une position d'un fichier binaire, en coupant la suite"""
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            f.truncate(offset)
+            f.seek(offset)
+            f.write(np.ascontiguousarray(values).tobytes())
@@ -0,0 +1,239 @@
+"""
+Module SpatialInterpolator - Cartographie hygrométrique par interpolation entre les positions des capteurs
+"""
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Méthodes d'interpolation disponibles
+METHODS = ("idw", "kriging")
+
+# Puissance de la pondération par l'inverse de la distance
+IDW_POWER = 2.0
+
+# Modèles de variogramme pour le krigeage ordinaire (palier 1, sans pépite : les poids
+# ne dépendent que de la forme du modèle et de sa portée)
+VARIOGRAM_MODELS = ("spherical", "exponential", "gaussian", "linear")
+
+# Nombre de points de la grille sur la plus grande dimension
+GRID_RESOLUTION = 80
+
+# Marge autour des capteurs quand l'emprise n'est pas donnée (fraction de l'étendue)
+EXTENT_MARGIN = 0.1
+
+# Nombre de géométries et de jeux de poids conservés en mémoire
+MEMO_SIZE = 64
+
+
+class SpatialInterpolator:
+    """
+    Classe pour interpoler des mesures ponctuelles sur une grille (IDW ou krigeage ordinaire)
+
+    La géométrie d'une carte (points de la grille, distances grille-capteurs et
+    capteurs-capteurs) est calculée une fois par jeu de positions et d'emprise. Les
+    poids d'interpolation en découlent pour chaque combinaison de capteurs renseignés
+    (une seule résolution du système de krigeage) et sont conservés : une saison de
+    cartes se calcule alors en un produit matriciel par combinaison (pas de temps × capteurs
+    par capteurs × points de la grille).
+    """
+
+    def __init__(self, memo_size=MEMO_SIZE):
+        """
+        Initialise l'interpolateur
+
+        Args:
+            memo_size (int, optional): Nombre de géométries et de jeux de poids conservés
+        """
+        self.memo_size = memo_size
+        self._geometries = OrderedDict()
+        self._weights = OrderedDict()
+        self._lock = threading.Lock()
+
+    def interpolate(self, positions, values, method="idw", extent=None, resolution=GRID_RESOLUTION,
+                    power=IDW_POWER, model="spherical", variogram_range=None):
+        """
+        Interpoler une série de mesures simultanées sur la grille
+
+        Args:
+            positions (numpy.ndarray): Positions des capteurs (n × 2 : x, y)
+            values (numpy.ndarray): Mesures (pas de temps × n ; NaN : capteur non renseigné)
+            method (str, optional): 'idw' ou 'kriging'
+            extent (tuple, optional): Emprise (xmin, xmax, ymin, ymax). Par défaut: celle
+                des capteurs avec une marge
+            resolution (int, optional): Nombre de points sur la plus grande dimension
+            power (float, optional): Puissance de la pondération IDW
+            model (str, optional): Modèle de variogramme du krigeage
+            variogram_range (float, optional): Portée du variogramme. Par défaut: la plus
+                grande distance entre deux capteurs
+
+        Returns:
+            dict: Grille et cartes ({"x": numpy.ndarray, "y": numpy.ndarray, "extent": tuple,
+            "maps": numpy.ndarray pas de temps × ny × nx en float32})
+
+        Raises:
+            ValueError: Si la méthode, le modèle ou les dimensions sont invalides
+        """
+        if method not in METHODS:
+            raise ValueError(f"Méthode d'interpolation inconnue: {method}")
+        if method == "kriging" and model not in VARIOGRAM_MODELS:
+            raise ValueError(f"Modèle de variogramme inconnu: {model}")
+
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        if values.shape[1] != len(positions):
+            raise ValueError("Les mesures doivent avoir une colonne par capteur")
+
+        geometry = self.geometry(positions, extent, resolution)
+        if method == "kriging" and variogram_range is None:
+            variogram_range = float(geometry["sensor_distances"].max()) or 1.0
+        params = (power,) if method == "idw" else (model, float(variogram_range))
+
+        # Un produit matriciel par combinaison de capteurs renseignés
+        maps = np.full((len(values), geometry["grid"].shape[0]), np.nan)
+        valid = ~np.isnan(values)
+        patterns, groups = np.unique(valid, axis=0, return_inverse=True)
+        for index, pattern in enumerate(patterns):
+            if not pattern.any():
+                continue
+            rows = np.flatnonzero(groups.ravel() == index)
+            weights = self._pattern_weights(geometry, method, params, pattern)
+            maps[rows] = values[np.ix_(rows, np.flatnonzero(pattern))] @ weights
+
+        ny, nx = geometry["shape"]
+        return {
+            "x": geometry["x"],
+            "y": geometry["y"],
+            "extent": geometry["extent"],
+            "maps": maps.reshape(len(values), ny, nx).astype(np.float32),
+        }
+
+    def geometry(self, positions, extent=None, resolution=GRID_RESOLUTION):
+        """
+        Obtenir la grille et les matrices de distances d'un jeu de positions
+
+        Args:
+            positions (numpy.ndarray): Positions des capteurs (n × 2)
+            extent (tuple, optional): Emprise (xmin, xmax, ymin, ymax)
+            resolution (int, optional): Nombre de points sur la plus grande dimension
+
+        Returns:
+            dict: Grille (x, y, points, forme, emprise) et distances grille-capteurs et
+            capteurs-capteurs
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        extent = self._extent(positions) if extent is None else tuple(float(v) for v in extent)
+        key = (positions.tobytes(), extent, int(resolution))
+        with self._lock:
+            geometry = self._geometries.get(key)
+            if geometry is not None:
+                self._geometries.move_to_end(key)
+                return geometry
+
+        xmin, xmax, ymin, ymax = extent
+        if xmax <= xmin or ymax <= ymin or resolution < 2:
+            raise ValueError("Emprise ou résolution de la carte invalide")
+        scale = (resolution - 1) / max(xmax - xmin, ymax - ymin)
+        nx = max(2, int(round((xmax - xmin) * scale)) + 1)
+        ny = max(2, int(round((ymax - ymin) * scale)) + 1)
+        x = np.linspace(xmin, xmax, nx)
+        y = np.linspace(ymin, ymax, ny)
+        grid = np.column_stack([g.ravel() for g in np.meshgrid(x, y)])
+
+        geometry = {
+            "key": key,
+            "x": x,
+            "y": y,
+            "shape": (ny, nx),
+            "extent": extent,
+            "grid": grid,
+            "positions": positions,
+            "grid_distances": self._distances(positions, grid),
+            "sensor_distances": self._distances(positions, positions),
+        }
+        self._remember(self._geometries, key, geometry)
+        return geometry
+
+    def clear(self):
+        """Vider les géométries et les poids conservés"""
+        with self._lock:
+            self._geometries.clear()
+            self._weights.clear()
+
+    def _pattern_weights(self, geometry, method, params, pattern):
+        """Poids (capteurs renseignés × points de la grille) d'une combinaison de capteurs"""
+        key = (geometry["key"], method, params, pattern.tobytes())
+        with self._lock:
+            weights = self._weights.get(key)
+            if weights is not None:
+                self._weights.move_to_end(key)
+                return weights
+
+        sensors = np.flatnonzero(pattern)
+        to_grid = geometry["grid_distances"][sensors]
+        if method == "idw":
+            weights = self._idw_weights(to_grid, params[0])
+        else:
+            between = geometry["sensor_distances"][np.ix_(sensors, sensors)]
+            weights = self._kriging_weights(between, to_grid, *params)
+        self._remember(self._weights, key, weights)
+        return weights
+
+    @staticmethod
+    def _idw_weights(to_grid, power):
+        """Poids normalisés en 1/d^p ; un point confondu avec un capteur prend sa valeur"""
+        with np.errstate(divide="ignore"):
+            raw = 1.0 / to_grid ** power
+        exact = to_grid == 0
+        hit = exact.any(axis=0)
+        raw[:, hit] = exact[:, hit]
+        return raw / raw.sum(axis=0)
+
+    @staticmethod
+    def _kriging_weights(between, to_grid, model, variogram_range):
+        """Poids du krigeage ordinaire : une résolution pour tous les points de la grille"""
+        n = len(between)
+        system = np.ones((n + 1, n + 1))
+        system[:n, :n] = SpatialInterpolator._variogram(between, model, variogram_range)
+        system[n, n] = 0.0
+        rhs = np.ones((n + 1, to_grid.shape[1]))
+        rhs[:n] = SpatialInterpolator._variogram(to_grid, model, variogram_range)
+        solution = np.linalg.lstsq(system, rhs, rcond=None)[0]
+        return solution[:n]
+
+    @staticmethod
+    def _variogram(distances, model, variogram_range):
+        """Semi-variance normalisée (palier 1) en fonction de la distance"""
+        h = distances / variogram_range
+        if model == "spherical":
+            return np.where(h < 1, 1.5 * h - 0.5 * h ** 3, 1.0)
+        if model == "exponential":
+            return 1.0 - np.exp(-3.0 * h)
+        if model == "gaussian":
+            return 1.0 - np.exp(-3.0 * h ** 2)
+        return h
+
+    @staticmethod
+    def _distances(a, b):
+        """Distances euclidiennes entre deux ensembles de points (len(a) × len(b))"""
+        return np.hypot(a[:, None, 0] - b[None, :, 0], a[:, None, 1] - b[None, :, 1])
+
+    @staticmethod
+    def _extent(positions):
+        """Emprise des capteurs avec une marge"""
+        low = positions.min(axis=0)
+        high = positions.max(axis=0)
+        span = np.where(high - low > 0, high - low, 1.0)
+        margin = np.maximum(span * EXTENT_MARGIN, 1e-9)
+        return (float(low[0] - margin[0]), float(high[0] + margin[0]),
+                float(low[1] - margin[1]), float(high[1] + margin[1]))
+
+    def _remember(self, memo, key, value):
+        """Conserver une entrée en évinçant la plus ancienne au-delà de la limite"""
+        with self._lock:
+            memo[key] = value
+            while len(memo) > self.memo_size:
+                memo.popitem(last=False)
@@ -0,0 +1,105 @@
+"""
+Module TimeRangeIndex - Sélection de plages de dates dans les séries triées des capteurs
+"""
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class TimeRangeIndex:
+    """
+    Classe pour découper une série de capteur par plage de dates sans la parcourir
+
+    Les séries préparées par le chargeur sont triées par date : les bornes d'une plage
+    sont trouvées par recherche dichotomique sur les dates (dans leur unité d'origine) et la
+    plage est renvoyée comme une vue des colonnes, sans masque ni copie. Les première
+    et dernière dates sont lues directement aux extrémités.
+    """
+
+    def __init__(self, dates):
+        """
+        Initialise l'index
+
+        Args:
+            dates (numpy.ndarray): Dates triées (datetime64)
+        """
+        self.dates = np.asarray(dates)
+
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Construire l'index d'une série préparée (colonne 'date' triée)
+
+        Args:
+            df (pandas.DataFrame): Série du capteur
+
+        Returns:
+            TimeRangeIndex: Index sur les dates de la série (sans copie)
+        """
+        return cls(df["date"].to_numpy())
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def first(self):
+        """pandas.Timestamp: Première date, ou None si la série est vide"""
+        return pd.Timestamp(self.dates[0]) if len(self.dates) else None
+
+    @property
+    def last(self):
+        """pandas.Timestamp: Dernière date, ou None si la série est vide"""
+        return pd.Timestamp(self.dates[-1]) if len(self.dates) else None
+
+    def bounds(self, start=None, end=None):
+        """
+        Positions des lignes comprises entre deux dates (incluses)
+
+        Args:
+            start (pandas.Timestamp, optional): Première date incluse
+            end (pandas.Timestamp, optional): Dernière date incluse
+
+        Returns:
+            tuple: (première ligne, ligne suivant la dernière)
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.dates, self._to_unit(start), side="left"))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, self._to_unit(end), side="right"))
+        return lo, max(lo, hi)
+
+    def slice(self, df, start=None, end=None):
+        """
+        Extraire une plage de dates d'une série
+
+        Args:
+            df (pandas.DataFrame): Série indexée (mêmes lignes que l'index)
+            start (pandas.Timestamp, optional): Première date incluse
+            end (pandas.Timestamp, optional): Dernière date incluse
+
+        Returns:
+            pandas.DataFrame: Vue des lignes de la plage
+        """
+        lo, hi = self.bounds(start, end)
+        return df.iloc[lo:hi]
+
+    def median_step(self, lo=0, hi=None):
+        """
+        Intervalle médian entre deux mesures sur une plage de lignes
+
+        Args:
+            lo (int, optional): Première ligne
+            hi (int, optional): Ligne suivant la dernière
+
+        Returns:
+            pandas.Timedelta: Intervalle médian, ou None si moins de deux mesures
+        """
+        dates = self.dates[lo:hi]
+        if len(dates) < 2:
+            return None
+        unit = np.datetime_data(self.dates.dtype)[0]
+        return pd.Timedelta(int(np.median(np.diff(dates.view(np.int64)))), unit=unit)
+
+    def _to_unit(self, value):
+        """Convertir une date dans l'unité des dates indexées"""
+        return pd.Timestamp(value).to_datetime64().astype(self.dates.dtype)
@@ -0,0 +1,505 @@
+"""
+Module XlsxReader - Lecture en flux des classeurs Excel (.xlsx) des enregistreurs
+"""
+import re
+import logging
+import posixpath
+import zipfile
+import numpy as np
+import pandas as pd
+from xml.etree.ElementTree import fromstring, iterparse
+
+logger = logging.getLogger(__name__)
+
+# Nombre de lignes par bloc de tampons préalloués
+CHUNK_ROWS = 65536
+
+# Formats numériques prédéfinis d'Excel correspondant à des dates ou heures
+BUILTIN_DATE_FORMATS = set(range(14, 23)) | set(range(27, 37)) | set(range(45, 48)) | set(range(50, 59))
+
+# Origine des numéros de série Excel (calendrier 1900, avec le faux 29/02/1900)
+EXCEL_EPOCH = np.datetime64("1899-12-30", "ms")
+EXCEL_EPOCH_1904 = np.datetime64("1904-01-01", "ms")
+
+MS_PER_DAY = 86400000
+
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+COLUMN_PATTERN = re.compile(r"[A-Z]+")
+DATE_CODE_PATTERN = re.compile(r"[dmyhs]", re.IGNORECASE)
+QUOTED_PATTERN = re.compile(r'"[^"]*"|\[[^\]]*\]|\\.')
+
+# Balises repérées dans les octets de la feuille pour sauter des lignes sans les analyser
+SHEET_DATA_PATTERN = re.compile(rb"<((?:[\w.-]+:)?)sheetData(?:\s[^>]*?)?(/?)>")
+
+# Taille des blocs lus lors du saut de lignes (octets décompressés)
+SCAN_BYTES = 1024 * 1024
+
+
+class XlsxReader:
+    """
+    Classe pour lire la première feuille d'un classeur .xlsx sans modèle objet complet
+
+    Le XML de la feuille est parcouru en flux directement dans l'archive zip ; seules
+    les colonnes demandées sont conservées, dans des tampons NumPy préalloués par blocs
+    de taille fixe. La mémoire utilisée ne dépend que du nombre de colonnes retenues.
+    """
+
+    def __init__(self, chunk_rows=CHUNK_ROWS):
+        """
+        Initialise le lecteur
+
+        Args:
+            chunk_rows (int, optional): Nombre de lignes par bloc de tampons
+        """
+        self.chunk_rows = chunk_rows
+
+    def sheet_names(self, file_path):
+        """
+        Lister les noms des feuilles d'un classeur
+
+        Args:
+            file_path (str): Chemin du classeur
+
+        Returns:
+            list: Noms des feuilles, dans l'ordre du classeur
+        """
+        with zipfile.ZipFile(file_path) as archive:
+            if "xl/workbook.xml" not in archive.namelist():
+                return []
+            root = self._parse(archive, "xl/workbook.xml")
+            ns = self._namespace(root)
+            return [sheet.get("name") for sheet in root.findall(f"{ns}sheets/{ns}sheet")]
+
+    def iter_rows(self, file_path, max_rows=None, sheet_index=0):
+        """
+        Parcourir les premières lignes d'une feuille (valeurs brutes)
+
+        Args:
+            file_path (str): Chemin du classeur
+            max_rows (int, optional): Nombre maximal de lignes à lire
+            sheet_index (int, optional): Index de la feuille. Par défaut: 0
+
+        Yields:
+            list: Valeurs de la ligne (None pour les cellules vides)
+        """
+        with zipfile.ZipFile(file_path) as archive:
+            workbook = self._read_workbook(archive, sheet_index)
+            expected = 0
+            for row_index, cells in self._iter_sheet(archive, workbook):
+                if max_rows is not None and row_index >= max_rows:
+                    break
+                # Lignes vides omises dans le XML
+                while expected < row_index:
+                    yield []
+                    expected += 1
+                row = [None] * (max(cells) + 1 if cells else 0)
+                for col, (kind, value, _) in cells.items():
+                    row[col] = value
+                yield row
+                expected += 1
+
+    def read(self, file_path, header_row=0, usecols=None, float_columns=None, sheet_index=0, nrows=None, skip_rows=0):
+        """
+        Lire une feuille en DataFrame, colonne par colonne
+
+        Args:
+            file_path (str): Chemin du classeur
+            header_row (int, optional): Index (à partir de 0) de la ligne d'en-tête
+            usecols (list, optional): Colonnes à lire (toutes par défaut)
+            float_columns (list, optional): Colonnes à lire en float32
+            sheet_index (int, optional): Index de la feuille. Par défaut: 0
+            nrows (int, optional): Nombre maximal de lignes de données à lire
+            skip_rows (int, optional): Nombre de lignes de données à ignorer au début
+                (repérées dans les octets de la feuille, sans analyse XML)
+
+        Returns:
+            pandas.DataFrame: Données de la feuille ; les colonnes au format date
+            sont en datetime64[ns]
+
+        Raises:
+            ValueError: Si le classeur n'est pas un fichier .xlsx valide
+        """
+        try:
+            archive = zipfile.ZipFile(file_path)
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Classeur Excel invalide: {file_path}") from e
+
+        with archive:
+            workbook = self._read_workbook(archive, sheet_index)
+            keep = set()
+            rows = self._iter_sheet(archive, workbook, keep)
+
+            names = None
+            header_elements = 0
+            for row_index, cells in rows:
+                header_elements += 1
+                if row_index == header_row:
+                    names = self._column_names(cells)
+                    break
+                if row_index > header_row:
+                    break
+            if names is None:
+                rows.close()
+                return pd.DataFrame()
+
+            wanted = set(usecols) if usecols else None
+            floats = set(float_columns or ())
+            buffers = {
+                col: _ColumnBuffer(name, np.float32 if name in floats else np.float64, self.chunk_rows)
+                for col, name in names.items()
+                if wanted is None or name in wanted
+            }
+            # Lignes ignorées : repérées dans les octets de la feuille, sans analyse XML
+            if skip_rows:
+                rows.close()
+                rows = self._iter_sheet(archive, workbook, keep, skip_elements=header_elements + skip_rows)
+
+            # Les cellules des autres colonnes ne sont plus décodées
+            keep.update(buffers)
+            if not keep:
+                keep.add(-1)
+
+            count = 0
+            position = 0
+            for row_index, cells in rows:
+                if nrows is not None and count >= nrows:
+                    break
+                if position == self.chunk_rows:
+                    for buffer in buffers.values():
+                        buffer.flush()
+                    position = 0
+                for col, (kind, value, date_style) in cells.items():
+                    buffer = buffers.get(col)
+                    if buffer is not None and value is not None:
+                        buffer.put(position, count, kind, value, date_style)
+                count += 1
+                position += 1
+
+        epoch = EXCEL_EPOCH_1904 if workbook["date1904"] else EXCEL_EPOCH
+        data = {buffer.name: buffer.finish(count, epoch) for buffer in buffers.values()}
+        df = pd.DataFrame(data, columns=[buffer.name for buffer in buffers.values()])
+        logger.info(f"Classeur lu en flux: {file_path}, {count} lignes, {len(buffers)} colonnes")
+        return df
+
+    def _read_workbook(self, archive, sheet_index):
+        """Localiser la feuille et charger les chaînes partagées et les styles de date"""
+        names = set(archive.namelist())
+
+        sheet_path = "xl/worksheets/sheet1.xml"
+        date1904 = False
+        if "xl/workbook.xml" in names:
+            root = self._parse(archive, "xl/workbook.xml")
+            ns = self._namespace(root)
+            pr = root.find(f"{ns}workbookPr")
+            if pr is not None:
+                date1904 = pr.get("date1904") in ("1", "true")
+            sheets = root.findall(f"{ns}sheets/{ns}sheet")
+            if sheet_index < len(sheets) and "xl/_rels/workbook.xml.rels" in names:
+                rel_id = sheets[sheet_index].get(f"{{{REL_NS}}}id")
+                rels = self._parse(archive, "xl/_rels/workbook.xml.rels")
+                for rel in rels:
+                    if rel.get("Id") == rel_id:
+                        target = rel.get("Target", "")
+                        sheet_path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(
+                            posixpath.join("xl", target)
+                        )
+                        break
+
+        if sheet_path not in names:
+            raise ValueError("Feuille de calcul introuvable dans le classeur")
+
+        return {
+            "sheet_path": sheet_path,
+            "date1904": date1904,
+            "shared_strings": self._read_shared_strings(archive, names),
+            "date_styles": self._read_date_styles(archive, names),
+        }
+
+    def _iter_sheet(self, archive, workbook, keep=None, skip_elements=0):
+        """
+        Parcourir les lignes de la feuille en flux
+
+        Args:
+            keep (set, optional): Index des colonnes à décoder ; l'ensemble peut être
+                rempli en cours de parcours (après la ligne d'en-tête). Vide : toutes.
+            skip_elements (int, optional): Nombre d'éléments <row> à sauter au début de
+                la feuille ; ils sont comptés dans les octets décompressés et jamais
+                analysés
+
+        Yields:
+            tuple: (index de ligne à partir de 0, {index de colonne: (type, valeur, style date)})
+        """
+        shared_strings = workbook["shared_strings"]
+        date_styles = workbook["date_styles"]
+        column_cache = {}
+
+        with archive.open(workbook["sheet_path"]) as raw:
+            stream = raw
+            if skip_elements:
+                stream = self._skip_rows(raw, skip_elements)
+                if stream is None:
+                    return
+            ns = None
+            next_row = skip_elements
+            for _, element in iterparse(stream, events=("end",)):
+                if ns is None:
+                    ns = self._namespace(element)
+                    row_tag, cell_tag = f"{ns}row", f"{ns}c"
+                    value_tag, inline_tag, text_tag = f"{ns}v", f"{ns}is", f"{ns}t"
+                if element.tag != row_tag:
+                    continue
+
+                r = element.get("r")
+                row_index = int(r) - 1 if r else next_row
+                next_row = row_index + 1
+
+                cells = {}
+                col = -1
+                for cell in element.iter(cell_tag):
+                    ref = cell.get("r")
+                    if ref:
+                        letters = COLUMN_PATTERN.match(ref).group()
+                        col = column_cache.get(letters)
+                        if col is None:
+                            col = column_cache[letters] = self._column_index(letters)
+                    else:
+                        col += 1
+                    if keep and col not in keep:
+                        continue
+
+                    cell_type = cell.get("t", "n")
+                    if cell_type == "inlineStr":
+                        inline = cell.find(inline_tag)
+                        text = "".join(t.text or "" for t in inline.iter(text_tag)) if inline is not None else None
+                        cells[col] = ("s", text, False)
+                        continue
+
+                    v = cell.find(value_tag)
+                    if v is None or v.text is None:
+                        continue
+                    if cell_type == "s":
+                        cells[col] = ("s", shared_strings[int(v.text)], False)
+                    elif cell_type in ("str", "d"):
+                        cells[col] = ("s", v.text, False)
+                    elif cell_type == "b":
+                        cells[col] = ("n", float(v.text), False)
+                    elif cell_type == "e":
+                        continue
+                    else:
+                        cells[col] = ("n", float(v.text), int(cell.get("s", 0)) in date_styles)
+
+                element.clear()
+                yield row_index, cells
+
+    @staticmethod
+    def _skip_rows(stream, count):
+        """
+        Avancer dans le XML de la feuille jusqu'à l'élément <row> numéro count (à partir de 0)
+
+        Les octets décompressés sont lus par blocs et les balises <row> comptées avec
+        bytes.count (seul élément de ce nom dans <sheetData>) : aucun élément XML n'est
+        construit. Le flux renvoyé reprend l'en-tête du document jusqu'à <sheetData>
+        puis la suite de la feuille à partir de la ligne trouvée, ce qui forme un
+        document XML valide.
+
+        Returns:
+            _SplicedStream: Flux à analyser, ou None si la feuille a au plus count lignes
+        """
+        buf = b""
+        head = None
+        seen = 0
+        while True:
+            chunk = stream.read(SCAN_BYTES)
+            eof = not chunk
+            buf += chunk
+            if head is None:
+                match = SHEET_DATA_PATTERN.search(buf)
+                if match is None:
+                    if eof:
+                        return None
+                    continue
+                if match.group(2):
+                    return None
+                prefix = match.group(1)
+                row_tag = b"<" + prefix + b"row"
+                end_tag = b"</" + prefix + b"sheetData"
+                head = buf[:match.end()]
+                buf = buf[match.end():]
+
+            # Une balise coupée en fin de bloc est comptée au bloc suivant
+            limit = len(buf) if eof else max(len(buf) - 64, 0)
+            end = buf.find(end_tag, 0, limit + len(end_tag))
+            if end >= 0:
+                limit = end
+            # Balises commençant avant la limite (entières dans le bloc)
+            window = limit + len(row_tag) - 1
+            found = buf.count(row_tag, 0, window)
+            if seen + found > count:
+                position = -1
+                for _ in range(count - seen + 1):
+                    position = buf.find(row_tag, position + 1, window)
+                return _SplicedStream(head, buf[position:], stream)
+            seen += found
+            if eof or end >= 0:
+                return None
+            buf = buf[limit:]
+
+    @staticmethod
+    def _column_names(cells):
+        """Noms des colonnes à partir de la ligne d'en-tête, comme pandas (doublons numérotés)"""
+        names = {}
+        seen = {}
+        for col in range(max(cells) + 1 if cells else 0):
+            value = cells.get(col, (None, None, False))[1]
+            if value is None or (isinstance(value, str) and not value.strip()):
+                name = f"Unnamed: {col}"
+            elif isinstance(value, float) and value.is_integer():
+                name = int(value)
+            else:
+                name = value
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            names[col] = name
+        return names
+
+    def _read_shared_strings(self, archive, names):
+        """Charger la table des chaînes partagées"""
+        if "xl/sharedStrings.xml" not in names:
+            return []
+        strings = []
+        with archive.open("xl/sharedStrings.xml") as stream:
+            ns = None
+            for _, element in iterparse(stream, events=("end",)):
+                if ns is None:
+                    ns = self._namespace(element)
+                if element.tag == f"{ns}si":
+                    # Texte simple ou suite de segments mis en forme (hors phonétique)
+                    parts = [t.text or "" for t in element.iter(f"{ns}t")]
+                    for phonetic in element.iter(f"{ns}rPh"):
+                        for t in phonetic.iter(f"{ns}t"):
+                            if t.text in parts:
+                                parts.remove(t.text)
+                    strings.append("".join(parts))
+                    element.clear()
+        return strings
+
+    def _read_date_styles(self, archive, names):
+        """Index des styles de cellule dont le format numérique est une date"""
+        if "xl/styles.xml" not in names:
+            return set()
+        root = self._parse(archive, "xl/styles.xml")
+        ns = self._namespace(root)
+
+        custom_dates = set()
+        for fmt in root.iterfind(f"{ns}numFmts/{ns}numFmt"):
+            code = QUOTED_PATTERN.sub("", fmt.get("formatCode", ""))
+            if DATE_CODE_PATTERN.search(code):
+                custom_dates.add(int(fmt.get("numFmtId")))
+
+        date_styles = set()
+        for index, xf in enumerate(root.iterfind(f"{ns}cellXfs/{ns}xf")):
+            fmt_id = int(xf.get("numFmtId", 0))
+            if fmt_id in BUILTIN_DATE_FORMATS or fmt_id in custom_dates:
+                date_styles.add(index)
+        return date_styles
+
+    @staticmethod
+    def _parse(archive, name):
+        """Lire un petit fichier XML de l'archive"""
+        return fromstring(archive.read(name))
+
+    @staticmethod
+    def _namespace(element):
+        """Espace de noms d'un élément, sous la forme '{uri}'"""
+        tag = element.tag
+        return tag[:tag.index("}") + 1] if tag.startswith("{") else ""
+
+    @staticmethod
+    def _column_index(letters):
+        """Index (à partir de 0) d'une colonne à partir de ses lettres (A, B, ..., AA)"""
+        index = 0
+        for letter in letters:
+            index = index * 26 + ord(letter) - 64
+        return index - 1
+
+
+class _SplicedStream:
+    """Flux lisant un début de document, un reste de bloc puis la suite d'un flux"""
+
+    def __init__(self, head, rest, stream):
+        self.parts = [head, rest]
+        self.stream = stream
+
+    def read(self, size=-1):
+        """Lire les octets suivants (les parties conservées d'abord)"""
+        while self.parts:
+            part = self.parts.pop(0)
+            if part:
+                return part
+        return self.stream.read(size)
+
+
+class _ColumnBuffer:
+    """Tampon d'une colonne, alloué par blocs de taille fixe"""
+
+    def __init__(self, name, dtype, chunk_rows):
+        self.name = name
+        self.dtype = dtype
+        self.chunk_rows = chunk_rows
+        self.chunks = []
+        self.current = np.full(chunk_rows, np.nan, dtype=dtype)
+        self.texts = {}
+        self.is_date = None
+
+    def put(self, position, row, kind, value, date_style):
+        """Écrire une valeur à la position courante du bloc"""
+        if kind == "n":
+            if self.is_date is None:
+                self.is_date = date_style
+            self.current[position] = value
+        elif self.dtype == np.float32:
+            # Colonne de mesures : texte numérique converti, sinon valeur manquante
+            try:
+                self.current[position] = float(value.replace(",", "."))
+            except ValueError:
+                pass
+        else:
+            self.texts[row] = value
+
+    def flush(self):
+        """Clore le bloc courant et en allouer un nouveau"""
+        self.chunks.append(self.current)
+        self.current = np.full(self.chunk_rows, np.nan, dtype=self.dtype)
+
+    def finish(self, count, epoch):
+        """Assembler les blocs en un tableau de la longueur finale"""
+        values = np.concatenate(self.chunks + [self.current])[:count] if self.chunks else self.current[:count]
+
+        if self.is_date:
+            ms = np.round(values.astype(np.float64) * MS_PER_DAY)
+            dates = np.full(count, np.datetime64("NaT"), dtype="datetime64[ns]")
+            valid = ~np.isnan(ms)
+            dates[valid] = (epoch + ms[valid].astype(np.int64).astype("timedelta64[ms]")).astype("datetime64[ns]")
+            values = dates
+
+        if self.texts:
+            if self.is_date:
+                values = pd.Series(values).astype(object).to_numpy()
+            else:
+                missing = np.isnan(values)
+                values = values.astype(object)
+                values[missing] = None
+            for row, text in self.texts.items():
+                values[row] = text
+        elif not self.is_date and self.dtype == np.float64 and self._is_integral(values):
+            values = values.astype(np.int64)
+
+        return values
+
+    @staticmethod
+    def _is_integral(values):
+        """Colonne entière sans valeur manquante (numéro de ligne par exemple)"""
+        return len(values) > 0 and not np.isnan(values).any() and np.array_equal(values, np.floor(values))
@@ -5,6 +5,7 @@ Point d'entrée principal de l'application
 
 import os
 import sys
+import multiprocessing
 import webview
 from core.api import API
 
@@ -58,4 +59,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Nécessaire au pool de processus de chargement dans l'exécutable empaqueté
+    multiprocessing.freeze_support()
     main()
@@ -207,6 +207,15 @@ function showEditCapteurModal(capteurId) {
             </label>
             <input type="text" id="capteur-nom-edit" class="w-full p-2 border border-gray-300 dark:border-gray-600 rounded-md bg-white dark:bg-gray-700 text-gray-900 dark:text-gray-100" value="${capteur.nom}">
         </div>
+        <div class="mb-4">
+            <label class="block text-sm font-medium text-gray-700 dark:text-gray-300 mb-2">
+                Position sur le plan (m), pour la cartographie hygrométrique
+            </label>
+            <div class="flex gap-2">
+                <input type="number" step="any" id="capteur-x-edit" placeholder="x" class="w-full p-2 border border-gray-300 dark:border-gray-600 rounded-md bg-white dark:bg-gray-700 text-gray-900 dark:text-gray-100" value="${capteur.position ? capteur.position.x : ''}">
+                <input type="number" step="any" id="capteur-y-edit" placeholder="y" class="w-full p-2 border border-gray-300 dark:border-gray-600 rounded-md bg-white dark:bg-gray-700 text-gray-900 dark:text-gray-100" value="${capteur.position ? capteur.position.y : ''}">
+            </div>
+        </div>
     `;
     
     const actions = [
@@ -235,6 +244,8 @@ function showEditCapteurModal(capteurId) {
 function updateCapteur(capteurId) {
     const nomInput = document.getElementById('capteur-nom-edit');
     const nom = nomInput.value.trim();
+    const x = document.getElementById('capteur-x-edit').value.trim();
+    const y = document.getElementById('capteur-y-edit').value.trim();
     
     if (!nom) {
         showNotification('Veuillez saisir un nom pour le capteur', 'warning');
@@ -248,6 +259,14 @@ function updateCapteur(capteurId) {
     editButton.textContent = 'Enregistrement...';
     
     pywebview.api.update_capteur(capteurId, nom).then(response => {
+        if (response.success) {
+            // Position vide : effacée
+            return pywebview.api.set_capteur_position(
+                capteurId, x === '' ? null : Number(x), y === '' ? null : Number(y)
+            );
+        }
+        return response;
+    }).then(response => {
         hideModal();
         
         if (response.success) {